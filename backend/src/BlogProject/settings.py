@@ -44,12 +44,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # /api/ requests leave here for the lean stack in BLOG_API_FAST_LANE
+    'blog.middleware.ApiFastLaneMiddleware',
+    # Outermost of the rest, so its wall time covers the whole stack
+    'blog.middleware.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Needs request.user; removes itself unless BLOG_PROFILING_ENABLED
+    'blog.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -87,6 +93,10 @@ DATABASES = {
 
 
 # REST Framework Configuration
+# orjson-backed JSON renderer/parser with identical output (see blog/fastjson.py);
+# they fall back to the stdlib json module when orjson is not installed
+FAST_JSON = os.getenv('BLOG_FAST_JSON_ENABLED', 'True').lower() == 'true'
+
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
@@ -95,10 +105,10 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'blog.fastjson.FastJSONRenderer' if FAST_JSON else 'rest_framework.renderers.JSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'blog.fastjson.FastJSONParser' if FAST_JSON else 'rest_framework.parsers.JSONParser',
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
     ],
@@ -106,6 +116,156 @@ REST_FRAMEWORK = {
 }
 
 
+# Cache Configuration
+# Local memory by default (LRU, bounded by MAX_ENTRIES); set DJANGO_CACHE_DIR
+# to share entries between workers through the file-based backend.
+# Local memory is per process, so it only suits a single worker: under
+# several, the response cache's invalidation tokens, the trending refresh
+# lock and the autocomplete version are each private to one worker, leaving
+# the others serving stale responses, refreshing the ranking on their own
+# and reloading tags only every BLOG_AUTOCOMPLETE['MAX_AGE'] seconds.
+CACHE_DIR = os.getenv('DJANGO_CACHE_DIR')
+CACHES = {
+    'default': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache' if CACHE_DIR
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': CACHE_DIR or 'blog-default',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('DJANGO_CACHE_MAX_ENTRIES', '5000')),
+        },
+    }
+}
+
+# Response cache for blog read endpoints (see blog/cache.py)
+BLOG_RESPONSE_CACHE = {
+    'ENABLED': os.getenv('BLOG_RESPONSE_CACHE_ENABLED', 'True').lower() == 'true',
+    'ALIAS': 'default',
+    'TIMEOUT': int(os.getenv('BLOG_RESPONSE_CACHE_TIMEOUT', '300')),
+    'LOCAL_MAX_ENTRIES': 512,
+}
+
+# ETag / Last-Modified validators on read endpoints (see blog/conditional.py)
+BLOG_CONDITIONAL_GET = {
+    'ENABLED': os.getenv('BLOG_CONDITIONAL_GET_ENABLED', 'True').lower() == 'true',
+    'CACHE_CONTROL': {'public': True, 'max_age': 0, 'must_revalidate': True},
+}
+
+# values()-based list serializers with identical output (see blog/fast_serializers.py)
+BLOG_FAST_SERIALIZERS = {
+    'ENABLED': os.getenv('BLOG_FAST_SERIALIZERS_ENABLED', 'True').lower() == 'true',
+}
+
+
+# Bulk article import (see blog/importer.py)
+BLOG_IMPORT = {
+    'BATCH_SIZE': int(os.getenv('BLOG_IMPORT_BATCH_SIZE', '1000')),
+}
+
+
+# Streaming export (see blog/exporter.py)
+BLOG_EXPORT = {
+    'CHUNK_SIZE': int(os.getenv('BLOG_EXPORT_CHUNK_SIZE', '2000')),
+}
+
+
+# Precomputed related articles (see blog/related.py)
+BLOG_RELATED = {
+    'LIMIT': int(os.getenv('BLOG_RELATED_LIMIT', '10')),
+    'MAX_POSTINGS': 50,
+    # Re-rank on every tag change; turn off for bulk retagging and rebuild afterwards
+    'INCREMENTAL': os.getenv('BLOG_RELATED_INCREMENTAL', 'True').lower() == 'true',
+}
+
+
+# Buffered view counts and the trending ranking (see blog/trending.py)
+BLOG_TRENDING = {
+    'COUNT_VIEWS': os.getenv('BLOG_COUNT_VIEWS', 'True').lower() == 'true',
+    # Flush buffered views after this many seconds or this many views
+    'FLUSH_INTERVAL': int(os.getenv('BLOG_VIEWS_FLUSH_INTERVAL', '10')),
+    'FLUSH_THRESHOLD': int(os.getenv('BLOG_VIEWS_FLUSH_THRESHOLD', '500')),
+    'HALF_LIFE_HOURS': int(os.getenv('BLOG_TRENDING_HALF_LIFE_HOURS', '24')),
+    'WINDOW_HOURS': 7 * 24,
+    'LIMIT': 20,
+    'REFRESH_INTERVAL': int(os.getenv('BLOG_TRENDING_REFRESH_INTERVAL', '60')),
+    'ALIAS': 'default',
+}
+
+
+# Per-process tag autocomplete index (see blog/autocomplete.py)
+BLOG_AUTOCOMPLETE = {
+    'ALIAS': 'default',
+    'LIMIT': 10,
+    # Seconds before article counts used for ranking are reloaded
+    'MAX_AGE': int(os.getenv('BLOG_AUTOCOMPLETE_MAX_AGE', '300')),
+}
+
+# Delta sync endpoint and deletion tombstones (see blog/sync.py)
+BLOG_SYNC = {
+    'LIMIT': 500,
+    # Seconds a write may take to commit; newer rows are sent again on the next sync
+    'LAG': int(os.getenv('BLOG_SYNC_LAG', '10')),
+    # Tokens older than this must resync from scratch
+    'RETENTION_DAYS': int(os.getenv('BLOG_SYNC_RETENTION_DAYS', '30')),
+    'COMPACT_INTERVAL': 3600,
+    'ALIAS': 'default',
+}
+
+# POST /api/batch/: API GETs run in-process in one round-trip (see blog/batch.py)
+BLOG_BATCH = {
+    'MAX_REQUESTS': int(os.getenv('BLOG_BATCH_MAX_REQUESTS', '20')),
+}
+
+# Per-request timings: Server-Timing header and /api/metrics/ (see blog/metrics.py)
+BLOG_METRICS = {
+    'ENABLED': os.getenv('BLOG_METRICS_ENABLED', 'True').lower() == 'true',
+    'SERVER_TIMING': os.getenv('BLOG_SERVER_TIMING', 'True').lower() == 'true',
+    # Directory shared by the gunicorn workers so /api/metrics/ sums all of them
+    'DIRECTORY': os.getenv('BLOG_METRICS_DIR') or None,
+    # When set, /api/metrics/ requires "Authorization: Bearer <token>";
+    # unset, the endpoint is only served with DEBUG on
+    'TOKEN': os.getenv('BLOG_METRICS_TOKEN') or None,
+}
+
+# Lean middleware stack for /api/ requests; the admin keeps MIDDLEWARE (see blog/fastlane.py)
+BLOG_API_FAST_LANE = {
+    'ENABLED': os.getenv('BLOG_API_FAST_LANE', 'True').lower() == 'true',
+    'PREFIX': '/api/',
+    'MIDDLEWARE': [
+        'blog.middleware.InstrumentationMiddleware',
+        'corsheaders.middleware.CorsMiddleware',
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        # Read-only session user, looked up only when a view needs it
+        'blog.middleware.ApiUserMiddleware',
+        'blog.middleware.ProfilingMiddleware',
+    ],
+}
+
+# Opt-in per-request profiles for staff (see blog/profiling.py)
+BLOG_PROFILING = {
+    'ENABLED': os.getenv('BLOG_PROFILING_ENABLED', 'False').lower() == 'true',
+    # Fraction of all requests profiled, e.g. 0.001
+    'SAMPLE_RATE': float(os.getenv('BLOG_PROFILING_SAMPLE_RATE', '0')),
+    # X-Blog-Profile value that profiles a request without a staff session
+    'TOKEN': os.getenv('BLOG_PROFILING_TOKEN') or None,
+    'DIRECTORY': os.getenv('BLOG_PROFILING_DIR', str(BASE_DIR / 'logs' / 'profiles')),
+    'MAX_PROFILES': int(os.getenv('BLOG_PROFILING_MAX_PROFILES', '50')),
+}
+
+# Pre-rendered JSON of the read endpoints for nginx (see blog/snapshot.py).
+# Off by default: detail reads nginx answers from a file never reach the
+# view counter, so trending (BLOG_TRENDING) only sees views that miss it.
+BLOG_SNAPSHOT = {
+    'ENABLED': os.getenv('BLOG_SNAPSHOT_ENABLED', 'False').lower() == 'true',
+    'ROOT': os.getenv('BLOG_SNAPSHOT_ROOT', str(BASE_DIR / 'staticfiles' / 'snapshot')),
+    # Pagination links in the files are absolute, so they need the public origin
+    'BASE_URL': os.getenv('BLOG_SNAPSHOT_BASE_URL', 'http://localhost:8000'),
+    'PAGES': 5,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
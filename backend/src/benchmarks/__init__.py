@@ -0,0 +1,7 @@
+"""
+Standalone performance benchmarks for the blog API.
+
+Each module runs against a throwaway test database, e.g.::
+
+    python -m benchmarks.search --articles 100000
+"""
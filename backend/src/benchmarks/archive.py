@@ -0,0 +1,56 @@
+"""
+Date-archive latency: summary table vs grouping the article table.
+
+    python -m benchmarks.archive --articles 100000
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.test import override_settings
+        from django.urls import reverse
+        from django.utils import timezone
+        from rest_framework.test import APIClient
+        from blog.models import Article, rebuild_archive
+
+        rng = random.Random(16)
+        now = timezone.now()
+        Article.objects.bulk_create(
+            (Article(title=f'Article {i}', content='Body text.', excerpt='Body text.') for i in range(args.articles)),
+            batch_size=2000,
+        )
+        # bulk_create stamps auto_now_add fields, so spread the dates afterwards
+        ids = list(Article.objects.values_list('pk', flat=True))
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            Article.objects.filter(pk__in=chunk).update(created_at=now - timedelta(days=rng.randrange(10 * 365)))
+        rebuild_archive()
+
+        client = APIClient()
+        results = {}
+        with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_CONDITIONAL_GET={'ENABLED': False}):
+            results['archive buckets (summary table)'] = measure(
+                lambda: client.get(reverse('article-archive')), repeat=args.repeat
+            )
+            results['GROUP BY month over articles'] = measure(
+                lambda: Article.objects.published().published_by_month(), repeat=args.repeat
+            )
+            month = timezone.localtime(now - timedelta(days=400))
+            url = reverse('article-archive-month', args=[f'{month.year}', f'{month.month}'])
+            results['one month, first page'] = measure(lambda: client.get(url), repeat=args.repeat)
+
+        report(f'Date archive over {args.articles} articles', results)
+
+
+if __name__ == '__main__':
+    main()
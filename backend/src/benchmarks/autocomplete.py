@@ -0,0 +1,75 @@
+"""
+Tag autocomplete: in-memory prefix index vs the icontains tag search.
+
+    python -m benchmarks.autocomplete --tags 20000
+"""
+import argparse
+import random
+import string
+import time
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tags', type=int, default=20_000)
+    parser.add_argument('--articles', type=int, default=5_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.autocomplete import tag_autocomplete
+        from blog.models import Article, Tag
+
+        rng = random.Random(18)
+
+        def word() -> str:
+            return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+        names = set()
+        while len(names) < args.tags:
+            names.add('-'.join(word() for _ in range(rng.randint(1, 3))))
+        Tag.objects.bulk_create((Tag(name=name) for name in names), batch_size=2000)
+        Article.objects.bulk_create(
+            (Article(title=f'Article {i}', content='Body text.', excerpt='Body text.') for i in range(args.articles)),
+            batch_size=2000,
+        )
+        tag_ids = list(Tag.objects.values_list('pk', flat=True))
+        Article.tags.through.objects.bulk_create(
+            (
+                Article.tags.through(article_id=article_id, tag_id=tag_id)
+                for article_id in Article.objects.values_list('pk', flat=True)
+                # Zipf-ish usage: a few tags on most articles, a long tail on few
+                for tag_id in {tag_ids[min(int(rng.paretovariate(0.8)) - 1, len(tag_ids) - 1)] for _ in range(4)}
+            ),
+            batch_size=2000,
+        )
+
+        start = time.perf_counter()
+        tag_autocomplete.search('a')
+        print(f'index load: {(time.perf_counter() - start) * 1000:.1f} ms for {args.tags} tags')
+
+        prefixes = [rng.choice(sorted(names))[:length] for length in (1, 2, 3, 4) for _ in range(5)]
+        client = APIClient()
+        results = {}
+        for length in (1, 2, 4):
+            sample = [prefix for prefix in prefixes if len(prefix) == length]
+            results[f'index lookup, {length}-char prefixes'] = measure(
+                lambda: [tag_autocomplete.search(prefix) for prefix in sample], repeat=args.repeat
+            )
+        url = reverse('tag-autocomplete')
+        results['GET /api/tags/autocomplete/?q=ab'] = measure(lambda: client.get(url, {'q': 'ab'}), repeat=args.repeat)
+        with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}):
+            results['GET /api/tags/?search=ab (icontains)'] = measure(
+                lambda: client.get(reverse('tag-list'), {'search': 'ab'}), repeat=args.repeat
+            )
+
+        report(f'Tag autocomplete over {args.tags} tags (lookups are 5 prefixes per sample)', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Batch endpoint latency: one POST /api/batch/ vs the same GETs one by one.
+
+    python -m benchmarks.batch --requests 10
+"""
+import argparse
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.models import Article, Tag
+
+        tags = Tag.objects.bulk_create(Tag(name=f'tag-{i}') for i in range(20))
+        Article.objects.bulk_create(
+            (Article(title=f'Article {i}', content='Body text.', excerpt='Body text.') for i in range(args.articles)),
+            batch_size=2000,
+        )
+        ids = list(Article.objects.values_list('pk', flat=True))
+        Article.tags.through.objects.bulk_create(
+            Article.tags.through(article_id=pk, tag_id=tags[pk % len(tags)].pk) for pk in ids
+        )
+
+        # A screen's worth of reads: a list page, the tags, then article details
+        paths = [reverse('article-list'), reverse('tag-list')]
+        paths += [reverse('article-detail', args=[pk]) for pk in ids[:max(0, args.requests - len(paths))]]
+        payload = {'requests': [{'path': path} for path in paths]}
+
+        client = APIClient()
+        results = {}
+        with override_settings(
+            BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_BATCH={'MAX_REQUESTS': len(paths)}
+        ):
+            results[f'{len(paths)} sequential GETs'] = measure(
+                lambda: [client.get(path) for path in paths], repeat=args.repeat
+            )
+            results['one batch'] = measure(
+                lambda: client.post(reverse('batch'), payload, format='json'), repeat=args.repeat
+            )
+            consistent = {**payload, 'consistent': True}
+            results['one consistent batch'] = measure(
+                lambda: client.post(reverse('batch'), consistent, format='json'), repeat=args.repeat
+            )
+
+        report(f'{len(paths)} reads over {args.articles} articles (in-process, no network)', results)
+
+
+if __name__ == '__main__':
+    main()
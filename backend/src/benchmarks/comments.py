@@ -0,0 +1,52 @@
+"""
+Article detail latency as the number of approved comments grows.
+
+Compares the bounded detail response (first comments plus a cursor link)
+with embedding every approved comment, as the detail view used to.
+
+    python -m benchmarks.comments --sizes 0 100 1000 10000 20000
+"""
+import argparse
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 100, 1_000, 10_000, 20_000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.models import Article, Comment
+        from blog.serializers import CommentSerializer
+
+        client = APIClient()
+        results = {}
+        with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_CONDITIONAL_GET={'ENABLED': False}):
+            for size in args.sizes:
+                article = Article.objects.create(title=f'Article with {size} comments', content='Body text.')
+                Comment.objects.bulk_create(
+                    (Comment(article=article, content=f'Comment number {i}') for i in range(size)),
+                    batch_size=5000,
+                )
+                url = reverse('article-detail', args=[article.pk])
+
+                def bounded(url=url):
+                    assert client.get(url).status_code == 200
+
+                def embed_all(article=article):
+                    comments = article.comments.filter(is_approved=True).order_by('created_at')
+                    CommentSerializer(comments, many=True).data
+
+                results[f'detail, {size} comments'] = measure(bounded, repeat=args.repeat)
+                results[f'embed all, {size} comments'] = measure(embed_all, repeat=args.repeat)
+
+        report('Article detail latency by comment count', results)
+
+
+if __name__ == '__main__':
+    main()
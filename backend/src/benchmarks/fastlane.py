@@ -0,0 +1,90 @@
+"""
+Per-request middleware overhead: API reads through the lean /api/ stack and
+through the full admin stack, anonymous and with a staff session cookie, and against the full stack
+with DRF authenticating every request as it did before the lane.
+
+The tag list is served from the response cache, so its time is mostly the
+middleware around the view.
+
+    python -m benchmarks.fastlane --articles 1000
+"""
+import argparse
+from unittest import mock
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.conf import settings
+        from django.contrib.auth.models import User
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.test import RequestFactory, override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from rest_framework.views import APIView
+        from blog.fastlane import LazyAuthenticationMixin
+        from blog.models import Article
+
+        Article.objects.bulk_create(
+            (Article(title=f'Article {i}', content='Body text.', excerpt='Body text.') for i in range(args.articles)),
+            batch_size=2000,
+        )
+        pk = Article.objects.values_list('pk', flat=True).first()
+        staff = User.objects.create_user('admin', is_staff=True)
+
+        # Straight through a WSGI handler, so the test client's own work is not timed
+        factory = RequestFactory()
+        login = APIClient()
+        login.force_login(staff)
+        cookie = f'{settings.SESSION_COOKIE_NAME}={login.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+        def call(handler: WSGIHandler, path: str, session: bool) -> None:
+            environ = factory.get(path, HTTP_COOKIE=cookie if session else '').environ
+            b''.join(handler(environ, lambda status, headers, exc_info=None: None))
+
+        paths = {
+            'cached tag list': reverse('tag-list'),
+            'article detail': reverse('article-detail', args=[pk]),
+        }
+        results = {}
+        for enabled in (False, True):
+            label = 'fast lane' if enabled else 'full stack'
+            with override_settings(BLOG_API_FAST_LANE={'ENABLED': enabled}):
+                # Middleware is loaded when the handler is created
+                handler = WSGIHandler()
+                for name, path in paths.items():
+                    for session in (False, True):
+                        who = 'session' if session else 'anonymous'
+                        results[f'{name}, {who} ({label})'] = measure(
+                            lambda: call(handler, path, session), repeat=args.repeat
+                        )
+
+        # Before this change: the full stack with DRF authenticating every request
+        with override_settings(BLOG_API_FAST_LANE={'ENABLED': False}), mock.patch.object(
+            LazyAuthenticationMixin, 'perform_authentication', APIView.perform_authentication
+        ):
+            handler = WSGIHandler()
+            for name, path in paths.items():
+                results[f'{name}, session (eager auth)'] = measure(
+                    lambda: call(handler, path, True), repeat=args.repeat
+                )
+
+        report(f'API middleware stacks over {args.articles} articles', results)
+        print()
+        for name in results:
+            if name.endswith('(fast lane)'):
+                full = results[name.replace('(fast lane)', '(full stack)')]['p50']
+                print(f'{name[:-len(" (fast lane)")]:<35} {full - results[name]["p50"]:8.3f} ms saved at p50')
+        for name in paths:
+            eager = results[f'{name}, session (eager auth)']['p50']
+            print(f'{name}, session vs eager auth {eager - results[f"{name}, session (fast lane)"]["p50"]:8.3f} ms saved at p50')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Bulk import throughput against one-request-per-article creation.
+
+    python -m benchmarks.importer --articles 50000
+"""
+import argparse
+import json
+import random
+import time
+
+from .utils import benchmark_database
+
+WORDS = ('django', 'python', 'query', 'index', 'cache', 'stream', 'batch', 'archive', 'tag', 'blog')
+
+
+def make_rows(count: int, tags: int, rng: random.Random) -> list:
+    tag_names = [f'tag{i}' for i in range(tags)]
+    rows = []
+    for i in range(count):
+        rows.append(json.dumps({
+            'title': f'Imported article {i}',
+            'content': ' '.join(rng.choices(WORDS, k=120)),
+            'tags': rng.sample(tag_names, k=min(3, tags)),
+        }))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=50_000)
+    parser.add_argument('--tags', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--baseline', type=int, default=500, help='Articles created through the API')
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+
+        from blog.importer import import_articles
+        from blog.models import Article
+
+        rows = make_rows(args.articles, args.tags, random.Random(42))
+
+        start = time.perf_counter()
+        result = import_articles(rows, 'ndjson', batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        assert result.created == args.articles and not result.errors, result.as_dict()['errors'][:3]
+
+        client = APIClient()
+        baseline = [json.loads(row) for row in rows[:args.baseline]]
+        start = time.perf_counter()
+        for row in baseline:
+            row['tags'] = [{'name': name} for name in row['tags']]
+            client.post(reverse('article-list'), row, format='json')
+        baseline_elapsed = time.perf_counter() - start
+
+        print(f'\nImport of {args.articles} articles ({Article.objects.count()} rows in table)')
+        print(f'{"path":<32} {"articles/s":>12}')
+        print(f'{"import_articles (NDJSON)":<32} {args.articles / elapsed:>12.0f}')
+        print(f'{"POST /api/articles/ per row":<32} {args.baseline / baseline_elapsed:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Read endpoints with the previous single-column indexes and with the
+query-shaped composite and partial ones (migration 0013), on one seeded
+dataset. Index sizes are reported on SQLite.
+
+    python -m benchmarks.indexes --articles 20000
+"""
+import argparse
+import logging
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=20_000)
+    parser.add_argument('--comments', type=float, default=10.0)
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.db import connection, models
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.models import Article, Comment
+        from blog.seed import seed_blog
+
+        logging.disable(logging.INFO)
+        seed_blog(articles=args.articles, comments=args.comments, seed=25)
+        article = Article.objects.published().order_by('-approved_comments_count').first()
+        month = article.created_at
+        paths = {
+            'article list': reverse('article-list'),
+            'article list, most discussed': reverse('article-list') + '?ordering=-approved_comments_count',
+            'article list, page 50': reverse('article-list') + '?page=50',
+            'article detail': reverse('article-detail', args=[article.pk]),
+            'article comments': reverse('article-comments', args=[article.pk]),
+            'archive month': reverse('article-archive-month', args=[f'{month.year}', f'{month.month}']),
+        }
+        previous = {
+            Article: [
+                models.Index(fields=['created_at'], name='blog_articl_created_311958_idx'),
+                models.Index(fields=['is_published'], name='blog_articl_is_publ_0f077c_idx'),
+                models.Index(fields=['title'], name='blog_articl_title_525ebf_idx'),
+                models.Index(fields=['-approved_comments_count', '-created_at'], name='blog_articl_approve_5f8047_idx'),
+            ],
+            Comment: [
+                models.Index(fields=['article', 'created_at'], name='blog_commen_article_6af9d2_idx'),
+                models.Index(fields=['is_approved'], name='blog_commen_is_appr_be38d5_idx'),
+            ],
+        }
+        current = {
+            model: [index for index in model._meta.indexes if index.condition is not None] for model in previous
+        }
+
+        def swap(remove, add) -> None:
+            with connection.schema_editor() as editor:
+                for model, indexes in remove.items():
+                    for index in indexes:
+                        editor.remove_index(model, index)
+                for model, indexes in add.items():
+                    for index in indexes:
+                        editor.add_index(model, index)
+
+        def index_size(indexes) -> int:
+            names = [index.name for model_indexes in indexes.values() for index in model_indexes]
+            if connection.vendor != 'sqlite':
+                return 0
+            with connection.cursor() as cursor:
+                try:
+                    cursor.execute(
+                        f'SELECT SUM(pgsize) FROM dbstat WHERE name IN ({", ".join(["%s"] * len(names))})', names
+                    )
+                except Exception:
+                    # SQLite built without the dbstat table
+                    return 0
+                return cursor.fetchone()[0] or 0
+
+        client = APIClient()
+        results, sizes = {}, {}
+        with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}):
+            for label, indexes in (('previous', previous), ('query-shaped', current)):
+                if label == 'previous':
+                    swap(current, previous)
+                else:
+                    swap(previous, current)
+                sizes[label] = index_size(indexes)
+                for name, path in paths.items():
+                    results[f'{name} ({label})'] = measure(lambda: client.get(path), repeat=args.repeat)
+
+        report(f'Read endpoints over {args.articles} articles', results)
+        if all(sizes.values()):
+            print()
+            for label, size in sizes.items():
+                print(f'{label} indexes: {size / 1024:.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Instrumentation overhead: the same reads with the timing middleware on and off.
+
+    python -m benchmarks.metrics --articles 1000
+"""
+import argparse
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.metrics import collect, registry, render
+        from blog.models import Article
+
+        Article.objects.bulk_create(
+            (Article(title=f'Article {i}', content='Body text.', excerpt='Body text.') for i in range(args.articles)),
+            batch_size=2000,
+        )
+        pk = Article.objects.values_list('pk', flat=True).first()
+
+        client = APIClient()
+        results = {}
+        for enabled in (False, True):
+            label = 'instrumented' if enabled else 'plain'
+            with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_METRICS={'ENABLED': enabled}):
+                results[f'article list ({label})'] = measure(
+                    lambda: client.get(reverse('article-list')), repeat=args.repeat
+                )
+                results[f'article detail ({label})'] = measure(
+                    lambda: client.get(reverse('article-detail', args=[pk])), repeat=args.repeat
+                )
+        results['render /api/metrics/ body'] = measure(lambda: render(collect()), repeat=args.repeat)
+
+        report(f'Timing middleware over {args.articles} articles', results)
+        print()
+        print(client.get(reverse('article-list'))['Server-Timing'])
+        registry.clear()
+
+
+if __name__ == '__main__':
+    main()
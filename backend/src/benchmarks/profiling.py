@@ -0,0 +1,51 @@
+"""
+Profiling cost: a request with the profiler middleware off, on but not
+asked for, and profiled (cProfile plus the SQL log, written to disk).
+
+    python -m benchmarks.profiling --articles 1000
+"""
+import argparse
+import tempfile
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    with benchmark_database(), tempfile.TemporaryDirectory() as directory:
+        from django.contrib.auth.models import User
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.models import Article
+
+        Article.objects.bulk_create(
+            (Article(title=f'Article {i}', content='Body text.', excerpt='Body text.') for i in range(args.articles)),
+            batch_size=2000,
+        )
+        staff = User.objects.create_user('admin', is_staff=True)
+        url = reverse('article-list')
+
+        results = {}
+        cases = (
+            ('middleware disabled', False, {}),
+            ('enabled, not asked', True, {}),
+            ('profiled (?profile=1)', True, {'profile': '1'}),
+        )
+        for label, enabled, params in cases:
+            config = {'ENABLED': enabled, 'DIRECTORY': directory, 'PROFILER': 'cprofile', 'MAX_PROFILES': 20}
+            with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_PROFILING=config):
+                # A new client loads the middleware stack under these settings
+                client = APIClient()
+                client.force_login(staff)
+                results[label] = measure(lambda: client.get(url, params), repeat=args.repeat)
+
+        report(f'Article list over {args.articles} articles', results)
+
+
+if __name__ == '__main__':
+    main()
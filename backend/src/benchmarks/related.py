@@ -0,0 +1,72 @@
+"""
+Full rebuild time of the related-articles rankings, plus incremental
+updates and endpoint latency on the rebuilt table.
+
+    python -m benchmarks.related --articles 100000 --tags 2000
+"""
+import argparse
+import random
+import time
+
+from .utils import benchmark_database, measure, report
+
+
+def populate(articles: int, tags: int, rng: random.Random, batch_size: int = 5000) -> None:
+    """Articles with 1-5 tags drawn from a Zipfian vocabulary"""
+    from blog.models import Article, Tag
+
+    tag_ids = [tag.pk for tag in Tag.objects.bulk_create(Tag(name=f'tag{i}') for i in range(tags))]
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, tags + 1):
+        total += 1.0 / rank
+        cum_weights.append(total)
+
+    Through = Article.tags.through
+    for start in range(0, articles, batch_size):
+        created = Article.objects.bulk_create(
+            Article(title=f'Article {i}', content='Body text.', excerpt='Body text.')
+            for i in range(start, min(start + batch_size, articles))
+        )
+        Through.objects.bulk_create(
+            Through(article_id=article.pk, tag_id=tag_id)
+            for article in created
+            for tag_id in set(rng.choices(tag_ids, cum_weights=cum_weights, k=rng.randint(1, 5)))
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=100_000)
+    parser.add_argument('--tags', type=int, default=2_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.models import Article
+        from blog.related import rebuild_related, update_related
+
+        rng = random.Random(42)
+        populate(args.articles, args.tags, rng)
+
+        start = time.perf_counter()
+        rows = rebuild_related()
+        print(f'Rebuilt {rows} related rows for {args.articles} articles in {time.perf_counter() - start:.2f}s')
+
+        ids = list(Article.objects.values_list('pk', flat=True))
+        client = APIClient()
+        with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_CONDITIONAL_GET={'ENABLED': False}):
+            results = {
+                'incremental update of one article': measure(lambda: update_related([rng.choice(ids)]), repeat=args.repeat),
+                'GET /api/articles/{id}/related/': measure(
+                    lambda: client.get(reverse('article-related', args=[rng.choice(ids)])), repeat=args.repeat
+                ),
+            }
+        report(f'Related articles over {args.articles} articles', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+DRF's stdlib JSON renderer/parser against the orjson-backed ones.
+
+Renders list pages of real article rows and parses a bulk import body
+of the same size.
+
+    python -m benchmarks.renderers --sizes 100 1000 10000
+"""
+import argparse
+import io
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10_000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from rest_framework.parsers import JSONParser
+        from rest_framework.renderers import JSONRenderer
+        from blog.fast_serializers import FastArticleListSerializer
+        from blog.fastjson import FastJSONParser, FastJSONRenderer, orjson_available
+        from blog.models import Article, Tag
+
+        tags = Tag.objects.bulk_create(Tag(name=f'tag{i}') for i in range(20))
+        articles = Article.objects.bulk_create(
+            Article(title=f'Article {i} – ünïcode', content='Some article content. ' * 50, excerpt='Some article content.')
+            for i in range(max(args.sizes))
+        )
+        Through = Article.tags.through
+        Through.objects.bulk_create(
+            Through(article_id=article.pk, tag_id=tags[(article.pk + k) % len(tags)].pk)
+            for article in articles for k in range(3)
+        )
+
+        results = {}
+        for size in args.sizes:
+            rows = FastArticleListSerializer.values_queryset(Article.objects.published(), None)[:size]
+            page = {'count': size, 'next': None, 'previous': None, 'results': FastArticleListSerializer(rows).data}
+            stdlib_body = JSONRenderer().render(page)
+            assert FastJSONRenderer().render(page) == stdlib_body
+            results[f'render {size} articles, JSONRenderer'] = measure(lambda: JSONRenderer().render(page), repeat=args.repeat)
+            results[f'render {size} articles, FastJSONRenderer'] = measure(lambda: FastJSONRenderer().render(page), repeat=args.repeat)
+
+            body = JSONRenderer().render(page['results'])
+            results[f'parse {size} articles, JSONParser'] = measure(
+                lambda: JSONParser().parse(io.BytesIO(body)), repeat=args.repeat
+            )
+            results[f'parse {size} articles, FastJSONParser'] = measure(
+                lambda: FastJSONParser().parse(io.BytesIO(body)), repeat=args.repeat
+            )
+
+        backend = 'orjson' if orjson_available() else 'stdlib fallback (orjson not installed)'
+        report(f'JSON rendering and parsing, fast classes using {backend}', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare the FTS search backend against the old ``icontains`` filter.
+
+    python -m benchmarks.search --articles 100000
+"""
+import argparse
+import random
+
+from .utils import benchmark_database, measure, report
+
+SYLLABLES = ('ka', 'lo', 'mi', 'ne', 'ru', 'ta', 'vo', 'shi', 'en', 'da', 'po', 'gu')
+
+
+def build_vocabulary(size: int, rng: random.Random) -> list:
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def populate(count: int, vocabulary: list, batch_size: int = 5000) -> None:
+    from blog.models import Article
+
+    rng = random.Random(42)
+    # Zipfian word frequencies, like natural language
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, len(vocabulary) + 1):
+        total += 1.0 / rank
+        cum_weights.append(total)
+
+    batch = []
+    for i in range(count):
+        title = ' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=6))
+        body = ' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=150))
+        batch.append(Article(title=f'{title} {i}', content=body))
+        if len(batch) >= batch_size:
+            Article.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Article.objects.bulk_create(batch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.db.models import Q
+        from blog.models import Article
+        from blog.search import get_search_backend
+
+        vocabulary = build_vocabulary(20_000, random.Random(7))
+        populate(args.articles, vocabulary)
+        backend = get_search_backend()
+        backend.rebuild()
+        queryset = Article.objects.published()
+
+        terms = (
+            vocabulary[50],                          # frequent word
+            vocabulary[2_000],                       # mid-frequency word
+            vocabulary[15_000],                      # rare word
+            f'{vocabulary[100]} {vocabulary[900]}',  # two words
+        )
+        results = {}
+        for term in terms:
+            def icontains(term=term):
+                condition = Q()
+                for word in term.split():
+                    condition &= Q(title__icontains=word) | Q(content__icontains=word)
+                page = queryset.filter(condition).order_by('-created_at')
+                page.count()
+                list(page[:10])
+
+            def fulltext(term=term):
+                page = backend.search(queryset, term).order_by('-search_rank')
+                page.count()
+                ids = [article.pk for article in page[:10]]
+                backend.highlight(ids, term)
+
+            results[f'icontains "{term}"'] = measure(icontains, repeat=args.repeat)
+            results[f'{type(backend).__name__} "{term}"'] = measure(fulltext, repeat=args.repeat)
+
+        report(f'Search latency over {args.articles} articles (count + first page)', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Model serializers against the ``values()`` fast path, per page size.
+
+Each case fetches one page, serializes it and renders the JSON body, so
+the numbers cover everything a list endpoint does after pagination.
+
+    python -m benchmarks.serializers --sizes 10 100 1000
+"""
+import argparse
+import random
+
+from .utils import benchmark_database, measure, report
+
+
+def populate(articles: int, tags: int, rng: random.Random) -> None:
+    from blog.models import Article, Comment, Tag
+
+    tag_objects = Tag.objects.bulk_create(Tag(name=f'tag{i}') for i in range(tags))
+    created = Article.objects.bulk_create(
+        Article(title=f'Article {i}', content='Some article content. ' * 50, excerpt='Some article content.')
+        for i in range(articles)
+    )
+    Through = Article.tags.through
+    Through.objects.bulk_create(
+        Through(article_id=article.pk, tag_id=tag.pk)
+        for article in created
+        for tag in rng.sample(tag_objects, k=min(3, tags))
+    )
+    Comment.objects.bulk_create(
+        Comment(article=created[0], content=f'Comment number {i}', author_name='Reader')
+        for i in range(articles)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from rest_framework.renderers import JSONRenderer
+        from blog.fast_serializers import FastArticleListSerializer, FastCommentSerializer, FastTagSerializer
+        from blog.models import Article, Comment, Tag
+        from blog.serializers import ArticleListSerializer, CommentSerializer, TagSerializer
+
+        populate(max(args.sizes), max(args.sizes), random.Random(42))
+        renderer = JSONRenderer()
+        cases = (
+            ('articles', Article.objects.published(), ArticleListSerializer, FastArticleListSerializer, ('tags',)),
+            ('tags', Tag.objects.order_by('name'), TagSerializer, FastTagSerializer, ()),
+            ('comments', Comment.objects.filter(is_approved=True), CommentSerializer, FastCommentSerializer, ()),
+        )
+        results = {}
+        for size in args.sizes:
+            for name, queryset, model_serializer, fast_serializer, prefetch in cases:
+                def model_path(queryset=queryset, serializer=model_serializer, prefetch=prefetch):
+                    page = list(serializer.narrow_queryset(queryset, None).prefetch_related(*prefetch)[:size])
+                    return renderer.render(serializer(page, many=True).data)
+
+                def fast_path(queryset=queryset, serializer=fast_serializer):
+                    page = list(serializer.values_queryset(queryset, None)[:size])
+                    return renderer.render(serializer(page).data)
+
+                assert model_path() == fast_path(), f'{name} bodies differ'
+                results[f'{name}, page of {size}, ModelSerializer'] = measure(model_path, repeat=args.repeat)
+                results[f'{name}, page of {size}, values() fast path'] = measure(fast_path, repeat=args.repeat)
+
+        report('Page serialization latency (fetch + serialize + render)', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Snapshot publishing cost and what a snapshot hit saves.
+
+Times a full publish, an incremental re-render after one comment, and
+compares an uncached Django list request with reading the pre-rendered
+file (a lower bound on what nginx pays per hit).
+
+    python -m benchmarks.snapshot --articles 2000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=2_000)
+    parser.add_argument('--tags', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_database(), tempfile.TemporaryDirectory() as root:
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.models import Article, Comment, Tag
+        from blog.snapshot import publish_snapshot
+
+        Article.objects.bulk_create(
+            (Article(title=f'Article {i}', content='Body text.', excerpt='Body text.') for i in range(args.articles)),
+            batch_size=2000,
+        )
+        tags = Tag.objects.bulk_create(Tag(name=f'tag-{i}') for i in range(args.tags))
+        ids = list(Article.objects.values_list('pk', flat=True))
+        Article.tags.through.objects.bulk_create(
+            Article.tags.through(article_id=pk, tag_id=tags[pk % len(tags)].pk) for pk in ids
+        )
+
+        with override_settings(BLOG_SNAPSHOT={'ENABLED': True, 'ROOT': root}):
+            start = time.perf_counter()
+            writer = publish_snapshot()
+            elapsed = time.perf_counter() - start
+            print(f'full publish: {writer.written} files in {elapsed:.1f}s')
+
+            def comment():
+                # Comment.save is atomic, so the re-render runs as it commits
+                Comment.objects.create(article_id=ids[0], author_name='Reader', content='A comment.')
+
+            results = {'one comment, incremental re-render': measure(comment, repeat=5, warmup=1)}
+            client = APIClient()
+            url = reverse('article-list')
+            with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}):
+                results['GET list through Django (uncached)'] = measure(lambda: client.get(url), repeat=args.repeat)
+            index = Path(root) / url.strip('/') / 'index.json'
+            results['read pre-rendered index.json'] = measure(index.read_bytes, repeat=args.repeat)
+
+        report(f'Snapshots over {args.articles} articles', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,410 @@
+"""
+Every ``blog.urls`` endpoint against a seeded dataset, written to JSON.
+
+Seeds a throwaway database with ``blog.seed.seed_blog`` and drives each
+endpoint through two paths:
+
+- ``client``: the Django test client, in-process (no HTTP, no server);
+- ``wsgi``: HTTP requests to the WSGI application served by ``wsgiref``
+  on a local port, or to ``--base-url`` (e.g. gunicorn). An external
+  server must use the database in these settings, filled with
+  ``manage.py seed_blog``; nothing is seeded then.
+
+Per endpoint it records p50/p95/p99/mean latency, throughput (requests
+per second over the run, with ``--concurrency`` clients for a ``--base-url``),
+queries per request (from the ``Server-Timing`` header) and the response
+status and size. The response cache is off by default so every request
+does the work; pass ``--cache`` to measure cached reads. Output keys are
+sorted, so two runs diff cleanly::
+
+    python -m benchmarks.suite --articles 2000 --output bench-before.json
+    python -m benchmarks.suite --articles 2000 --output bench-after.json
+    python -m benchmarks.suite --compare bench-before.json bench-after.json
+"""
+import argparse
+import itertools
+import json
+import logging
+import platform
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from http.client import HTTPConnection
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .utils import benchmark_database, setup_django, summarize
+
+# (method, path, body, content type)
+Request = Tuple[str, str, Optional[bytes], Optional[str]]
+# (status, response headers, body size)
+Outcome = Tuple[int, Dict[str, str], int]
+
+# Left out, with the reason reported in the output
+SKIPPED = {
+    'profile-list': 'needs a staff session and BLOG_PROFILING_ENABLED',
+    'profile-detail': 'needs a staff session and a stored profile',
+    'profile-download': 'needs a staff session and a stored profile',
+}
+
+QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def json_request(method: str, path: str, data: Any) -> Request:
+    return method, path, json.dumps(data).encode(), 'application/json'
+
+
+def build_cases(fixtures: Dict[str, Any]) -> Dict[str, Callable[[], Request]]:
+    """Case name -> a function returning the next request of that case"""
+    from django.urls import reverse
+
+    article, tag, comment = fixtures['article'], fixtures['tag'], fixtures['comment']
+    counter = itertools.count()
+    get = lambda path: lambda: ('GET', path, None, None)  # noqa: E731
+
+    def new_article() -> Request:
+        return json_request('POST', reverse('article-list'), {
+            'title': f'Benchmark article {next(counter)}', 'content': 'Benchmark body text.', 'tags': [{'name': 'python'}],
+        })
+
+    def bulk() -> Request:
+        rows = '\n'.join(
+            json.dumps({'title': f'Bulk article {next(counter)}', 'content': 'Body text.', 'tags': ['python']})
+            for _ in range(10)
+        )
+        return 'POST', reverse('article-bulk'), rows.encode(), 'application/x-ndjson'
+
+    def batch() -> Request:
+        paths = [reverse('article-list'), reverse('tag-list'), reverse('article-detail', args=[article])]
+        return json_request('POST', reverse('batch'), {'requests': [{'path': path} for path in paths]})
+
+    return {
+        'GET api-root': get(reverse('api-root')),
+        'GET article-list': get(reverse('article-list')),
+        'GET article-list ?page=5': get(reverse('article-list') + '?page=5'),
+        'GET article-list ?search': get(reverse('article-list') + '?search=database+latency'),
+        'GET article-list ?tags&ordering': get(reverse('article-list') + f'?tags={tag}&ordering=-approved_comments_count'),
+        'GET article-detail': get(reverse('article-detail', args=[article])),
+        'GET article-comments': get(reverse('article-comments', args=[article])),
+        'GET article-comment-detail': get(reverse('article-comment-detail', args=[article, comment])),
+        'GET article-related': get(reverse('article-related', args=[article])),
+        'GET article-archive': get(reverse('article-archive')),
+        'GET article-archive-month': get(reverse('article-archive-month', args=fixtures['month'])),
+        'GET article-trending': get(reverse('article-trending')),
+        'GET article-export': get(reverse('article-export') + '?output=ndjson'),
+        'GET article-comments-export': get(reverse('article-comments-export', args=[article])),
+        'GET tag-list': get(reverse('tag-list')),
+        'GET tag-detail': get(reverse('tag-detail', args=[tag])),
+        'GET tag-articles': get(reverse('tag-articles', args=[tag])),
+        'GET tag-autocomplete': get(reverse('tag-autocomplete') + '?q=da'),
+        'GET sync (first)': get(reverse('sync')),
+        'GET sync (delta)': get(reverse('sync') + f'?since={fixtures["sync_token"]}'),
+        'GET metrics': get(reverse('metrics')),
+        'POST batch (3 reads)': batch,
+        'POST article-list': new_article,
+        'PATCH article-detail': lambda: json_request(
+            'PATCH', reverse('article-detail', args=[article]), {'title': f'Edited {next(counter)}'}
+        ),
+        'POST article-add-comment': lambda: json_request(
+            'POST', reverse('article-add-comment', args=[article]), {'content': 'A benchmark comment.'}
+        ),
+        'POST tag-list': lambda: json_request('POST', reverse('tag-list'), {'name': f'bench-{next(counter)}'}),
+        'POST article-bulk (10 rows)': bulk,
+    }
+
+
+def route_names() -> List[str]:
+    """Every named route under ``blog.urls``"""
+    import blog.urls
+
+    def walk(patterns) -> Iterator[str]:
+        for pattern in patterns:
+            if hasattr(pattern, 'url_patterns'):
+                yield from walk(pattern.url_patterns)
+            elif pattern.name:
+                yield pattern.name
+
+    return sorted(set(walk(blog.urls.urlpatterns)))
+
+
+def load_fixtures() -> Dict[str, Any]:
+    """Ids the cases address: a busy published article, a popular tag"""
+    from django.db.models import Count
+    from blog.models import Article, Comment, Tag, archive_month
+    from blog.sync import changes_since
+
+    article = Article.objects.published().order_by('-approved_comments_count').first()
+    if article is None:
+        raise SystemExit('No published articles: seed the database first (manage.py seed_blog)')
+    tag = Tag.objects.annotate(uses=Count('articles')).order_by('-uses').first()
+    comment = Comment.objects.filter(article=article, is_approved=True).first()
+    year, month = archive_month(article.created_at)
+    return {
+        'article': article.pk,
+        'tag': tag.pk,
+        'comment': comment.pk if comment else 0,
+        'month': [f'{year}', f'{month}'],
+        # A token from before the run: the delta holds the run's own writes
+        'sync_token': changes_since(None)['token'],
+    }
+
+
+class ClientDriver:
+    name = 'client'
+
+    def __init__(self) -> None:
+        from django.test import Client
+        self.client = Client()
+
+    def __call__(self, request: Request) -> Outcome:
+        method, path, body, content_type = request
+        kwargs = {'content_type': content_type} if content_type else {}
+        response = self.client.generic(method, path, body or b'', **kwargs)
+        size = sum(len(chunk) for chunk in response.streaming_content) if response.streaming else len(response.content)
+        return response.status_code, dict(response.items()), size
+
+
+class HTTPDriver:
+    name = 'wsgi'
+
+    def __init__(self, base_url: str) -> None:
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.local = threading.local()
+
+    def connection(self) -> HTTPConnection:
+        if getattr(self.local, 'connection', None) is None:
+            self.local.connection = HTTPConnection(self.host, self.port, timeout=60)
+        return self.local.connection
+
+    def __call__(self, request: Request) -> Outcome:
+        method, path, body, content_type = request
+        headers = {'Content-Type': content_type} if content_type else {}
+        for attempt in (1, 2):
+            connection = self.connection()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                size = len(response.read())
+                break
+            except (ConnectionError, OSError):
+                # The server closed a kept-alive connection; retry once on a new one
+                connection.close()
+                self.local.connection = None
+                if attempt == 2:
+                    raise
+        if response.will_close:
+            connection.close()
+            self.local.connection = None
+        return response.status, dict(response.getheaders()), size
+
+
+@contextmanager
+def wsgi_server() -> Iterator[str]:
+    """
+    Serve the project's WSGI application on a free local port, one request
+    at a time: the requests share the benchmark's database connection.
+    """
+    from wsgiref.simple_server import WSGIRequestHandler, make_server
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connections
+
+    class Handler(WSGIRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+    # An in-memory SQLite test database only exists on this connection
+    shared = {alias: connections[alias] for alias in connections if connections[alias].vendor == 'sqlite'}
+    shared = {alias: conn for alias, conn in shared.items() if conn.is_in_memory_db()}
+    application = get_wsgi_application()
+
+    def app(environ, start_response):
+        for alias, conn in shared.items():
+            connections[alias] = conn
+        return application(environ, start_response)
+
+    for conn in shared.values():
+        conn.inc_thread_sharing()
+    server = make_server('127.0.0.1', 0, app, handler_class=Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+        for conn in shared.values():
+            conn.dec_thread_sharing()
+
+
+def run_case(driver: Callable[[Request], Outcome], next_request: Callable[[], Request], repeat: int,
+             warmup: int, concurrency: int) -> Dict[str, Any]:
+    lock = threading.Lock()
+
+    def once() -> Tuple[float, Outcome]:
+        with lock:
+            request = next_request()
+        started = time.perf_counter()
+        outcome = driver(request)
+        return (time.perf_counter() - started) * 1000, outcome
+
+    for _ in range(warmup):
+        once()
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            runs = list(pool.map(lambda _: once(), range(repeat)))
+    else:
+        runs = [once() for _ in range(repeat)]
+    elapsed = time.perf_counter() - started
+
+    samples = [ms for ms, _ in runs]
+    status, headers, size = runs[-1][1]
+    errors = sum(1 for _, (code, _, _) in runs if code >= 400)
+    queries = [int(match.group(1)) for _, (_, h, _) in runs for match in [QUERIES.search(h.get('Server-Timing', ''))]
+               if match]
+    return {
+        **{key: round(value, 3) for key, value in summarize(samples).items()},
+        'rps': round(repeat / elapsed, 1),
+        'queries': max(queries) if queries else None,
+        'status': status,
+        'errors': errors,
+        'bytes': size,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import django
+    from django.db import connection
+    from django.test import override_settings
+    from blog.seed import seed_blog
+
+    # Write endpoints log every request at INFO
+    logging.disable(logging.INFO)
+    dataset = None
+    if not args.base_url:
+        dataset = seed_blog(
+            articles=args.articles, tags=args.tags, comments=args.comments, seed=args.seed,
+        ).as_dict()
+        dataset.pop('seconds')
+
+    cases = build_cases(load_fixtures())
+    covered = {name.split(' ')[1] for name in cases}
+    if args.only:
+        cases = {name: case for name, case in cases.items() if any(part in name for part in args.only)}
+    missing = sorted(set(route_names()) - covered - set(SKIPPED))
+
+    overrides = {
+        'BLOG_METRICS': {'ENABLED': True, 'SERVER_TIMING': True},
+        # Benchmark writes would otherwise re-render snapshot files
+        'BLOG_SNAPSHOT': {'ENABLED': False},
+        **({} if args.cache else {'BLOG_RESPONSE_CACHE': {'ENABLED': False}}),
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    with override_settings(**overrides):
+        drivers = []
+        if not args.base_url:
+            drivers.append((ClientDriver(), nullcontext(None)))
+        drivers.append((None, nullcontext(args.base_url) if args.base_url else wsgi_server()))
+        for driver, server in drivers:
+            with server as base_url:
+                if driver is None:
+                    driver = HTTPDriver(base_url)
+                concurrency = args.concurrency if driver.name == 'wsgi' else 1
+                results[driver.name] = {}
+                for name, case in cases.items():
+                    results[driver.name][name] = run_case(driver, case, args.repeat, args.warmup, concurrency)
+                    print(f'{driver.name:<7} {name:<40} p50 {results[driver.name][name]["p50"]:>9.2f} ms')
+
+    failed = sorted(
+        f'{driver} {name}: {result["errors"]} of {args.repeat} requests failed, last status {result["status"]}'
+        for driver, cases in results.items() for name, result in cases.items() if result['errors']
+    )
+    return {
+        'failed': failed,
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'dataset': dataset,
+            'base_url': args.base_url,
+            'repeat': args.repeat,
+            'concurrency': args.concurrency,
+            'cache': args.cache,
+        },
+        'results': results,
+        'skipped': SKIPPED,
+        'uncovered': missing,
+    }
+
+
+def compare(before_path: str, after_path: str) -> None:
+    """Print p50/p95 and query count changes between two result files"""
+    with open(before_path) as handle:
+        before = json.load(handle)
+    with open(after_path) as handle:
+        after = json.load(handle)
+    print(f'{before["meta"]["revision"]} -> {after["meta"]["revision"]}')
+    print(f'{"driver / case":<50} {"p50 ms":>18} {"p95 ms":>18} {"queries":>9}')
+    for driver, cases in after['results'].items():
+        for name, new in cases.items():
+            old = before['results'].get(driver, {}).get(name)
+            if old is None:
+                continue
+            change = lambda key: f'{old[key]:.2f}>{new[key]:.2f} {(new[key] / old[key] - 1) * 100 if old[key] else 0:+.0f}%'  # noqa: E731
+            queries = f'{old["queries"]}>{new["queries"]}' if old['queries'] != new['queries'] else f'{new["queries"]}'
+            print(f'{driver + " " + name:<50} {change("p50"):>18} {change("p95"):>18} {queries:>9}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--tags', type=int, default=200)
+    parser.add_argument('--comments', type=float, default=5.0, help='Mean comments per article')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--concurrency', type=int, default=1, help='Parallel clients against --base-url')
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache on')
+    parser.add_argument('--base-url', help='Benchmark a running server instead of a local wsgiref one')
+    parser.add_argument('--only', nargs='+', help='Cases whose name contains one of these')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.concurrency > 1 and not args.base_url:
+        parser.error('--concurrency needs --base-url: the local server handles one request at a time')
+    if args.base_url:
+        setup_django()
+        results = run(args)
+    else:
+        with benchmark_database():
+            results = run(args)
+    with open(args.output, 'w') as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+    for failure in results['failed']:
+        print(f'Failed: {failure}')
+    if results['uncovered']:
+        print(f'Routes without a case: {", ".join(results["uncovered"])}')
+    print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Delta sync cost: a few changes among many articles vs refetching lists.
+
+    python -m benchmarks.sync --articles 20000
+"""
+import argparse
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=20_000)
+    parser.add_argument('--changes', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.models import Article
+
+        Article.objects.bulk_create(
+            (Article(title=f'Article {i}', content='Body text.', excerpt='Body text.') for i in range(args.articles)),
+            batch_size=2000,
+        )
+        client = APIClient()
+        url = reverse('sync')
+        results = {}
+        with override_settings(BLOG_SYNC={'LAG': 0}, BLOG_RESPONSE_CACHE={'ENABLED': False}):
+            results['first sync, one page of 500'] = measure(lambda: client.get(url), repeat=args.repeat)
+
+            token = None
+            while True:
+                data = client.get(url, {'since': token} if token else {}).json()
+                token = data['token']
+                if not data['has_more']:
+                    break
+            for article in Article.objects.order_by('?')[:args.changes]:
+                article.save()
+            results[f'delta sync, {args.changes} changed'] = measure(
+                lambda: client.get(url, {'since': token}), repeat=args.repeat
+            )
+            pages = -(-args.articles // 10)
+            results['list page 1 (what the hook refetched)'] = measure(
+                lambda: client.get(reverse('article-list')), repeat=args.repeat
+            )
+            print(f'a full refetch of the list is {pages} such pages')
+
+        report(f'Delta sync over {args.articles} articles', results)
+
+
+if __name__ == '__main__':
+    main()
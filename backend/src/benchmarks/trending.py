@@ -0,0 +1,85 @@
+"""
+Buffered view counting and trending ranking cost.
+
+Compares counting 1000 views through the in-memory buffer (one batched
+flush) with writing each view in its own transaction, then times the
+ranking query over a week of hourly view counts and the endpoint.
+
+    python -m benchmarks.trending --articles 10000 --rows 200000
+"""
+import argparse
+import random
+import time
+
+from .utils import benchmark_database, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=10_000)
+    parser.add_argument('--rows', type=int, default=200_000, help='hourly view-count rows in the window')
+    parser.add_argument('--views', type=int, default=1_000, help='views counted per write case')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        from django.db import transaction
+        from django.db.models import F
+        from django.test import override_settings
+        from django.urls import reverse
+        from rest_framework.test import APIClient
+        from blog.models import Article, ArticleViewCount
+        from blog.trending import ViewCounter, compute_trending, current_hour, trending_ranking, write_views
+
+        rng = random.Random(15)
+        Article.objects.bulk_create(
+            (Article(title=f'Article {i}', content='Body text.', excerpt='Body text.') for i in range(args.articles)),
+            batch_size=2000,
+        )
+        ids = list(Article.objects.values_list('pk', flat=True))
+        hour = current_hour()
+        counts = {}
+        while len(counts) < min(args.rows, len(ids) * 168):
+            # Heavy-tailed hourly views: most hours see a handful, a few see thousands
+            counts[rng.choice(ids), hour - rng.randrange(168)] = int(rng.paretovariate(1.2))
+        write_views(counts)
+
+        results = {}
+        sample = [rng.choice(ids) for _ in range(args.views)]
+        with override_settings(BLOG_TRENDING={'FLUSH_THRESHOLD': 10 ** 9, 'FLUSH_INTERVAL': 10 ** 9}):
+            def buffered():
+                counter = ViewCounter()
+                for pk in sample:
+                    counter.record(pk)
+                counter.flush()
+
+            def per_view():
+                for pk in sample:
+                    with transaction.atomic():
+                        updated = ArticleViewCount.objects.filter(article_id=pk, hour=hour).update(
+                            views=F('views') + 1
+                        )
+                        if not updated:
+                            ArticleViewCount.objects.create(article_id=pk, hour=hour, views=1)
+
+            results[f'{args.views} views, buffered + one flush'] = measure(buffered, repeat=args.repeat)
+            results[f'{args.views} views, one write each'] = measure(per_view, repeat=3, warmup=1)
+
+        rows = ArticleViewCount.objects.count()
+        results[f'rank {rows} hourly rows'] = measure(compute_trending, repeat=args.repeat)
+
+        client = APIClient()
+        url = reverse('article-trending')
+        trending_ranking(refresh=True)
+        with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}):
+            results['endpoint, uncached'] = measure(lambda: client.get(url), repeat=args.repeat)
+        results['endpoint, cached'] = measure(lambda: client.get(url), repeat=args.repeat)
+
+        start = time.perf_counter()
+        trending_ranking(refresh=True)
+        print(f'refresh: {(time.perf_counter() - start) * 1000:.1f} ms')
+        report('View counting and trending', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+
+def setup_django() -> None:
+    """Configure Django for a benchmark run outside manage.py"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'BlogProject.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    """Create a migrated throwaway database and destroy it afterwards"""
+    setup_django()
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func: Callable[[], object], repeat: int = 20, warmup: int = 2) -> Dict[str, float]:
+    """Time ``func`` and return latency statistics in milliseconds"""
+    for _ in range(warmup):
+        func()
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency statistics of ``samples`` (milliseconds)"""
+    samples = sorted(samples)
+    return {
+        'min': samples[0],
+        'p50': statistics.median(samples),
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'p99': samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        'mean': statistics.fmean(samples),
+        'max': samples[-1],
+    }
+
+
+def report(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    """Print a small latency table"""
+    print(f'\n{title}')
+    print(f'{"case":<48} {"p50 ms":>10} {"p95 ms":>10} {"max ms":>10}')
+    for name, stats in results.items():
+        print(f'{name:<48} {stats["p50"]:>10.2f} {stats["p95"]:>10.2f} {stats["max"]:>10.2f}')
@@ -1,6 +1,20 @@
 from django.contrib import admin
 from .models import Article, Comment
+from .sync import record_deletions
+
+
+class TombstoneAdmin(admin.ModelAdmin):
+    """Record admin deletions for delta sync clients, as the API does"""
+
+    def delete_model(self, request, obj) -> None:
+        record_deletions([obj])
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset) -> None:
+        record_deletions(queryset)
+        super().delete_queryset(request, queryset)
+
 
 # Register your models here.
-admin.site.register(Article)
-admin.site.register(Comment)
+admin.site.register(Article, TombstoneAdmin)
+admin.site.register(Comment, TombstoneAdmin)
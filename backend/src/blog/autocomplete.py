@@ -0,0 +1,194 @@
+"""
+Tag autocomplete from a per-process prefix index.
+
+Every tag name is indexed under the name itself and under each later
+word (``web-development`` is found by ``web`` and by ``dev``) in one
+sorted list, so the entries matching a prefix are a contiguous slice
+found by two bisections. Matches are ranked by how many published
+articles use the tag, then by name. Short prefixes match many entries, so
+their ranking is memoized until the index changes.
+
+Each worker loads the index lazily on first use. Tag saves and deletes
+patch the local index once they commit and bump a version number in the
+shared cache (``BLOG_AUTOCOMPLETE['ALIAS']``); other workers see the new
+version on their next lookup and reload, so every worker converges on the
+same names. With a per-process cache backend (local memory) workers only
+converge through ``MAX_AGE``. Article counts change with every article
+write, so they are only refreshed by that periodic reload.
+"""
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Tag
+
+DEFAULTS = {
+    'ALIAS': 'default',
+    'KEY_PREFIX': 'blog',
+    'LIMIT': 10,
+    'MAX_LIMIT': 50,
+    # Seconds before article counts are reloaded even without tag writes
+    'MAX_AGE': 300,
+    # Prefixes matching more entries than this have their ranking memoized
+    'MEMO_SPAN': 256,
+}
+
+# (id, name, published article count)
+Suggestion = Tuple[int, str, int]
+
+WORD_BOUNDARY = re.compile(r'[\s\-_/.+#]+')
+
+
+def autocomplete_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_AUTOCOMPLETE', {})}
+
+
+def index_keys(name: str) -> List[str]:
+    """The name and every suffix of it that starts a word"""
+    keys = [name]
+    keys.extend(name[match.end():] for match in WORD_BOUNDARY.finditer(name) if match.end() < len(name))
+    return list(dict.fromkeys(keys))
+
+
+class TagIndex:
+    """Sorted (key, tag id) entries with per-tag names and article counts"""
+
+    def __init__(self, tags: Iterable[Suggestion], memo_span: int = DEFAULTS['MEMO_SPAN']) -> None:
+        self.tags: Dict[int, Tuple[str, int]] = {}
+        entries = []
+        for pk, name, count in tags:
+            self.tags[pk] = (name, count)
+            entries.extend((key, pk) for key in index_keys(name))
+        entries.sort()
+        self.entries: List[Tuple[str, int]] = entries
+        self.memo_span = memo_span
+        self.memo: Dict[str, List[int]] = {}
+
+    @classmethod
+    def load(cls, **kwargs) -> 'TagIndex':
+        tags = Tag.objects.order_by().values_list('pk', 'name').annotate(
+            published=Count('articles', filter=Q(articles__is_published=True))
+        )
+        return cls(tags, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def add(self, pk: int, name: str) -> None:
+        """Index a new or renamed tag, keeping a renamed tag's article count"""
+        count = self.remove(pk)
+        self.tags[pk] = (name, count)
+        for key in index_keys(name):
+            insort(self.entries, (key, pk))
+
+    def remove(self, pk: int) -> int:
+        """Drop a tag from the index and return its article count"""
+        name, count = self.tags.pop(pk, (None, 0))
+        if name is not None:
+            for key in index_keys(name):
+                position = bisect_left(self.entries, (key, pk))
+                if position < len(self.entries) and self.entries[position] == (key, pk):
+                    del self.entries[position]
+        self.memo.clear()
+        return count
+
+    def rank(self, ids: Iterable[int], limit: int) -> List[int]:
+        tags = self.tags
+        return heapq.nsmallest(limit, set(ids), key=lambda pk: (-tags[pk][1], tags[pk][0]))
+
+    def search(self, prefix: str, limit: int, memo_limit: int) -> List[Suggestion]:
+        """The ``limit`` most used tags with a word starting with ``prefix``"""
+        prefix = prefix.strip().lower()
+        start = bisect_left(self.entries, (prefix,))
+        end = bisect_left(self.entries, (prefix + '\U0010ffff',)) if prefix else len(self.entries)
+        if end - start > self.memo_span and limit <= memo_limit:
+            ranked = self.memo.get(prefix)
+            if ranked is None:
+                ranked = self.memo[prefix] = self.rank((pk for _, pk in self.entries[start:end]), memo_limit)
+            ranked = ranked[:limit]
+        else:
+            ranked = self.rank((pk for _, pk in self.entries[start:end]), limit)
+        return [(pk, *self.tags[pk]) for pk in ranked]
+
+
+class TagAutocomplete:
+    """The process-wide index, reloaded when another worker changes tags"""
+
+    def __init__(self) -> None:
+        self._index: Optional[TagIndex] = None
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return autocomplete_config()
+
+    @property
+    def backend(self):
+        return caches[self.config['ALIAS']]
+
+    @property
+    def version_key(self) -> str:
+        return f'{self.config["KEY_PREFIX"]}:autocomplete:version'
+
+    def shared_version(self) -> int:
+        version = self.backend.get(self.version_key)
+        if version is None:
+            self.backend.add(self.version_key, 1, timeout=None)
+            version = self.backend.get(self.version_key, 1)
+        return version
+
+    def index(self) -> TagIndex:
+        version = self.shared_version()
+        with self._lock:
+            fresh = time.monotonic() - self._loaded_at < self.config['MAX_AGE']
+            if self._index is not None and version == self._version and fresh:
+                return self._index
+        index = TagIndex.load(memo_span=self.config['MEMO_SPAN'])
+        with self._lock:
+            self._index, self._version, self._loaded_at = index, version, time.monotonic()
+        return index
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> List[Suggestion]:
+        config = self.config
+        limit = max(1, min(limit or config['LIMIT'], config['MAX_LIMIT']))
+        index = self.index()
+        with self._lock:
+            return index.search(prefix, limit, config['MAX_LIMIT'])
+
+    def tag_saved(self, tag: Tag) -> None:
+        transaction.on_commit(lambda: self._apply(lambda index: index.add(tag.pk, tag.name)))
+
+    def tag_deleted(self, pk: int) -> None:
+        transaction.on_commit(lambda: self._apply(lambda index: index.remove(pk)))
+
+    def invalidate(self) -> None:
+        """Reload every worker's index, for writes that bypass signals"""
+        transaction.on_commit(lambda: self._apply(None))
+
+    def _apply(self, change: Optional[Callable[[TagIndex], Any]]) -> None:
+        self.shared_version()
+        version = self.backend.incr(self.version_key)
+        with self._lock:
+            if change is not None and self._index is not None and version == self._version + 1:
+                # No other worker changed tags in between: patch instead of reloading
+                change(self._index)
+                self._version = version
+            else:
+                self._index = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = self._version = None
+
+
+tag_autocomplete = TagAutocomplete()
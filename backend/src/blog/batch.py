@@ -0,0 +1,143 @@
+"""
+Batch read endpoint: several API GETs in one round-trip.
+
+``POST /api/batch/`` takes ``{"requests": [{"path": "/api/articles/?page=2"},
+...], "consistent": false}`` and answers with one entry per sub-request,
+in order: ``{"status": ..., "headers": {...}, "body": ...}``.
+
+Sub-requests are dispatched straight to the resolved view in this process:
+they skip the middleware stack, share the outer request's user, cookies
+and database connection, and still go through the views' response cache
+and conditional GET handling (``headers`` may carry ``If-None-Match``).
+Only reads are batched; writes keep their own requests so each one gets
+its own transaction, validation response and CSRF check.
+
+With ``consistent`` the sub-requests run in one transaction, so they all
+see the same database state: a REPEATABLE READ, READ ONLY transaction on
+PostgreSQL, and a single read transaction on SQLite (a snapshot in WAL
+mode; otherwise writers wait until the batch finishes).
+"""
+import json
+import logging
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.http import HttpRequest, HttpResponseBase, QueryDict, StreamingHttpResponse
+from django.urls import Resolver404, resolve
+from rest_framework import serializers
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'MAX_REQUESTS': 20,
+    'PREFIX': '/api/',
+}
+
+# Sub-response headers a client can act on
+RETURNED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'X-Cache', 'Location')
+
+# Per sub-request headers copied into its META
+FORWARDED_HEADERS = ('If-None-Match', 'If-Modified-Since', 'Accept-Language')
+
+
+def batch_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_BATCH', {})}
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'HEAD'], default='GET')
+    path = serializers.CharField(max_length=2000)
+    headers = serializers.DictField(child=serializers.CharField(max_length=1000), required=False, default=dict)
+
+    def validate_path(self, value: str) -> str:
+        prefix = batch_config()['PREFIX']
+        if not value.startswith(prefix):
+            raise serializers.ValidationError(f'Paths must start with {prefix}.')
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+    consistent = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        limit = batch_config()['MAX_REQUESTS']
+        if len(value) > limit:
+            raise serializers.ValidationError(f'At most {limit} requests per batch.')
+        return value
+
+
+def sub_request(outer: HttpRequest, method: str, path: str, headers: Dict[str, str]) -> HttpRequest:
+    """A GET for ``path`` carrying the outer request's identity but not its body or validators"""
+    url = urlsplit(path)
+    request = HttpRequest()
+    request.method = method
+    request.path = request.path_info = url.path
+    meta = {
+        key: value for key, value in outer.META.items()
+        if key not in ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'CONTENT_TYPE', 'CONTENT_LENGTH')
+    }
+    meta.update(REQUEST_METHOD=method, PATH_INFO=url.path, QUERY_STRING=url.query)
+    for name, value in headers.items():
+        if name.title() in FORWARDED_HEADERS:
+            meta[f'HTTP_{name.upper().replace("-", "_")}'] = value
+    request.META = meta
+    request.GET = QueryDict(url.query)
+    request.COOKIES = outer.COOKIES
+    for attribute in ('user', 'session'):
+        if hasattr(outer, attribute):
+            setattr(request, attribute, getattr(outer, attribute))
+    return request
+
+
+def error_entry(status: int, message: str) -> Dict[str, Any]:
+    return {'status': status, 'headers': {}, 'body': {'error': message}}
+
+
+def response_entry(response: HttpResponseBase) -> Dict[str, Any]:
+    headers = {name: response[name] for name in RETURNED_HEADERS if response.has_header(name)}
+    if isinstance(response, Response):
+        # Rendered once, with the whole batch
+        body = response.data
+    elif isinstance(response, StreamingHttpResponse):
+        return error_entry(400, 'Streaming responses cannot be batched.')
+    elif response.status_code == 304 or not response.content:
+        body = None
+    elif response.get('Content-Type', '').startswith('application/json'):
+        body = json.loads(response.content)
+    else:
+        body = response.content.decode(response.charset)
+    return {'status': response.status_code, 'headers': headers, 'body': body}
+
+
+def dispatch(outer: HttpRequest, item: Dict[str, Any]) -> Dict[str, Any]:
+    path = urlsplit(item['path']).path
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return error_entry(404, 'Not found.')
+    if match.url_name == 'batch':
+        return error_entry(400, 'Batches cannot be nested.')
+    request = sub_request(outer, item['method'], item['path'], item['headers'])
+    request.resolver_match = match
+    try:
+        return response_entry(match.func(request, *match.args, **match.kwargs))
+    except Exception as e:
+        logger.error(f"Error in batched request {item['path']}: {str(e)}")
+        return error_entry(500, 'Internal server error.')
+
+
+def execute_batch(outer: HttpRequest, items: List[Dict[str, Any]], consistent: bool = False) -> List[Dict[str, Any]]:
+    """Run ``items`` in order, optionally inside one read-only snapshot"""
+    if not consistent:
+        return [dispatch(outer, item) for item in items]
+    nested = connection.in_atomic_block
+    with transaction.atomic():
+        if connection.vendor == 'postgresql' and not nested:
+            # Must be the transaction's first statement; READ COMMITTED would re-read per query
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        return [dispatch(outer, item) for item in items]
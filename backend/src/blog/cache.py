@@ -0,0 +1,313 @@
+"""
+Versioned response cache for the blog read endpoints.
+
+Every cached response records a version token for each namespace it was
+built from: the collection (``articles``, ``tags``, ``comments``) and every
+item it renders (``article:<id>``, ``tag:<id>``, ``related:<id>`` for an
+article's related-articles ranking). Model signals bump the
+tokens a write touches, and an entry is only served while all of its
+recorded tokens are still current. A new comment on article 5 therefore
+only evicts responses that render article 5.
+
+Entries live in a Django cache (``BLOG_RESPONSE_CACHE['ALIAS']``, local
+memory or file based) fronted by a small per-process LRU. Tokens are always
+read from that cache, so workers only see each other's invalidations when
+it is shared between processes (``DJANGO_CACHE_DIR``). Local memory is
+private to a process: with more than one worker, a write only evicts the
+responses cached by the worker that served it.
+"""
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+ARTICLES = 'articles'
+TAGS = 'tags'
+COMMENTS = 'comments'
+# Bumped by a full rebuild of the related-articles rankings
+RELATED = 'related'
+# Bumped when a refresh changes the trending order
+TRENDING = 'trending'
+
+DEFAULTS = {
+    'ENABLED': True,
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'LOCAL_MAX_ENTRIES': 512,
+    'KEY_PREFIX': 'blog',
+}
+
+# Validator headers stored with an entry so hits can still answer with 304
+STORED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+
+def article_ns(pk: Any) -> str:
+    return f'article:{pk}'
+
+
+def tag_ns(pk: Any) -> str:
+    return f'tag:{pk}'
+
+
+def related_ns(pk: Any) -> str:
+    return f'related:{pk}'
+
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used key"""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._data: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheStats:
+    """Per-process hit/miss counters"""
+
+    fields = ('hits', 'misses', 'stores', 'invalidations')
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def reset(self) -> None:
+        with self._lock:
+            for name in self.fields:
+                setattr(self, name, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: getattr(self, name) for name in self.fields}
+
+
+class ResponseCache:
+    """Stores rendered-ready response data guarded by namespace version tokens"""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+        self._local: Optional[LRUCache] = None
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return {**DEFAULTS, **getattr(settings, 'BLOG_RESPONSE_CACHE', {})}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config['ENABLED'])
+
+    @property
+    def backend(self):
+        return caches[self.config['ALIAS']]
+
+    @property
+    def local(self) -> LRUCache:
+        max_entries = self.config['LOCAL_MAX_ENTRIES']
+        if self._local is None or self._local.max_entries != max_entries:
+            self._local = LRUCache(max_entries)
+        return self._local
+
+    def make_key(self, request: Request, scope: str) -> str:
+        params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+        digest = hashlib.sha1(f'{request.path}|{params}'.encode()).hexdigest()
+        return f'{self.config["KEY_PREFIX"]}:resp:{scope}:{digest}'
+
+    def version_key(self, namespace: str) -> str:
+        return f'{self.config["KEY_PREFIX"]}:ver:{namespace}'
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached entry if all of its namespace tokens are still current"""
+        entry = self.local.get(key)
+        if entry is None:
+            entry = self.backend.get(key)
+        if entry is None:
+            return None
+        versions = entry['versions']
+        current = self.backend.get_many([self.version_key(ns) for ns in versions])
+        if any(current.get(self.version_key(ns)) != token for ns, token in versions.items()):
+            self.local.delete(key)
+            return None
+        self.local.set(key, entry)
+        return entry
+
+    def set(
+        self,
+        key: str,
+        status: int,
+        data: Any,
+        namespaces: Iterable[str],
+        started: int,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """
+        Store ``data`` under ``key``.
+
+        Namespaces that have never been versioned get ``started`` as their
+        token. If any token is newer than ``started`` a write raced with the
+        build and the response is not stored.
+        """
+        version_keys = {self.version_key(ns): ns for ns in set(namespaces)}
+        current = self.backend.get_many(list(version_keys))
+        for missing in set(version_keys) - set(current):
+            self.backend.add(missing, started, timeout=None)
+            current[missing] = self.backend.get(missing)
+        if any(token is None or token > started for token in current.values()):
+            return False
+        entry = {
+            'status': status,
+            # Round-trip through pickle to drop serializer references from ReturnDict/ReturnList
+            'data': pickle.loads(pickle.dumps(data)),
+            'versions': {version_keys[vk]: token for vk, token in current.items()},
+            'headers': headers or {},
+        }
+        self.backend.set(key, entry, timeout=self.config['TIMEOUT'])
+        self.local.set(key, entry)
+        self.stats.incr('stores')
+        return True
+
+    def invalidate(self, *namespaces: str) -> None:
+        """
+        Bump the version token of each namespace.
+
+        Inside a transaction the tokens are bumped again once it commits: a
+        request reading the old rows meanwhile would otherwise store its
+        response under the tokens bumped before the commit.
+        """
+        if not namespaces:
+            return
+        namespaces = set(namespaces)
+        self._bump(namespaces)
+        self.stats.incr('invalidations', len(namespaces))
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._bump(namespaces))
+
+    def _bump(self, namespaces: Set[str]) -> None:
+        token = time.time_ns()
+        self.backend.set_many({self.version_key(ns): token for ns in namespaces}, timeout=None)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.local.clear()
+
+    def serve(
+        self,
+        request: Request,
+        scope: str,
+        build: Callable[[], Response],
+        get_namespaces: Callable[[Any], Iterable[str]],
+    ) -> Response:
+        """Return a cached response for ``request`` or build and store one"""
+        if not self.enabled or request.method not in ('GET', 'HEAD'):
+            return build()
+        key = self.make_key(request, scope)
+        entry = self.get(key)
+        if entry is not None:
+            self.stats.incr('hits')
+            response = Response(entry['data'], status=entry['status'], headers=entry.get('headers'))
+            last_modified = parse_http_date_safe(response.get('Last-Modified', ''))
+            response = get_conditional_response(
+                request, etag=response.get('ETag'), last_modified=last_modified, response=response
+            )
+            response['X-Cache'] = 'HIT'
+            return response
+
+        self.stats.incr('misses')
+        started = time.time_ns()
+        response = build()
+        if response.status_code == 200:
+            headers = {name: response[name] for name in STORED_HEADERS if response.has_header(name)}
+            self.set(key, response.status_code, response.data, get_namespaces(response.data), started, headers)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+response_cache = ResponseCache()
+
+
+def response_items(data: Any) -> List[Dict[str, Any]]:
+    """Top-level objects rendered in a (possibly paginated) response body"""
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        return data['results']
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return [data]
+    return []
+
+
+def article_namespaces(data: Any) -> Set[str]:
+    """Item namespaces for responses rendering articles and their nested tags"""
+    namespaces = set()
+    for item in response_items(data):
+        if 'id' not in item:
+            # Without ids the items cannot be tracked, so depend on every write
+            namespaces.update((COMMENTS, TAGS))
+            continue
+        namespaces.add(article_ns(item['id']))
+        for tag in item.get('tags') or []:
+            namespaces.add(tag_ns(tag['id']))
+    return namespaces
+
+
+class CachedReadMixin:
+    """
+    Serve ``list`` and ``retrieve`` through the response cache.
+
+    Views describe what a response depends on with ``get_cache_namespaces``;
+    custom actions can opt in by wrapping their body in ``cached_response``.
+    """
+
+    def get_cache_scope(self) -> str:
+        return f'{self.basename or type(self).__name__}:{self.action}'
+
+    def get_cache_namespaces(self, data: Any) -> Iterable[str]:
+        raise NotImplementedError
+
+    def cached_response(self, request: Request, build: Callable[[], Response]) -> Response:
+        return response_cache.serve(request, self.get_cache_scope(), build, self.get_cache_namespaces)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return self.cached_response(request, lambda: super(CachedReadMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return self.cached_response(request, lambda: super(CachedReadMixin, self).retrieve(request, *args, **kwargs))
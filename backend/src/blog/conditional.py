@@ -0,0 +1,173 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304) for the blog API.
+
+Validators are derived from small aggregate queries over the rows a response
+would render (counts and ``MAX(updated_at)``) rather than from the rendered
+body, so a matching ``If-None-Match`` or ``If-Modified-Since`` is answered
+before any serializer runs.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, F, Func, IntegerField, Max, Q, QuerySet, Subquery
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .models import RECENT_DAYS, ArchiveMonth, Comment, RelatedArticle, Tag
+
+# (values folded into the ETag, Last-Modified)
+ConditionalState = Tuple[Tuple[Any, ...], Optional[datetime]]
+
+DEFAULTS = {
+    'ENABLED': True,
+    'CACHE_CONTROL': {'public': True, 'max_age': 0, 'must_revalidate': True},
+}
+
+
+def conditional_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_CONDITIONAL_GET', {})}
+
+
+def _latest(*values: Optional[datetime]) -> Optional[datetime]:
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+def _scalar(queryset: QuerySet, function: str, field: str, **extra) -> Subquery:
+    """
+    Uncorrelated scalar subquery such as ``SELECT MAX(updated_at) FROM ...``.
+
+    A plain ``Func`` keeps Django from adding a GROUP BY, so the subquery
+    always yields a single row and several aggregates share one round trip.
+    """
+    value = Func(F(field), function=function, **extra)
+    return Subquery(queryset.order_by().annotate(value=value).values('value')[:1])
+
+
+def _count(queryset: QuerySet) -> Subquery:
+    return _scalar(queryset, 'COUNT', 'pk', output_field=IntegerField())
+
+
+def _max_updated(queryset: QuerySet) -> Subquery:
+    return _scalar(queryset, 'MAX', 'updated_at')
+
+
+def article_set_state(articles: QuerySet) -> ConditionalState:
+    """
+    Validators for a filtered set of articles and everything their list items render.
+
+    ``is_recent`` flips with the passage of time alone, so the number of
+    recent articles and the moment the latest one aged out are folded in too.
+    """
+    cutoff = timezone.now() - timedelta(days=RECENT_DAYS)
+    ids = articles.order_by().values('pk')
+    comments = Comment.objects.filter(article__in=ids, is_approved=True)
+    tags = Tag.objects.filter(articles__in=ids)
+    state = articles.order_by().aggregate(
+        count=Count('pk'),
+        last=Max('updated_at'),
+        recent=Count('pk', filter=Q(created_at__gte=cutoff)),
+        aged=Max('created_at', filter=Q(created_at__lt=cutoff)),
+        comments_total=Max(_count(comments)),
+        comments_last=Max(_max_updated(comments)),
+        tags_last=Max(_max_updated(tags)),
+    )
+    aged_out = state['aged'] + timedelta(days=RECENT_DAYS) if state['aged'] else None
+    values = tuple(state[key] for key in sorted(state))
+    return values, _latest(state['last'], state['comments_last'], state['tags_last'], aged_out)
+
+
+def article_state(articles: QuerySet, pk: Any) -> Optional[ConditionalState]:
+    """Validators for a single article with its approved comments and tags"""
+    comments = Comment.objects.filter(article=pk, is_approved=True)
+    tags = Tag.objects.filter(articles=pk)
+    row = (
+        articles.filter(pk=pk).order_by()
+        .annotate(
+            comments_total=_count(comments),
+            comments_last=_max_updated(comments),
+            tags_last=_max_updated(tags),
+        )
+        .values('updated_at', 'created_at', 'comments_total', 'comments_last', 'tags_last')
+        .first()
+    )
+    if row is None:
+        return None
+    recent = (timezone.now() - row['created_at']).days < RECENT_DAYS
+    values = tuple(row[key] for key in sorted(row)) + (recent,)
+    return values, _latest(row['updated_at'], row['comments_last'], row['tags_last'])
+
+
+def ranked_state(articles: QuerySet, ranking: Tuple[Any, ...]) -> ConditionalState:
+    """Validators for a ranked list: the ranking plus the articles it renders"""
+    values, last_modified = article_set_state(articles)
+    return values + tuple(ranking), last_modified
+
+
+def related_state(articles: QuerySet, pk: Any) -> ConditionalState:
+    """Validators for an article's related list"""
+    return ranked_state(articles, RelatedArticle.objects.filter(article_id=pk).values_list('related_id', 'score'))
+
+
+def archive_state() -> ConditionalState:
+    """Validators for the archive summary: the month counts themselves"""
+    return tuple(ArchiveMonth.objects.filter(count__gt=0).values_list('year', 'month', 'count')), None
+
+
+def collection_state(queryset: QuerySet) -> ConditionalState:
+    """Validators for a flat collection such as tags or comments"""
+    state = queryset.order_by().aggregate(count=Count('pk'), last=Max('updated_at'))
+    return (state['count'], state['last']), state['last']
+
+
+def make_etag(request: Request, values: Tuple[Any, ...]) -> str:
+    """Strong ETag over the request's path and query plus the aggregate state"""
+    params = sorted((key, sorted(vals)) for key, vals in request.query_params.lists())
+    digest = hashlib.sha1(f'{request.path}|{params}|{values!r}'.encode()).hexdigest()
+    return f'"{digest}"'
+
+
+class ConditionalGetMixin:
+    """
+    Answer ``list``/``retrieve`` with 304 when the client's copy is current.
+
+    Views provide ``get_conditional_state`` (returning ``None`` to opt out);
+    custom actions can wrap their body in ``conditional_response``.
+    """
+
+    def get_conditional_state(self) -> Optional[ConditionalState]:
+        raise NotImplementedError
+
+    def conditional_response(self, request: Request, build: Callable[[], Response]) -> Response:
+        config = conditional_config()
+        if not config['ENABLED'] or request.method not in ('GET', 'HEAD'):
+            return build()
+        state = self.get_conditional_state()
+        if state is None:
+            return build()
+
+        values, last_modified = state
+        etag = make_etag(request, values)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build()
+            if response.status_code != 200:
+                return response
+        # A 304 carries the same validators as the 200 it stands in for
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        patch_cache_control(response, **config['CACHE_CONTROL'])
+        return response
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return self.conditional_response(request, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return self.conditional_response(request, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs))
@@ -0,0 +1,188 @@
+"""
+Fast-path read serializers built on ``values()`` rows.
+
+Rendering a list page through ``ModelSerializer`` builds a model instance
+per row and walks DRF's field machinery per field per row, which dominates
+the cost of large pages. The serializers here render the same JSON as
+their counterparts in ``blog.serializers`` (same keys, same order, same
+value formatting) straight from ``values()`` dicts, with article tags
+fetched in one query per page. They are read-only and honour the sparse
+fieldsets of the serializer they mirror.
+
+Views switch between the two paths with ``BLOG_FAST_SERIALIZERS['ENABLED']``.
+"""
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from .models import RECENT_DAYS, Article
+from .serializers import ArticleListSerializer, CommentSerializer, SparseFieldsetMixin, TagSerializer
+
+DEFAULTS = {'ENABLED': True}
+
+Converter = Callable[[Any], Any]
+
+# The same formatting as every DateTimeField in the API
+_datetime_field = serializers.DateTimeField()
+
+
+def fast_serializers_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_FAST_SERIALIZERS', {})}
+
+
+def fast_serializers_enabled() -> bool:
+    return bool(fast_serializers_config()['ENABLED'])
+
+
+def _datetime(value: Any) -> Any:
+    return _datetime_field.to_representation(value)
+
+
+class FastSerializer:
+    """
+    Read-only ``values()`` counterpart of a ``SparseFieldsetMixin`` serializer.
+
+    ``converters`` maps each field to the function DRF's field would apply
+    to the stored value; ``sources`` names the ``values()`` key a field
+    reads when it differs from the field name. ``None`` is passed through
+    untouched, as DRF does.
+    """
+    serializer_class: Type[SparseFieldsetMixin]
+    converters: Dict[str, Converter] = {}
+    sources: Dict[str, str] = {}
+
+    def __init__(self, instance: Iterable[Dict[str, Any]], many: bool = True, context: Optional[Dict[str, Any]] = None) -> None:
+        assert many, 'Fast serializers only render lists'
+        self.instance = instance
+        self.context = context or {}
+
+    @classmethod
+    def values_queryset(cls, queryset: QuerySet, request: Optional[Request], always: Iterable[str] = ()) -> QuerySet:
+        """``values()`` rows holding the columns the response needs"""
+        columns = cls.serializer_class.get_model_columns(cls.serializer_class.get_requested_fields(request))
+        return queryset.prefetch_related(None).values(*columns, *always)
+
+    def get_fields(self) -> List[str]:
+        return self.serializer_class.get_requested_fields(self.context.get('request'))
+
+    def get_converters(self, rows: List[Dict[str, Any]]) -> List[Tuple[str, str, Converter]]:
+        return [
+            (name, self.sources.get(name, name), self.converters[name])
+            for name in self.get_fields() if name in self.converters
+        ]
+
+    def to_representation(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        converters = self.get_converters(rows)
+        return [
+            {
+                name: None if row[source] is None else convert(row[source])
+                for name, source, convert in converters
+            }
+            for row in rows
+        ]
+
+    @property
+    def data(self) -> ReturnList:
+        return ReturnList(self.to_representation(list(self.instance)), serializer=self)
+
+
+class FastTagSerializer(FastSerializer):
+    serializer_class = TagSerializer
+    converters = {'id': int, 'name': str, 'created_at': _datetime}
+
+
+class FastCommentSerializer(FastSerializer):
+    serializer_class = CommentSerializer
+    converters = {
+        'id': int,
+        'article': lambda value: value,
+        'content': str,
+        'author_name': str,
+        'created_at': _datetime,
+        'is_approved': bool,
+    }
+
+
+class FastArticleListSerializer(FastSerializer):
+    """
+    ``ArticleListSerializer`` without search results.
+
+    ``is_recent`` is evaluated against one clock reading per page, and
+    tags come from a single query over the page's article ids.
+    """
+    serializer_class = ArticleListSerializer
+    converters = {
+        'id': int,
+        'title': str,
+        'excerpt': str,
+        'content': str,
+        'created_at': _datetime,
+        'updated_at': _datetime,
+        'is_published': bool,
+        'comments_count': int,
+    }
+    sources = {'comments_count': 'approved_comments_count', 'is_recent': 'created_at', 'tags': 'id'}
+
+    def get_converters(self, rows: List[Dict[str, Any]]) -> List[Tuple[str, str, Converter]]:
+        fields = self.get_fields()
+        extra: Dict[str, Converter] = {}
+        if 'tags' in fields:
+            tags = self.tags_by_article([row['id'] for row in rows])
+            extra['tags'] = lambda pk: tags.get(pk, [])
+        if 'is_recent' in fields:
+            now = timezone.now()
+            extra['is_recent'] = lambda created_at: (now - created_at).days < RECENT_DAYS
+        return [
+            (name, self.sources.get(name, name), self.converters.get(name) or extra[name])
+            for name in fields if name in self.converters or name in extra
+        ]
+
+    @staticmethod
+    def tags_by_article(article_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Rendered tags per article, in the ``Tag.Meta.ordering`` the prefetch uses"""
+        if not article_ids:
+            return {}
+        rows = (
+            Article.tags.through.objects.filter(article_id__in=article_ids)
+            .order_by('tag__name')
+            .values_list('article_id', 'tag_id', 'tag__name', 'tag__created_at')
+        )
+        tags: Dict[int, List[Dict[str, Any]]] = {}
+        rendered: Dict[int, Dict[str, Any]] = {}
+        for article_id, tag_id, name, created_at in rows:
+            if tag_id not in rendered:
+                rendered[tag_id] = {'id': tag_id, 'name': name, 'created_at': _datetime(created_at)}
+            tags.setdefault(article_id, []).append(rendered[tag_id])
+        return tags
+
+
+class FastListMixin:
+    """
+    Serve ``list`` through ``fast_serializer_class`` when fast serializers are enabled.
+
+    Views can veto the fast path per request with ``use_fast_serializer``.
+    """
+    fast_serializer_class: Optional[Type[FastSerializer]] = None
+    # Columns the pagination needs beyond the rendered fields
+    fast_values_always: Tuple[str, ...] = ()
+
+    def use_fast_serializer(self) -> bool:
+        return self.fast_serializer_class is not None and fast_serializers_enabled()
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        if not self.use_fast_serializer():
+            return super().list(request, *args, **kwargs)
+        fast = self.fast_serializer_class
+        rows = fast.values_queryset(self.filter_queryset(self.get_queryset()), request, self.fast_values_always)
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast(page, context=context).data)
+        return Response(fast(rows, context=context).data)
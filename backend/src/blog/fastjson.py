@@ -0,0 +1,77 @@
+"""
+orjson-backed JSON renderer and parser for the REST_FRAMEWORK config.
+
+Both are drop-in subclasses of DRF's ``JSONRenderer`` / ``JSONParser`` and
+produce the same bytes and the same parsed data: compact separators, UTF-8
+output with ``\\u2028``/``\\u2029`` escaped, and datetimes, ``Decimal``, lazy
+translation strings and other non-JSON types converted by DRF's own
+``JSONEncoder.default``. Anything orjson cannot handle alone (indented
+output, integers beyond 64 bits, non-UTF-8 request bodies, non-strict
+JSON settings) goes through the stdlib implementation. Without orjson
+installed both classes behave exactly like their parents.
+
+Floats keep their value but may use orjson's exponent spelling
+(``1e-7`` rather than ``1e-07``), and non-finite floats render as
+``null`` rather than raising.
+"""
+import codecs
+import io
+import re
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+if orjson is not None:
+    # Datetimes go through DRF's encoder so their text matches the stdlib path
+    DUMPS_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+# orjson reads integers past 64 bits as floats; bodies with a digit run that
+# long (even inside a string or a fraction) are reparsed by the stdlib
+LONG_DIGITS = re.compile(rb'\d{19}')
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` rendering with orjson when it is installed"""
+
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self._default, option=DUMPS_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Let the stdlib encoder handle (or report) what orjson refused
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` decoding UTF-8 bodies with orjson when it is installed"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if LONG_DIGITS.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,100 @@
+"""
+A lean middleware stack for ``/api/`` requests.
+
+``settings.MIDDLEWARE`` serves the admin: sessions, CSRF, authentication,
+messages and clickjacking protection. The SPA's JSON requests need none
+of the session machinery, so ``blog.middleware.ApiFastLaneMiddleware``
+hands every path under ``BLOG_API_FAST_LANE['PREFIX']`` to a second
+handler built from ``BLOG_API_FAST_LANE['MIDDLEWARE']`` instead (by
+default instrumentation, CORS, security, common, a read-only session user
+and the profiler). Everything else keeps the full stack.
+
+The lane has no ``SessionMiddleware``: ``ApiUserMiddleware`` resolves the
+session cookie's user only when something reads ``request.user``, and
+never writes the session. The API's viewsets authenticate lazily
+(``LazyAuthenticationMixin``), so public endpoints do not look the
+session up at all; staff-only endpoints still see the admin login. API
+views are exempt from ``CsrfViewMiddleware`` anyway: DRF's
+``SessionAuthentication`` runs its own CSRF check when a write
+authenticates with the session cookie, and still does in the lane.
+"""
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+
+DEFAULTS = {
+    'ENABLED': True,
+    'PREFIX': '/api/',
+    'MIDDLEWARE': [
+        'blog.middleware.InstrumentationMiddleware',
+        'corsheaders.middleware.CorsMiddleware',
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'blog.middleware.ApiUserMiddleware',
+        'blog.middleware.ProfilingMiddleware',
+    ],
+}
+
+
+def fast_lane_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_API_FAST_LANE', {})}
+
+
+class LaneHandler(BaseHandler):
+    """
+    A request handler with its own (synchronous) middleware list.
+
+    Mirrors ``BaseHandler.load_middleware``, which only reads
+    ``settings.MIDDLEWARE``. Its view, template-response and exception
+    hooks are separate from the main handler's.
+    """
+
+    def __init__(self, middleware: List[str]) -> None:
+        super().__init__()
+        self.middleware = list(middleware)
+        self.load_middleware()
+
+    def load_middleware(self, is_async: bool = False) -> None:
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+        handler = convert_exception_to_response(self._get_response)
+        for path in reversed(self.middleware):
+            try:
+                instance = import_string(path)(handler)
+            except MiddlewareNotUsed:
+                continue
+            if instance is None:
+                raise ImproperlyConfigured(f'Middleware factory {path} returned None.')
+            if hasattr(instance, 'process_view'):
+                self._view_middleware.insert(0, instance.process_view)
+            if hasattr(instance, 'process_template_response'):
+                self._template_response_middleware.append(instance.process_template_response)
+            if hasattr(instance, 'process_exception'):
+                self._exception_middleware.append(instance.process_exception)
+            handler = convert_exception_to_response(instance)
+        self._middleware_chain = handler
+
+    def dispatch(self, request):
+        """The lane's response; the main handler still finishes and logs the request"""
+        return self._middleware_chain(request)
+
+
+class LazyAuthenticationMixin:
+    """
+    Authenticate reads on first use of ``request.user`` / ``request.auth``
+    rather than before the action, as DRF's ``perform_authentication``
+    documents; public reads then never load a session. Writes still
+    authenticate up front, which is where ``SessionAuthentication``
+    enforces CSRF.
+    """
+
+    def perform_authentication(self, request: Request) -> None:
+        if request.method not in SAFE_METHODS:
+            super().perform_authentication(request)
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from blog.sync import compact_tombstones, sync_config
+
+
+class Command(BaseCommand):
+    help = 'Delete sync tombstones older than the retention period (run periodically, e.g. daily)'
+
+    def handle(self, *args, **options) -> None:
+        removed = compact_tombstones()
+        days = sync_config()['RETENTION_DAYS']
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} tombstones older than {days} days'))
@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.exporter import FORMATS, export_articles, export_comments
+from blog.models import Article, Comment
+
+
+class Command(BaseCommand):
+    help = 'Stream articles (or comments) as NDJSON or CSV to a file or standard output'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--output', choices=FORMATS, default='ndjson', help='Output format')
+        parser.add_argument('--file', '-f', help='Write to this file instead of standard output')
+        parser.add_argument('--comments', action='store_true', help='Export comments instead of articles')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Include unpublished articles and unapproved comments',
+        )
+        parser.add_argument('--chunk-size', type=int, help='Rows fetched per database round trip')
+
+    def handle(self, *args, **options) -> None:
+        if options['comments']:
+            queryset = Comment.objects.all() if options['all'] else Comment.objects.filter(is_approved=True)
+            lines = export_comments(queryset, options['output'], options['chunk_size'])
+        else:
+            queryset = Article.objects.all() if options['all'] else Article.objects.published()
+            lines = export_articles(queryset, options['output'], options['chunk_size'])
+
+        path = options['file']
+        try:
+            if path:
+                with open(path, 'w', encoding='utf-8', newline='') as stream:
+                    stream.writelines(lines)
+            else:
+                sys.stdout.writelines(lines)
+        except OSError as exc:
+            raise CommandError(f'Cannot write {path or "standard output"}: {exc}')
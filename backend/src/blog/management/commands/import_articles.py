@@ -0,0 +1,48 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.importer import FORMATS, import_articles
+
+
+class Command(BaseCommand):
+    help = 'Bulk import articles from an NDJSON or CSV file (use - for stdin)'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('path', help='File to import, or - to read standard input')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Input format (default: from the file extension, else ndjson)',
+        )
+        parser.add_argument('--batch-size', type=int, help='Rows per insert batch and transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Validate rows without writing')
+
+    def handle(self, *args, **options) -> None:
+        path = options['path']
+        fmt = options['format'] or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        started = time.perf_counter()
+        try:
+            if path == '-':
+                result = self._import(sys.stdin, fmt, options)
+            else:
+                with open(path, encoding='utf-8', newline='') as stream:
+                    result = self._import(stream, fmt, options)
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        elapsed = time.perf_counter() - started
+
+        for error in result.errors:
+            self.stderr.write(f'row {error["row"]}: {json.dumps(error["errors"])}')
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        rate = result.created / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result.created} articles in {elapsed:.2f}s ({rate:.0f}/s), '
+            f'{len(result.errors)} rows failed'
+        ))
+
+    @staticmethod
+    def _import(stream, fmt: str, options):
+        return import_articles(stream, fmt, batch_size=options['batch_size'], dry_run=options['dry_run'])
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.snapshot import publish_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Render the anonymous read endpoints to static JSON files for nginx'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--root', help="Output directory (default: BLOG_SNAPSHOT['ROOT'])")
+        parser.add_argument(
+            '--base-url', help="Scheme and host used for pagination links (default: BLOG_SNAPSHOT['BASE_URL'])"
+        )
+
+    def handle(self, *args, **options) -> None:
+        start = time.perf_counter()
+        writer = publish_snapshot(options['root'], options['base_url'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Published {writer.root}: {writer.written} files written, '
+            f'{writer.removed} removed in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import rebuild_archive
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-month published article counts of the date archive'
+
+    def handle(self, *args, **options) -> None:
+        months = rebuild_archive()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the archive: {months} months'))
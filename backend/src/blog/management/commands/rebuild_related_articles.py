@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.related import rebuild_related, related_config
+
+
+class Command(BaseCommand):
+    help = 'Recompute the related-articles rankings of every published article'
+
+    def add_arguments(self, parser) -> None:
+        config = related_config()
+        parser.add_argument('--limit', type=int, default=config['LIMIT'], help='Related articles kept per article')
+        parser.add_argument(
+            '--max-postings', type=int, default=config['MAX_POSTINGS'],
+            help='Tags used by more articles only contribute their nearest articles as candidates',
+        )
+
+    def handle(self, *args, **options) -> None:
+        start = time.perf_counter()
+        rows = rebuild_related(limit=options['limit'], max_postings=options['max_postings'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f'Stored {rows} related-article rows in {elapsed:.1f}s'))
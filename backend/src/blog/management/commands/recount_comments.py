@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized approved comment counters on articles'
+
+    def handle(self, *args, **options) -> None:
+        fixed = Article.objects.recount_comments()
+        self.stdout.write(self.style.SUCCESS(f'Repaired approved comment counts on {fixed} articles'))
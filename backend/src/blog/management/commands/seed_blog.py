@@ -0,0 +1,53 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Article
+from blog.seed import seed_blog
+
+
+class Command(BaseCommand):
+    help = 'Bulk insert a reproducible synthetic dataset (Zipf-distributed tags, long-tailed comments)'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--articles', type=int, default=1000)
+        parser.add_argument('--tags', type=int, default=200)
+        parser.add_argument('--comments', type=float, default=5.0, help='Mean comments per article')
+        parser.add_argument('--tags-per-article', type=int, default=3, help='Mean tags per article')
+        parser.add_argument('--zipf', type=float, default=1.1, help='Exponent of the tag popularity distribution')
+        parser.add_argument('--published', type=float, default=0.9, help='Fraction of articles published')
+        parser.add_argument('--approved', type=float, default=0.9, help='Fraction of comments approved')
+        parser.add_argument('--words', type=int, default=300, help='Median article length in words')
+        parser.add_argument('--days', type=int, default=3 * 365, help='Spread articles over this many days')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same rows')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--skip-rebuild', action='store_true', help='Leave counters and derived tables stale')
+        parser.add_argument('--append', action='store_true', help='Add to a database that already has articles')
+        parser.add_argument('--json', action='store_true', help='Print the counts as JSON')
+
+    def handle(self, *args, **options) -> None:
+        if Article.objects.exists() and not options['append']:
+            raise CommandError('The database already has articles; pass --append to add to them')
+        result = seed_blog(
+            articles=options['articles'],
+            tags=options['tags'],
+            comments=options['comments'],
+            tags_per_article=options['tags_per_article'],
+            zipf=options['zipf'],
+            published=options['published'],
+            approved=options['approved'],
+            words=options['words'],
+            days=options['days'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            rebuild=not options['skip_rebuild'],
+            progress=None if options['json'] else lambda message: self.stdout.write(message),
+        )
+        if options['json']:
+            self.stdout.write(json.dumps(result.as_dict()))
+            return
+        elapsed = sum(result.seconds.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {result.articles} articles, {result.tags} tags, {result.article_tags} article tags '
+            f'and {result.comments} comments in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,238 @@
+"""
+In-process request metrics in the Prometheus text format.
+
+``blog.middleware.InstrumentationMiddleware`` times each request and
+records, per resolved route (the URL name, e.g. ``article-detail``) and
+method:
+
+- wall time, and the part of it spent in SQL, in the view outside SQL
+  (serializers, pagination; ``serialize``) and rendering the response;
+- the number of queries and the response size.
+
+They are kept as counters and fixed-bucket histograms, never as averages
+or quantiles, so the figures of several processes merge by adding them up.
+Each gunicorn worker only counts the requests it served; with
+``BLOG_METRICS['DIRECTORY']`` set, every worker writes its totals to
+``<DIRECTORY>/<pid>.json`` at most every ``FLUSH_INTERVAL`` seconds and
+``/api/metrics/`` answers with the sum of all files. Files of exited
+workers stay, so counters never go backwards; empty the directory when
+the server restarts (Prometheus treats a drop to zero as a reset).
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SERVER_TIMING': True,
+    # Shared by every worker; None keeps each worker's metrics to itself
+    'DIRECTORY': None,
+    'FLUSH_INTERVAL': 10,
+    # Bearer token /api/metrics/ requires; None leaves it open
+    'TOKEN': None,
+}
+
+SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERIES = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# name: (type, help, buckets)
+METRICS: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    'blog_http_requests_total': ('counter', 'Requests served.', ()),
+    'blog_http_request_duration_seconds': ('histogram', 'Wall time of a request.', SECONDS),
+    'blog_db_duration_seconds': ('histogram', 'Time a request spent in SQL.', SECONDS),
+    'blog_db_queries': ('histogram', 'Queries a request ran.', QUERIES),
+    'blog_serialize_duration_seconds': (
+        'histogram', 'Time a request spent in the view outside SQL (serializers, pagination).', SECONDS,
+    ),
+    'blog_render_duration_seconds': ('histogram', 'Time a request spent rendering its response.', SECONDS),
+    'blog_http_response_size_bytes': ('histogram', 'Response body size; streaming responses excluded.', BYTES),
+}
+
+# (metric name, sorted (label, value) pairs)
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def metrics_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_METRICS', {})}
+
+
+class Series:
+    """One counter or histogram: per-bucket counts (not cumulative), sum and count"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # The last slot counts observations above every bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        if self.buckets:
+            self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts: List[int], total: float, count: int) -> None:
+        if len(counts) == len(self.counts):
+            self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += count
+
+
+class Registry:
+    """Thread-safe series of one process"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: Dict[SeriesKey, Series] = {}
+        self._flushed_at = 0.0
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = Series(METRICS[name][2])
+            series.observe(value)
+
+    def inc(self, name: str, **labels: str) -> None:
+        self.observe(name, 1, **labels)
+
+    def record(self, route: str, method: str, status: int, timings: Dict[str, float], queries: int,
+               size: Optional[int]) -> None:
+        """One served request"""
+        labels = {'route': route, 'method': method}
+        self.inc('blog_http_requests_total', status=str(status), **labels)
+        self.observe('blog_http_request_duration_seconds', timings['total'], **labels)
+        self.observe('blog_db_duration_seconds', timings['db'], **labels)
+        self.observe('blog_db_queries', queries, **labels)
+        self.observe('blog_serialize_duration_seconds', timings['serialize'], **labels)
+        self.observe('blog_render_duration_seconds', timings['render'], **labels)
+        if size is not None:
+            self.observe('blog_http_response_size_bytes', size, **labels)
+        self.maybe_flush()
+
+    def state(self) -> List[Dict[str, Any]]:
+        """JSON-serializable copy of every series"""
+        with self._lock:
+            return [
+                {'name': name, 'labels': dict(labels), 'counts': list(series.counts), 'sum': series.sum,
+                 'count': series.count}
+                for (name, labels), series in self._series.items()
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._flushed_at = 0.0
+
+    def maybe_flush(self) -> None:
+        config = metrics_config()
+        if not config['DIRECTORY']:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._flushed_at < config['FLUSH_INTERVAL']:
+                return
+            self._flushed_at = now
+        self.flush()
+
+    def flush(self) -> None:
+        """Write this process's totals to the shared directory"""
+        directory = metrics_config()['DIRECTORY']
+        if directory:
+            write_state(Path(directory) / f'{os.getpid()}.json', self.state())
+
+
+def write_state(target: Path, state: List[Dict[str, Any]]) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=target.parent, prefix=f'.{target.name}.')
+    try:
+        with os.fdopen(fd, 'w') as handle:
+            json.dump(state, handle, separators=(',', ':'))
+        os.replace(temporary, target)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def read_states(directory: Path) -> Iterable[List[Dict[str, Any]]]:
+    for path in sorted(directory.glob('*.json')):
+        try:
+            yield json.loads(path.read_text())
+        except (OSError, ValueError):
+            # A worker's file mid-replace, or left corrupt by a crash
+            continue
+
+
+def merge(states: Iterable[List[Dict[str, Any]]]) -> Dict[SeriesKey, Series]:
+    merged: Dict[SeriesKey, Series] = {}
+    for state in states:
+        for entry in state:
+            if entry['name'] not in METRICS:
+                continue
+            key = (entry['name'], tuple(sorted(entry['labels'].items())))
+            series = merged.get(key)
+            if series is None:
+                series = merged[key] = Series(METRICS[entry['name']][2])
+            series.merge(entry['counts'], entry['sum'], entry['count'])
+    return merged
+
+
+def collect() -> Dict[SeriesKey, Series]:
+    """Every worker's series when a directory is shared, otherwise this process's"""
+    directory = metrics_config()['DIRECTORY']
+    if not directory:
+        return merge([registry.state()])
+    registry.flush()
+    return merge(read_states(Path(directory)))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render(series: Dict[SeriesKey, Series]) -> str:
+    """The Prometheus text exposition format (0.0.4)"""
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        keys = sorted(key for key in series if key[0] == name)
+        if not keys:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for key in keys:
+            entry, labels = series[key], key[1]
+            if kind == 'counter':
+                lines.append(f'{name}{_labels(labels)} {entry.count}')
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets, float('inf')), entry.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels((*labels, ("le", _number(bound))))} {cumulative}')
+            lines.append(f'{name}_sum{_labels(labels)} {_number(entry.sum)}')
+            lines.append(f'{name}_count{_labels(labels)} {entry.count}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
@@ -0,0 +1,199 @@
+"""
+Request instrumentation: a ``Server-Timing`` header and ``blog.metrics``
+series for every request, opt-in profiles (``blog.profiling``), and the
+``/api/`` fast lane (``blog.fastlane``).
+
+Every query runs through a ``connection.execute_wrapper`` that adds up
+its count and duration. The view's run ends at ``process_template_response``,
+the hook Django calls between a DRF view returning its ``Response`` and
+rendering it, which splits the request into:
+
+- ``db``: time in SQL, wherever it ran;
+- ``serialize``: the rest of the view, mostly serializers and pagination;
+- ``render``: rendering the response and the response middleware inside this one;
+- ``total``: wall time from this middleware on.
+
+Responses that are not rendered lazily count all their view time as
+``serialize``. A streaming response's body is produced after the
+middleware returns, so only its setup is timed and its size is not recorded.
+"""
+import logging
+import time
+from contextlib import ExitStack
+from importlib import import_module
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.functional import SimpleLazyObject
+
+from .fastlane import LaneHandler, fast_lane_config
+from .metrics import metrics_config, registry
+from .profiling import Capture, profiling_config, store, wants_profile
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTiming:
+    """Clock readings and SQL totals for one request"""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.view_started: Optional[float] = None
+        self.view_finished: Optional[float] = None
+        self.queries = 0
+        self.db = 0.0
+        # SQL time up to the end of the view
+        self.view_db = 0.0
+
+    def query(self, execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def finish_view(self) -> None:
+        if self.view_finished is None:
+            self.view_finished = time.perf_counter()
+            self.view_db = self.db
+
+    def phases(self) -> dict:
+        """Seconds per phase, measured up to now"""
+        finished = time.perf_counter()
+        view_started = self.view_started or self.started
+        view_finished = self.view_finished or finished
+        view_db = self.view_db if self.view_finished else self.db
+        return {
+            'db': self.db,
+            'serialize': max(0.0, view_finished - view_started - view_db),
+            'render': max(0.0, finished - view_finished - (self.db - view_db)),
+            'total': finished - self.started,
+        }
+
+
+def server_timing(phases: dict, queries: int) -> str:
+    return ', '.join(
+        f'{name};dur={phases[name] * 1000:.2f}' + (f';desc="{queries} queries"' if name == 'db' else '')
+        for name in ('db', 'serialize', 'render', 'total')
+    )
+
+
+class InstrumentationMiddleware:
+    """Times each request by phase; see ``blog.metrics`` for the exported series"""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        config = metrics_config()
+        if not config['ENABLED']:
+            return self.get_response(request)
+        timing = request.blog_timing = RequestTiming()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing.query))
+            response = self.get_response(request)
+        phases = timing.phases()
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else 'unresolved'
+        size = None if response.streaming else len(response.content)
+        registry.record(route, request.method, response.status_code, phases, timing.queries, size)
+        if config['SERVER_TIMING'] and not response.has_header('Server-Timing'):
+            response['Server-Timing'] = server_timing(phases, timing.queries)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs) -> None:
+        timing = getattr(request, 'blog_timing', None)
+        if timing is not None:
+            timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request: HttpRequest, response: HttpResponseBase) -> HttpResponseBase:
+        timing = getattr(request, 'blog_timing', None)
+        if timing is not None:
+            timing.finish_view()
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Runs the requests ``blog.profiling.wants_profile`` picks under a profiler.
+
+    Comes after ``AuthenticationMiddleware``, which staff requests need.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        if not profiling_config()['ENABLED']:
+            # Left out of the stack entirely
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        profile, reason = wants_profile(request)
+        if not profile:
+            return self.get_response(request)
+        capture = Capture()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(capture.query_log))
+            with capture:
+                response = self.get_response(request)
+        try:
+            capture_id = store(capture, {
+                'method': request.method,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                'reason': reason,
+                'user': getattr(getattr(request, 'user', None), 'username', '') or None,
+                'captured_at': time.time(),
+            })
+        except OSError as e:
+            # The response is fine; losing its profile is not worth failing it
+            logger.error(f"Error storing profile of {request.path}: {str(e)}")
+            return response
+        response['X-Blog-Profile-Id'] = capture_id
+        return response
+
+
+class ApiFastLaneMiddleware:
+    """
+    Sends requests under the API prefix through the lean ``blog.fastlane``
+    stack; must come first in ``MIDDLEWARE``, as nothing after it runs for them.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        config = fast_lane_config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = config['PREFIX']
+        self.lane = LaneHandler(config['MIDDLEWARE'])
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if request.path_info.startswith(self.prefix):
+            return self.lane.dispatch(request)
+        return self.get_response(request)
+
+
+class ApiUserMiddleware:
+    """
+    ``request.user`` from the session cookie, loaded on first access.
+
+    Stands in for the session and authentication middleware in the fast
+    lane: the session is only ever read, so nothing is saved and no
+    cookie or ``Vary`` header is added to API responses.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+        self.session_store = import_module(settings.SESSION_ENGINE).SessionStore
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        request.session = self.session_store(request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+        request.user = SimpleLazyObject(lambda: get_user(request))
+        return self.get_response(request)
@@ -0,0 +1,63 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_article_fts "
+    "USING fts5(title, content, tokenize='porter unicode61')",
+    "INSERT INTO blog_article_fts (rowid, title, content) "
+    "SELECT id, title, content FROM blog_article",
+]
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS blog_article_fts",
+]
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE blog_article ADD COLUMN search_document tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX blog_article_search_gin ON blog_article USING GIN (search_document)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS blog_article_search_gin",
+    "ALTER TABLE blog_article DROP COLUMN IF EXISTS search_document",
+]
+
+
+def _run(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD})
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_alter_article_options_alter_comment_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleSearchDocument',
+            fields=[
+                ('article', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='fts_document', serialize=False, to='blog.article')),
+                ('title', models.TextField()),
+                ('content', models.TextField()),
+                ('document', models.TextField(db_column='blog_article_fts')),
+            ],
+            options={
+                'db_table': 'blog_article_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
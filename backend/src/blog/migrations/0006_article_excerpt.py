@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+
+EXCERPT_LENGTH = 280
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' .,;:') + '…'
+
+
+def populate_excerpts(apps, schema_editor):
+    Article = apps.get_model('blog', 'Article')
+    batch = []
+    for article in Article.objects.only('id', 'content').iterator(chunk_size=1000):
+        article.excerpt = make_excerpt(article.content)
+        batch.append(article)
+        if len(batch) >= 1000:
+            Article.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    if batch:
+        Article.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_article_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, help_text='Plain-text preview derived from the content on save', max_length=280),
+        ),
+        migrations.RunPython(populate_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def populate_counts(apps, schema_editor):
+    Article = apps.get_model('blog', 'Article')
+    Comment = apps.get_model('blog', 'Comment')
+    approved = (
+        Comment.objects.filter(article=models.OuterRef('pk'), is_approved=True)
+        .order_by()
+        .values('article')
+        .annotate(count=models.Count('pk'))
+        .values('count')
+    )
+    Article.objects.update(approved_comments_count=Coalesce(models.Subquery(approved), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_tag_comment_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='approved_comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of approved comments, maintained by comment writes'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-approved_comments_count', '-created_at'], name='blog_articl_approve_5f8047_idx'),
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_article_approved_comments_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='Weighted Jaccard similarity of the two tag sets')),
+                ('article', models.ForeignKey(db_index=False, help_text='Article the ranking belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='related_articles', to='blog.article')),
+                ('related', models.ForeignKey(help_text='Article recommended alongside it', on_delete=django.db.models.deletion.CASCADE, related_name='related_from', to='blog.article')),
+            ],
+            options={
+                'ordering': ['article', '-score'],
+                'constraints': [models.UniqueConstraint(fields=('article', 'related'), name='blog_related_article_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_relatedarticle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleViewCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.PositiveIntegerField(help_text='Hours since the Unix epoch')),
+                ('views', models.PositiveIntegerField(default=0, help_text='Detail reads within the hour')),
+                ('article', models.ForeignKey(db_index=False, help_text='Article that was viewed', on_delete=django.db.models.deletion.CASCADE, related_name='view_counts', to='blog.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour', 'article', 'views'], name='blog_articl_hour_dd2559_idx')],
+                'constraints': [models.UniqueConstraint(fields=('article', 'hour'), name='blog_article_view_count_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+
+
+def populate_archive(apps, schema_editor):
+    Article = apps.get_model('blog', 'Article')
+    ArchiveMonth = apps.get_model('blog', 'ArchiveMonth')
+    rows = (
+        Article.objects.filter(is_published=True).order_by()
+        .annotate(month=TruncMonth('created_at'))
+        .values('month').annotate(count=models.Count('pk'))
+        .values_list('month', 'count')
+    )
+    ArchiveMonth.objects.bulk_create(
+        ArchiveMonth(year=month.year, month=month.month, count=count) for month, count in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_articleviewcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0, help_text='Published articles created in the month')),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+                'constraints': [models.UniqueConstraint(fields=('year', 'month'), name='blog_archive_month_unique')],
+            },
+        ),
+        migrations.RunPython(populate_archive, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_tombstone_updated_at_indexes'),
+    ]
+
+    # The new indexes are built before the ones they replace are dropped
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['created_at', 'id', 'updated_at', 'is_published'], name='blog_article_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-approved_comments_count', '-created_at'], name='blog_article_discussed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['title'], name='blog_article_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['article', 'created_at', 'id', 'updated_at', 'is_approved'], name='blog_comment_approved_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='article',
+            name='blog_articl_created_311958_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='article',
+            name='blog_articl_is_publ_0f077c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='article',
+            name='blog_articl_title_525ebf_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='article',
+            name='blog_articl_approve_5f8047_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='blog_commen_article_6af9d2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='blog_commen_is_appr_be38d5_idx',
+        ),
+    ]
@@ -1,7 +1,71 @@
-from django.db import models
+from collections import Counter
+from datetime import datetime
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
+from django.db.models.functions import Coalesce, Greatest, TruncMonth
+from django.dispatch import Signal
 from django.utils import timezone
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+EXCERPT_LENGTH = 280
+RECENT_DAYS = 7
+
+# Sent with ``article_ids`` after their approved comment counters changed
+approved_comments_changed = Signal()
+
+# Sent with ``article_ids`` after QuerySet.update() changed their title or content
+article_text_changed = Signal()
+
+
+# (year, month) in the current time zone
+Month = Tuple[int, int]
+
+
+def archive_month(value: datetime) -> Month:
+    """The archive bucket of a creation time"""
+    value = timezone.localtime(value)
+    return value.year, value.month
+
+
+def month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    """``[start, end)`` of a calendar month; raises ValueError for an invalid month"""
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+def make_excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """Collapse whitespace and truncate at a word boundary"""
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' .,;:') + '…'
+
+
+class TagQuerySet(models.QuerySet):
+    """
+    Set-based helpers for resolving tags by name
+    """
+
+    def get_or_create_many(self, names: Iterable[str]) -> Tuple[List['Tag'], bool]:
+        """
+        Return tags for already-normalized ``names`` in order, creating missing ones.
+
+        Runs one lookup, plus one insert and one re-read when tags are
+        missing. The insert ignores conflicts, so a concurrent writer
+        creating the same name is harmless. ``bulk_create`` skips
+        ``Tag.save()``, so callers must pass names that passed validation.
+        """
+        names = list(dict.fromkeys(names))
+        tags = {tag.name: tag for tag in self.filter(name__in=names)}
+        missing = [name for name in names if name not in tags]
+        if missing:
+            self.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+            tags.update((tag.name, tag) for tag in self.filter(name__in=missing))
+        return [tags[name] for name in names], bool(missing)
 
 
 class Tag(models.Model):
@@ -14,11 +78,16 @@ class Tag(models.Model):
         help_text="Unique tag name"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TagQuerySet.as_manager()
 
     class Meta:
         ordering = ['name']
         indexes = [
             models.Index(fields=['name']),
+            # Delta sync scans changes in (updated_at, id) order
+            models.Index(fields=['updated_at', 'id']),
         ]
 
     def clean(self) -> None:
@@ -39,6 +108,103 @@ class Tag(models.Model):
         return self.name
 
 
+class ArticleQuerySet(models.QuerySet):
+    """
+    Reusable query shapes for article read paths
+    """
+
+    def published(self) -> 'ArticleQuerySet':
+        """Restrict to published articles"""
+        return self.filter(is_published=True)
+
+    def recount_comments(self) -> int:
+        """
+        Recompute ``approved_comments_count`` from the comments table.
+
+        Only rows that drifted are written; returns how many there were.
+        """
+        # A correlated subquery avoids GROUP BY over every article column
+        approved = (
+            Comment.objects.filter(article=models.OuterRef('pk'), is_approved=True)
+            .order_by()
+            .values('article')
+            .annotate(count=models.Count('pk'))
+            .values('count')
+        )
+        drifted = (
+            self.annotate(actual=Coalesce(models.Subquery(approved), 0))
+            .exclude(approved_comments_count=models.F('actual'))
+            .values('pk')
+        )
+        return Article.objects.filter(pk__in=list(drifted.values_list('pk', flat=True))).update(
+            approved_comments_count=Coalesce(models.Subquery(approved), 0)
+        )
+
+    def published_by_month(self) -> Counter:
+        """Number of published articles per archive month in this queryset"""
+        rows = (
+            self.filter(is_published=True).order_by()
+            .annotate(month=TruncMonth('created_at'))
+            .values('month').annotate(count=models.Count('pk'))
+            .values_list('month', 'count')
+        )
+        return Counter({(month.year, month.month): count for month, count in rows})
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            adjust_archive(Counter(archive_month(obj.created_at) for obj in objs if obj.is_published))
+        return objs
+
+    def update(self, **kwargs) -> int:
+        if 'is_published' in kwargs:
+            # Delta sync finds visibility changes by updated_at, which update() skips
+            kwargs.setdefault('updated_at', timezone.now())
+        archived = {'is_published', 'created_at'} & set(kwargs)
+        text = {'title', 'content'} & set(kwargs)
+        if not archived and not text:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            before = self.published_by_month() if archived else Counter()
+            rows = super().update(**kwargs)
+            updated = Article.objects.filter(pk__in=pks)
+            if archived:
+                after = updated.published_by_month()
+                adjust_archive({month: after[month] - before[month] for month in {*before, *after}})
+            if 'content' in text:
+                # The new content may be an expression, so excerpts are cut from the stored rows
+                articles = list(updated.only('pk', 'content'))
+                for article in articles:
+                    article.excerpt = make_excerpt(article.content)
+                Article.objects.bulk_update(articles, ['excerpt'])
+            if text:
+                article_text_changed.send(sender=Article, article_ids=pks)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            before = self.published_by_month()
+            result = super().delete()
+            adjust_archive({month: -count for month, count in before.items()})
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def with_approved_comments(self) -> 'ArticleQuerySet':
+        """Prefetch only approved comments into ``approved_comments``"""
+        return self.prefetch_related(
+            models.Prefetch(
+                'comments',
+                queryset=Comment.objects.filter(is_approved=True).order_by('created_at'),
+                to_attr='approved_comments',
+            )
+        )
+
+
 class Article(models.Model):
     """
     Model representing blog articles
@@ -48,6 +214,12 @@ class Article(models.Model):
         help_text="Article title"
     )
     content = models.TextField(help_text="Article content")
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        help_text="Plain-text preview derived from the content on save"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     tags = models.ManyToManyField(
@@ -60,13 +232,42 @@ class Article(models.Model):
         default=True,
         help_text="Whether the article is published"
     )
+    approved_comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of approved comments, maintained by comment writes"
+    )
+
+    # Maintained with F() updates by comment writes, never saved from a (possibly stale) instance
+    counter_fields = ('approved_comments_count',)
+
+    objects = ArticleQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
+        # Every read filters is_published=True, so the read indexes are
+        # partial: unpublished drafts stay out of them (see test_query_plans).
+        # SQLite only answers a query from a partial index alone when the
+        # index also holds the condition's column, hence the trailing flag
+        # on the indexes read without the table. The discussed and title
+        # orderings read whole rows anyway, so theirs go without it.
         indexes = [
-            models.Index(fields=['created_at']),
-            models.Index(fields=['is_published']),
-            models.Index(fields=['title']),
+            # The feed and its keyset cursor, archive months, and (with
+            # updated_at) the list validators without reading any rows
+            models.Index(
+                fields=['created_at', 'id', 'updated_at', 'is_published'],
+                condition=models.Q(is_published=True),
+                name='blog_article_published_idx',
+            ),
+            # "Most discussed" ordering
+            models.Index(
+                fields=['-approved_comments_count', '-created_at'],
+                condition=models.Q(is_published=True),
+                name='blog_article_discussed_idx',
+            ),
+            models.Index(fields=['title'], condition=models.Q(is_published=True), name='blog_article_title_idx'),
+            # Delta sync, which also reports drafts
+            models.Index(fields=['updated_at', 'id']),
         ]
 
     def clean(self) -> None:
@@ -86,9 +287,49 @@ class Article(models.Model):
             if len(self.content) < 10:
                 raise ValidationError({'content': 'Content must be at least 10 characters long.'})
 
+    @transaction.atomic
     def save(self, *args, **kwargs) -> None:
         self.full_clean()
+        self.excerpt = make_excerpt(self.content)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            update_fields = kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        archived = update_fields is None or {'is_published', 'created_at'} & set(update_fields)
+        previous = self._archived_state() if archived and not self._state.adding else None
+        # Read by post_save receivers, which cannot see the stored row any more
+        self._publication_changed = previous is not None and previous[1] != self.is_published
         super().save(*args, **kwargs)
+        if archived:
+            deltas = Counter()
+            if previous and previous[1]:
+                deltas[archive_month(previous[0])] -= 1
+            if self.is_published:
+                deltas[archive_month(self.created_at)] += 1
+            adjust_archive(deltas)
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        previous = self._archived_state()
+        result = super().delete(*args, **kwargs)
+        if previous and previous[1]:
+            adjust_archive({archive_month(previous[0]): -1})
+        return result
+
+    def _archived_state(self) -> Optional[Tuple[datetime, bool]]:
+        """(created_at, is_published) as stored, locking the row until the archive is adjusted"""
+        if self.pk is None:
+            return None
+        return (
+            Article.objects.select_for_update()
+            .filter(pk=self.pk)
+            .values_list('created_at', 'is_published')
+            .first()
+        )
 
     def __str__(self) -> str:
         return self.title
@@ -96,7 +337,206 @@ class Article(models.Model):
     @property
     def is_recent(self) -> bool:
         """Check if article was created within the last 7 days"""
-        return (timezone.now() - self.created_at).days < 7
+        return (timezone.now() - self.created_at).days < RECENT_DAYS
+
+
+class ArticleSearchDocument(models.Model):
+    """
+    Read-only view of the SQLite FTS5 search index (see ``blog.search``)
+    """
+    article = models.OneToOneField(
+        Article,
+        primary_key=True,
+        db_column='rowid',
+        related_name='fts_document',
+        on_delete=models.DO_NOTHING,
+    )
+    title = models.TextField()
+    content = models.TextField()
+    # FTS5 exposes a hidden column named after the table for MATCH queries
+    document = models.TextField(db_column='blog_article_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'blog_article_fts'
+
+
+class RelatedArticle(models.Model):
+    """
+    Precomputed "related articles" ranking (see ``blog.related``)
+
+    Holds the best scoring related articles of each published article by
+    IDF-weighted tag overlap.
+    """
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name='related_articles',
+        # The unique constraint's index already leads with this column
+        db_index=False,
+        help_text="Article the ranking belongs to",
+    )
+    related = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name='related_from',
+        help_text="Article recommended alongside it",
+    )
+    score = models.FloatField(help_text="Weighted Jaccard similarity of the two tag sets")
+
+    class Meta:
+        ordering = ['article', '-score']
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'related'], name='blog_related_article_unique'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.article_id} -> {self.related_id} ({self.score:.3f})'
+
+
+class ArticleViewCount(models.Model):
+    """
+    Views of an article within one clock hour (see ``blog.trending``)
+
+    Written only by batched upserts from the in-process view buffers.
+    """
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name='view_counts',
+        # The unique constraint's index already leads with this column
+        db_index=False,
+        help_text="Article that was viewed",
+    )
+    hour = models.PositiveIntegerField(help_text="Hours since the Unix epoch")
+    views = models.PositiveIntegerField(default=0, help_text="Detail reads within the hour")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'hour'], name='blog_article_view_count_unique'),
+        ]
+        indexes = [
+            # Trending windows scan recent hours and aggregate without the table
+            models.Index(fields=['hour', 'article', 'views']),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.article_id} @ {self.hour}: {self.views}'
+
+
+class ArchiveMonth(models.Model):
+    """
+    Number of published articles created in each calendar month
+
+    Maintained by article writes (see ``adjust_archive``) so the date
+    archive never aggregates the article table per request.
+    """
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0, help_text="Published articles created in the month")
+
+    class Meta:
+        ordering = ['-year', '-month']
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'month'], name='blog_archive_month_unique'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.year}-{self.month:02d}: {self.count}'
+
+
+def adjust_archive(deltas: Dict[Month, int]) -> None:
+    """Apply per-month changes to ``ArchiveMonth.count``: one insert for new months, one UPDATE"""
+    deltas = {month: delta for month, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        ArchiveMonth.objects.bulk_create(
+            [ArchiveMonth(year=year, month=month) for year, month in deltas], ignore_conflicts=True
+        )
+        months = models.Q()
+        for year, month in deltas:
+            months |= models.Q(year=year, month=month)
+        change = models.Case(
+            *(models.When(year=year, month=month, then=models.Value(delta)) for (year, month), delta in deltas.items()),
+            default=models.Value(0),
+        )
+        # A drifted count must not make article writes fail; rebuild_archive repairs it
+        ArchiveMonth.objects.filter(months).update(count=Greatest(models.F('count') + change, 0))
+
+
+def rebuild_archive() -> int:
+    """Recompute every archive month from the article table; returns the number of months"""
+    counts = Article.objects.published_by_month()
+    with transaction.atomic():
+        ArchiveMonth.objects.all().delete()
+        ArchiveMonth.objects.bulk_create(
+            ArchiveMonth(year=year, month=month, count=count) for (year, month), count in counts.items()
+        )
+    return len(counts)
+
+
+def adjust_approved_comments(deltas: Dict[int, int]) -> None:
+    """Apply per-article changes to ``approved_comments_count`` in one UPDATE"""
+    deltas = {article_id: delta for article_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    change = models.Case(
+        *(models.When(pk=article_id, then=models.Value(delta)) for article_id, delta in deltas.items()),
+        default=models.Value(0),
+    )
+    Article.objects.filter(pk__in=deltas).update(
+        approved_comments_count=models.F('approved_comments_count') + change
+    )
+    approved_comments_changed.send(sender=Article, article_ids=list(deltas))
+
+
+class CommentQuerySet(models.QuerySet):
+    """
+    Keeps ``Article.approved_comments_count`` in step with bulk writes
+    """
+
+    def approved_by_article(self) -> Counter:
+        """Number of approved comments per article id in this queryset"""
+        rows = (
+            self.filter(is_approved=True).order_by()
+            .values('article_id').annotate(count=models.Count('pk'))
+            .values_list('article_id', 'count')
+        )
+        return Counter(dict(rows))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # Rows skipped by ignore_conflicts are still counted; recount_comments repairs that
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            adjust_approved_comments(Counter(obj.article_id for obj in objs if obj.is_approved))
+        return objs
+
+    def update(self, **kwargs) -> int:
+        if 'is_approved' in kwargs:
+            # Delta sync finds visibility changes by updated_at, which update() skips
+            kwargs.setdefault('updated_at', timezone.now())
+        if not {'is_approved', 'article', 'article_id'} & set(kwargs):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            before = self.approved_by_article()
+            rows = super().update(**kwargs)
+            after = Comment.objects.filter(pk__in=pks).approved_by_article()
+            adjust_approved_comments({pk: after[pk] - before[pk] for pk in {*before, *after}})
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            before = self.approved_by_article()
+            result = super().delete()
+            adjust_approved_comments({pk: -count for pk, count in before.items()})
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
 
 
 class Comment(models.Model):
@@ -116,16 +556,25 @@ class Comment(models.Model):
         help_text="Name of the comment author"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_approved = models.BooleanField(
         default=True,
         help_text="Whether the comment is approved for display"
     )
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['article', 'created_at']),
-            models.Index(fields=['is_approved']),
+            # An article's approved comments in timeline order, and (with
+            # updated_at) their validators; everything else goes by article_id
+            models.Index(
+                fields=['article', 'created_at', 'id', 'updated_at', 'is_approved'],
+                condition=models.Q(is_approved=True),
+                name='blog_comment_approved_idx',
+            ),
+            models.Index(fields=['updated_at', 'id']),
         ]
 
     def clean(self) -> None:
@@ -143,9 +592,67 @@ class Comment(models.Model):
             if not self.author_name:
                 self.author_name = "Anonymous"
 
+    @transaction.atomic
     def save(self, *args, **kwargs) -> None:
         self.full_clean()
+        update_fields = kwargs.get('update_fields')
+        counted = update_fields is None or {'is_approved', 'article'} & set(update_fields)
+        previous = self._counted_state() if counted and not self._state.adding else None
         super().save(*args, **kwargs)
+        if counted:
+            deltas = Counter()
+            if previous and previous[1]:
+                deltas[previous[0]] -= 1
+            if self.is_approved:
+                deltas[self.article_id] += 1
+            adjust_approved_comments(deltas)
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        previous = self._counted_state()
+        result = super().delete(*args, **kwargs)
+        if previous and previous[1]:
+            adjust_approved_comments({previous[0]: -1})
+        return result
+
+    def _counted_state(self) -> Optional[Tuple[int, bool]]:
+        """(article_id, is_approved) as stored, locking the row until the counter is adjusted"""
+        if self.pk is None:
+            return None
+        return (
+            Comment.objects.select_for_update()
+            .filter(pk=self.pk)
+            .values_list('article_id', 'is_approved')
+            .first()
+        )
+
+    def __str__(self) -> str:
+        return f'Comment by {self.author_name} on {self.article.title}'
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted article, tag or comment for delta sync clients
+
+    Written by the API and admin deletes; rows older than the sync
+    retention period are compacted away (see ``blog.sync``).
+    """
+    ARTICLE = 'article'
+    TAG = 'tag'
+    COMMENT = 'comment'
+    KINDS = [(ARTICLE, 'Article'), (TAG, 'Tag'), (COMMENT, 'Comment')]
+
+    kind = models.CharField(max_length=7, choices=KINDS)
+    object_id = models.PositiveIntegerField()
+    # The article of a deleted comment, whose comment count changed with it
+    article_id = models.PositiveIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id']),
+        ]
 
     def __str__(self) -> str:
-        return f'Comment by {self.author_name} on {self.article.title}'
\ No newline at end of file
+        return f'{self.kind} {self.object_id} deleted at {self.deleted_at}'
@@ -0,0 +1,205 @@
+import base64
+import json
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on ``(created_at, id)``.
+
+    Each page is fetched with a range condition on the ordering columns, so
+    deep pages cost the same as the first one and rows inserted meanwhile
+    never shift or duplicate results. Views may override the key with a
+    ``cursor_ordering`` attribute; a queryset already ordered by that key
+    or its reverse is paged in that direction, and any other ordering
+    (``?ordering=title``, search relevance) is rejected with a 400 rather
+    than silently replaced. The total is only computed when the client
+    passes ``count=true``.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+    ordering: Tuple[str, ...] = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+    unsupported_ordering_message = (
+        'Cursor pagination pages by {ordering} or its reverse; '
+        'use page numbers for any other ordering, including search relevance'
+    )
+
+    @classmethod
+    def is_requested(cls, request: Request) -> bool:
+        """Whether the client opted into cursor pagination"""
+        params = request.query_params
+        return cls.cursor_query_param in params or params.get(cls.mode_query_param) == 'cursor'
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> List[Any]:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset, view)
+        self.page_size = self.get_page_size(request)
+        self.count = queryset.count() if self._wants_count(request) else None
+
+        position, reverse = self.decode_cursor(request, queryset)
+        ordering = self._reverse(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data: List[Any]) -> Response:
+        body = OrderedDict()
+        if self.count is not None:
+            body['count'] = self.count
+        body['next'] = self.get_next_link()
+        body['previous'] = self.get_previous_link()
+        body['results'] = data
+        return Response(body)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def get_ordering(self, queryset: QuerySet, view=None) -> Tuple[str, ...]:
+        """
+        The key to page by: the view's ``cursor_ordering``, reversed when the
+        filters ordered the queryset the other way round
+        """
+        ordering = tuple(getattr(view, 'cursor_ordering', self.ordering))
+        requested = tuple(queryset.query.order_by)
+        if not requested:
+            return ordering
+        for candidate in (ordering, self._reverse(ordering)):
+            if requested == candidate[:len(requested)]:
+                return candidate
+        raise ParseError(self.unsupported_ordering_message.format(ordering=','.join(ordering)))
+
+    def decode_cursor(self, request: Request, queryset: QuerySet) -> Tuple[Optional[Tuple[Any, ...]], bool]:
+        """Return the cursor position and direction, or ``(None, False)`` for the first page"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            values = payload['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = tuple(
+                queryset.model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            )
+            return position, bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance: Any, reverse: bool) -> str:
+        """Cursor positioned on ``instance``, a model instance or a ``values()`` row"""
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = {'p': values}
+        if reverse:
+            payload['r'] = 1
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode('ascii')
+
+    def _link(self, instance: Any, reverse: bool) -> str:
+        url = remove_query_param(self.base_url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(instance, reverse))
+
+    def _wants_count(self, request: Request) -> bool:
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    @staticmethod
+    def _reverse(ordering: Sequence[str]) -> Tuple[str, ...]:
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    @staticmethod
+    def _after(ordering: Sequence[str], position: Sequence[Any]) -> Q:
+        """Row-value comparison ``(a, b) > (x, y)`` expanded into ORM lookups"""
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': position[index]})
+            for previous_field, value in zip(ordering[:index], position[:index]):
+                step &= Q(**{previous_field.lstrip('-'): value})
+            condition |= step
+        return condition
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """
+    Standard pagination configuration.
+
+    Clients opt into keyset pagination with ``?pagination=cursor`` (and then
+    follow the returned ``cursor`` links).
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None):
+        self.cursor_paginator = None
+        if self.cursor_pagination_class.is_requested(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            self.cursor_paginator.page_size = self.page_size
+            self.cursor_paginator.max_page_size = self.max_page_size
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: List[Any]) -> Response:
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class CommentPagination(KeysetPagination):
+    """
+    Always-on keyset pagination for comment timelines, oldest first.
+
+    Popular articles carry tens of thousands of comments, so there is no
+    unpaginated mode and no OFFSET-based mode to fall back to.
+    """
+    page_size = 20
+    max_page_size = 100
+    ordering = ('created_at', 'id')
@@ -0,0 +1,30 @@
+"""
+Streaming parsers for the bulk import endpoint.
+
+Instead of materialising the body they hand the view a lazy iterator of
+``(row number, row)`` pairs read line by line from the request stream.
+"""
+from typing import Iterator
+
+from rest_framework.parsers import BaseParser
+
+from .importer import Row, read_rows
+
+
+class LineStreamParser(BaseParser):
+    format = None
+
+    def parse(self, stream, media_type=None, parser_context=None) -> Iterator[Row]:
+        return read_rows(stream if stream is not None else [], self.format)
+
+
+class NDJSONParser(LineStreamParser):
+    """Newline-delimited JSON, one article object per line"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class CSVParser(LineStreamParser):
+    """CSV with a header row"""
+    media_type = 'text/csv'
+    format = 'csv'
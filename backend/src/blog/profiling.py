@@ -0,0 +1,245 @@
+"""
+Opt-in profiles of single requests, kept in an on-disk ring buffer.
+
+With ``BLOG_PROFILING['ENABLED']``, ``blog.middleware.ProfilingMiddleware``
+profiles a request when:
+
+- it carries ``X-Blog-Profile: <TOKEN>`` (``TOKEN`` must be set), or
+- a staff user asks for it with ``?profile=1`` or ``X-Blog-Profile: 1``, or
+- it is picked at random with probability ``SAMPLE_RATE``.
+
+The rest of the middleware stack, the view and rendering run under the
+profiler: pyinstrument's sampling profiler when it is installed (and
+``PROFILER`` is ``auto`` or ``pyinstrument``), cProfile otherwise. The
+profile is written to ``DIRECTORY`` with a JSON record of the request and
+every SQL statement it ran; only the newest ``MAX_PROFILES`` captures are
+kept. Profiled responses carry the capture id in ``X-Blog-Profile-Id``.
+
+Staff users list and download captures at ``/api/profiles/``. Disabled,
+the middleware removes itself from the stack when the server starts.
+"""
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import random
+import secrets
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+try:
+    import pyinstrument
+except ImportError:  # optional dependency
+    pyinstrument = None
+
+DEFAULTS = {
+    'ENABLED': False,
+    # Fraction of requests profiled without being asked for
+    'SAMPLE_RATE': 0.0,
+    # Secret that profiles a request through the header without a staff login
+    'TOKEN': None,
+    'HEADER': 'X-Blog-Profile',
+    'QUERY_PARAM': 'profile',
+    # auto, cprofile or pyinstrument
+    'PROFILER': 'auto',
+    'DIRECTORY': None,
+    'MAX_PROFILES': 50,
+    # SQL statements kept per capture
+    'MAX_QUERIES': 500,
+}
+
+# Profile file suffix and media type per profiler
+FORMATS = {
+    'cprofile': ('prof', 'application/octet-stream'),
+    'pyinstrument': ('html', 'text/html'),
+}
+
+CAPTURE_ID_LENGTH = 26
+
+
+def profiling_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_PROFILING', {})}
+
+
+def profiles_directory() -> Path:
+    return Path(profiling_config()['DIRECTORY'] or Path(settings.BASE_DIR) / 'logs' / 'profiles')
+
+
+def profiler_name() -> str:
+    wanted = profiling_config()['PROFILER']
+    if wanted == 'pyinstrument' or (wanted == 'auto' and pyinstrument is not None):
+        if pyinstrument is not None:
+            return 'pyinstrument'
+    return 'cprofile'
+
+
+def wants_profile(request) -> Tuple[bool, str]:
+    """Whether to profile ``request``, and what asked for it"""
+    config = profiling_config()
+    flag = request.headers.get(config['HEADER'], '')
+    if flag and config['TOKEN'] and constant_time_compare(flag, config['TOKEN']):
+        return True, 'token'
+    asked = flag == '1' or request.GET.get(config['QUERY_PARAM']) == '1'
+    user = getattr(request, 'user', None)
+    if asked and user is not None and user.is_staff:
+        return True, 'staff'
+    if config['SAMPLE_RATE'] and random.random() < config['SAMPLE_RATE']:
+        return True, 'sample'
+    return False, ''
+
+
+class QueryLog:
+    """``connection.execute_wrapper`` recording each statement and its duration"""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.queries: List[Dict[str, Any]] = []
+        self.count = 0
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            if len(self.queries) < self.limit:
+                self.queries.append({
+                    'sql': sql,
+                    'many': many,
+                    'ms': round((time.perf_counter() - started) * 1000, 3),
+                })
+
+
+class Capture:
+    """One profiled request"""
+
+    def __init__(self) -> None:
+        self.profiler = profiler_name()
+        self.duration = 0.0
+        self.query_log = QueryLog(profiling_config()['MAX_QUERIES'])
+        if self.profiler == 'pyinstrument':
+            self._profiler = pyinstrument.Profiler(async_mode='disabled')
+        else:
+            self._profiler = cProfile.Profile()
+
+    def __enter__(self) -> 'Capture':
+        self.started = time.perf_counter()
+        if self.profiler == 'pyinstrument':
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.profiler == 'pyinstrument':
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+        self.duration = time.perf_counter() - self.started
+
+    def profile_bytes(self) -> bytes:
+        if self.profiler == 'pyinstrument':
+            return self._profiler.output_html().encode()
+        # The pstats dump format, for snakeviz or ``pstats.Stats(path)``
+        self._profiler.create_stats()
+        return marshal.dumps(self._profiler.stats)
+
+    def summary(self, limit: int = 25) -> str:
+        """The most expensive functions by cumulative time, for the JSON record"""
+        if self.profiler == 'pyinstrument':
+            return self._profiler.output_text(unicode=True, color=False)
+        stream = io.StringIO()
+        pstats.Stats(self._profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+
+def _write(target: Path, data: bytes) -> None:
+    fd, temporary = tempfile.mkstemp(dir=target.parent, prefix=f'.{target.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary, target)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def store(capture: Capture, record: Dict[str, Any]) -> str:
+    """Write a capture, drop the oldest beyond ``MAX_PROFILES`` and return its id"""
+    directory = profiles_directory()
+    directory.mkdir(parents=True, exist_ok=True)
+    # Sorts by capture time
+    capture_id = f'{time.time_ns():019d}-{secrets.token_hex(3)}'
+    suffix, _ = FORMATS[capture.profiler]
+    # The profile first: a listed record always has its file
+    _write(directory / f'{capture_id}.{suffix}', capture.profile_bytes())
+    record = {
+        'id': capture_id,
+        'profiler': capture.profiler,
+        'duration_ms': round(capture.duration * 1000, 3),
+        'query_count': capture.query_log.count,
+        **record,
+        'queries': capture.query_log.queries,
+        'summary': capture.summary(),
+    }
+    _write(directory / f'{capture_id}.json', json.dumps(record).encode())
+    prune(directory, profiling_config()['MAX_PROFILES'])
+    return capture_id
+
+
+def prune(directory: Path, keep: int) -> None:
+    records = sorted(directory.glob('*.json'))
+    for stale in records[:max(0, len(records) - keep)]:
+        for path in directory.glob(f'{stale.stem}.*'):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                # Pruned by another worker
+                pass
+
+
+def valid_id(capture_id: str) -> bool:
+    """Whether ``capture_id`` has the shape ``store`` gives ids, so it cannot name another file"""
+    head, _, tail = capture_id.partition('-')
+    return (
+        len(capture_id) == CAPTURE_ID_LENGTH and head.isdigit() and len(tail) == 6
+        and all(char in '0123456789abcdef' for char in tail)
+    )
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Every kept capture without its query log, newest first"""
+    profiles = []
+    for path in sorted(profiles_directory().glob('*.json'), reverse=True):
+        record = load_profile(path.stem)
+        if record is not None:
+            record.pop('queries', None)
+            record.pop('summary', None)
+            profiles.append(record)
+    return profiles
+
+
+def load_profile(capture_id: str) -> Optional[Dict[str, Any]]:
+    if not valid_id(capture_id):
+        return None
+    try:
+        return json.loads((profiles_directory() / f'{capture_id}.json').read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def profile_file(capture_id: str) -> Optional[Tuple[Path, str]]:
+    """Path and media type of a capture's profile"""
+    record = load_profile(capture_id)
+    if record is None:
+        return None
+    suffix, content_type = FORMATS[record['profiler']]
+    path = profiles_directory() / f'{capture_id}.{suffix}'
+    return (path, content_type) if path.exists() else None
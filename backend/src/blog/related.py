@@ -0,0 +1,247 @@
+"""
+Related articles ranked by IDF-weighted tag overlap.
+
+The similarity of two published articles is the weighted Jaccard index of
+their tag sets::
+
+    score(a, b) = sum(w(t) for t in A & B) / sum(w(t) for t in A | B)
+
+with ``w(t) = ln(1 + N / df(t))``, so sharing a rare tag counts for more
+than sharing a tag half the blog uses. The best ``LIMIT`` related articles
+of each article are stored in ``RelatedArticle`` and the API reads them
+back with a single indexed query.
+
+The rebuild works on the article/tag incidence held as an inverted index
+(tag -> sorted article ids). Candidates come from postings, rarest tag
+first: tags used by at most ``MAX_POSTINGS`` articles contribute all their
+articles, while common tags only top up the candidates with the articles
+nearest in id (published around the same time) until there are enough.
+Candidates are then scored exactly with frozenset intersections, so the
+cost is bounded per article instead of growing with the square of the
+most popular tag's size.
+
+Tag changes update the index incrementally: the changed articles get a
+fresh ranking and are inserted into (or removed from) their neighbours'
+rankings. A neighbour that loses an entry keeps a shorter list until the
+next ``rebuild_related_articles`` run, which also refreshes the weights
+after the tag vocabulary drifts.
+"""
+import heapq
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from .cache import RELATED, related_ns, response_cache
+from .models import Article, RelatedArticle
+
+DEFAULTS = {
+    'LIMIT': 10,
+    'MAX_POSTINGS': 50,
+    'INCREMENTAL': True,
+}
+
+# (article id, related article id, score)
+Row = Tuple[int, int, float]
+
+
+def related_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_RELATED', {})}
+
+
+def _published_pairs():
+    return Article.tags.through.objects.filter(article__is_published=True)
+
+
+class RelatedIndex:
+    """Inverted tag index over published articles with IDF tag weights"""
+
+    def __init__(
+        self,
+        pairs: Iterable[Tuple[int, int]],
+        total: Optional[int] = None,
+        document_frequency: Optional[Dict[int, int]] = None,
+        limit: Optional[int] = None,
+        max_postings: Optional[int] = None,
+    ) -> None:
+        config = related_config()
+        self.limit = limit or config['LIMIT']
+        self.max_postings = max_postings or config['MAX_POSTINGS']
+
+        tags: Dict[int, List[int]] = defaultdict(list)
+        self.postings: Dict[int, List[int]] = defaultdict(list)
+        for article_id, tag_id in pairs:
+            tags[article_id].append(tag_id)
+            self.postings[tag_id].append(article_id)
+        for posting in self.postings.values():
+            posting.sort()
+
+        self.frequency = document_frequency or {tag: len(posting) for tag, posting in self.postings.items()}
+        total = total or len(tags)
+        self.weights = {tag: math.log(1 + total / count) for tag, count in self.frequency.items()}
+        weight = self.weights.__getitem__
+        self.tag_sets = {article_id: frozenset(tag_ids) for article_id, tag_ids in tags.items()}
+        self.norms = {article_id: sum(map(weight, tag_ids)) for article_id, tag_ids in self.tag_sets.items()}
+
+    @classmethod
+    def load(cls, article_ids: Optional[Iterable[int]] = None, **kwargs) -> 'RelatedIndex':
+        """
+        Index every published article, or just the neighbourhood of ``article_ids``.
+
+        A neighbourhood holds every article ``candidates`` could pick for
+        them, with complete tag sets and blog-wide tag weights, which is all
+        scoring needs. Common tags contribute only the articles nearest in id,
+        so the neighbourhood stays small however popular the tags are.
+        """
+        pairs = _published_pairs()
+        if article_ids is None:
+            return cls(pairs.values_list('article_id', 'tag_id').iterator(chunk_size=10_000), **kwargs)
+
+        config = related_config()
+        limit = kwargs.get('limit') or config['LIMIT']
+        max_postings = kwargs.get('max_postings') or config['MAX_POSTINGS']
+        own = list(pairs.filter(article_id__in=list(article_ids)).values_list('article_id', 'tag_id'))
+        frequency = _frequency(pairs.filter(tag_id__in={tag_id for _, tag_id in own}))
+        rare = [tag_id for tag_id, count in frequency.items() if count <= max_postings]
+        neighbours = set(pairs.filter(tag_id__in=rare).values_list('article_id', flat=True))
+        # Enough on each side of the article for any window ``candidates`` takes
+        reach = limit + 2
+        for article_id, tag_id in own:
+            if tag_id in rare:
+                continue
+            posting = pairs.filter(tag_id=tag_id).values_list('article_id', flat=True)
+            neighbours.update(posting.filter(article_id__lt=article_id).order_by('-article_id')[:reach])
+            neighbours.update(posting.filter(article_id__gte=article_id).order_by('article_id')[:reach + 1])
+
+        rows = list(pairs.filter(article_id__in=neighbours).values_list('article_id', 'tag_id'))
+        frequency.update(_frequency(pairs.filter(tag_id__in={tag_id for _, tag_id in rows} - set(frequency))))
+        total = Article.objects.published().count()
+        return cls(rows, total=total, document_frequency=frequency, **kwargs)
+
+    def candidates(self, article_id: int) -> Set[int]:
+        tags = self.tag_sets.get(article_id, ())
+        wanted = 2 * self.limit
+        found: Set[int] = set()
+        for tag in sorted(tags, key=self.weights.__getitem__, reverse=True):
+            posting = self.postings[tag]
+            if self.frequency[tag] <= self.max_postings:
+                found.update(posting)
+            elif len(found) <= wanted:
+                half = (wanted - len(found)) // 2 + 1
+                position = bisect_left(posting, article_id)
+                found.update(posting[max(0, position - half):position + half + 1])
+        found.discard(article_id)
+        return found
+
+    def scores(self, article_id: int) -> Dict[int, float]:
+        """Exact similarity to every candidate of ``article_id``"""
+        tags = self.tag_sets.get(article_id)
+        if not tags:
+            return {}
+        weight = self.weights.__getitem__
+        norm = self.norms[article_id]
+        scores = {}
+        for other in self.candidates(article_id):
+            shared = sum(map(weight, tags & self.tag_sets[other]))
+            scores[other] = shared / (norm + self.norms[other] - shared)
+        return scores
+
+    def top(self, article_id: int) -> List[Tuple[int, float]]:
+        """``(related id, score)`` best first; ties favour newer articles"""
+        best = heapq.nlargest(
+            self.limit, ((score, other) for other, score in self.scores(article_id).items())
+        )
+        return [(other, score) for score, other in best]
+
+    def rows(self) -> Iterable[Row]:
+        for article_id in self.tag_sets:
+            for other, score in self.top(article_id):
+                yield article_id, other, score
+
+
+def _frequency(pairs) -> Dict[int, int]:
+    """Number of published articles per tag"""
+    counts = pairs.order_by().values('tag_id').annotate(count=Count('article_id'))
+    return dict(counts.values_list('tag_id', 'count'))
+
+
+def _insert(rows: List[Row], batch_size: int = 1000) -> None:
+    """Multi-row INSERTs with as many rows per statement as the database accepts"""
+    if not rows:
+        return
+    max_params = connection.features.max_query_params or 3 * batch_size
+    per_statement = max(1, min(batch_size, max_params // 3))
+    table = connection.ops.quote_name(RelatedArticle._meta.db_table)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), per_statement):
+            chunk = rows[start:start + per_statement]
+            cursor.execute(
+                f'INSERT INTO {table} (article_id, related_id, score) VALUES '
+                f'{", ".join(["(%s, %s, %s)"] * len(chunk))}',
+                [value for row in chunk for value in row],
+            )
+
+
+def rebuild_related(**kwargs) -> int:
+    """Recompute every ranking from scratch; returns the number of rows stored"""
+    rows = list(RelatedIndex.load(**kwargs).rows())
+    with transaction.atomic():
+        RelatedArticle.objects.all().delete()
+        _insert(rows)
+    response_cache.invalidate(RELATED)
+    return len(rows)
+
+
+@transaction.atomic
+def update_related(article_ids: Iterable[int]) -> Set[int]:
+    """
+    Re-rank ``article_ids`` and patch their neighbours' rankings.
+
+    Returns the ids of every article whose ranking changed.
+    """
+    article_ids = set(article_ids)
+    if not article_ids:
+        return set()
+    index = RelatedIndex.load(article_ids)
+
+    # Drop every stale entry of the changed articles, in both directions
+    stale = RelatedArticle.objects.filter(Q(article_id__in=article_ids) | Q(related_id__in=article_ids))
+    changed = set(stale.values_list('article_id', flat=True)) | article_ids
+    stale.delete()
+
+    rows: List[Row] = []
+    offers: Dict[int, List[Tuple[float, int]]] = defaultdict(list)
+    for article_id in article_ids:
+        rows.extend((article_id, other, score) for other, score in index.top(article_id))
+        # Similarity is symmetric, so the scores double as offers to the neighbours
+        for other, score in index.scores(article_id).items():
+            if other not in article_ids:
+                offers[other].append((score, article_id))
+
+    current: Dict[int, List[Tuple[float, int, int]]] = defaultdict(list)
+    for pk, article_id, other, score in RelatedArticle.objects.filter(article_id__in=offers).values_list(
+        'pk', 'article_id', 'related_id', 'score'
+    ):
+        current[article_id].append((score, other, pk))
+
+    evicted: List[int] = []
+    for article_id, offered in offers.items():
+        ranking = [(score, other, pk) for score, other, pk in current[article_id]]
+        ranking.extend((score, other, None) for score, other in offered)
+        kept = heapq.nlargest(index.limit, ranking)
+        new = [(article_id, other, score) for score, other, pk in kept if pk is None]
+        if new:
+            changed.add(article_id)
+            rows.extend(new)
+            kept_pks = {pk for _, _, pk in kept}
+            evicted.extend(pk for _, _, pk in current[article_id] if pk not in kept_pks)
+
+    if evicted:
+        RelatedArticle.objects.filter(pk__in=evicted).delete()
+    _insert(rows)
+    response_cache.invalidate(*(related_ns(pk) for pk in changed))
+    return changed
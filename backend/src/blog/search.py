@@ -0,0 +1,267 @@
+"""
+Full-text search backends for articles.
+
+The active backend is chosen from ``settings.BLOG_SEARCH_BACKEND`` (a dotted
+path) or, when unset, from the database vendor: SQLite uses an FTS5 virtual
+table and PostgreSQL a generated ``tsvector`` column with a GIN index.
+"""
+import re
+from html import escape
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Lookup, Q, QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework import filters
+from rest_framework.request import Request
+
+from .models import Article, ArticleSearchDocument
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+# Backends mark matches with private-use characters; ``render_snippet``
+# escapes the article text around them before adding the markup
+_MATCH_START = '\ue000'
+_MATCH_STOP = '\ue001'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class BaseSearchBackend:
+    """Interface shared by all article search backends"""
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Filter to matching articles annotated with ``search_rank`` (higher is better)"""
+        raise NotImplementedError
+
+    def highlight(self, article_ids: Iterable[int], query: str) -> Dict[int, str]:
+        """Return a snippet per article id, matches between ``_MATCH_START`` and ``_MATCH_STOP``"""
+        return {}
+
+    def index_article(self, article: Article) -> None:
+        """Add or refresh a single article in the index"""
+
+    def index_articles(self, articles: Iterable[Article]) -> None:
+        """Add or refresh many articles, e.g. after a bulk insert that sent no signals"""
+        for article in articles:
+            self.index_article(article)
+
+    def remove_article(self, article_id: int) -> None:
+        """Drop a single article from the index"""
+
+    def rebuild(self) -> int:
+        """Rebuild the whole index and return the number of indexed articles"""
+        return Article.objects.count()
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    """Unindexed fallback matching the previous ``SearchFilter`` behaviour"""
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        condition = Q()
+        for term in query.split():
+            condition &= Q(title__icontains=term) | Q(content__icontains=term)
+        return queryset.filter(condition).annotate(
+            search_rank=RawSQL('0', [], output_field=FloatField())
+        )
+
+
+class FTS5Match(Lookup):
+    """``document__match`` lookup compiling to an FTS5 ``MATCH``"""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+ArticleSearchDocument._meta.get_field('document').register_lookup(FTS5Match)
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """
+    Search backed by an FTS5 virtual table keyed on the article id.
+
+    Matching joins the index so SQLite drives the query from the FTS5
+    posting lists and only probes ``blog_article`` by primary key.
+    """
+
+    table = ArticleSearchDocument._meta.db_table
+    # bm25 column weights for (title, content)
+    title_weight = 10.0
+    content_weight = 1.0
+    snippet_tokens = 16
+
+    @staticmethod
+    def build_match(query: str) -> str:
+        """Turn free text into a safe FTS5 expression with prefix matching on the last term"""
+        tokens = _TOKEN_RE.findall(query)
+        if not tokens:
+            return ''
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += '*'
+        return ' '.join(terms)
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        match = self.build_match(query)
+        if not match:
+            return queryset.none()
+        # bm25() must reference the joined index table by name
+        rank = RawSQL(
+            f'-bm25({connection.ops.quote_name(self.table)}, %s, %s)',
+            [self.title_weight, self.content_weight],
+            output_field=FloatField(),
+        )
+        return queryset.filter(fts_document__document__match=match).annotate(search_rank=rank)
+
+    def highlight(self, article_ids: Iterable[int], query: str) -> Dict[int, str]:
+        match = self.build_match(query)
+        article_ids = list(article_ids)
+        if not match or not article_ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(article_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, snippet({self.table}, -1, %s, %s, %s, %s) FROM {self.table} '
+                f'WHERE {self.table} MATCH %s AND rowid IN ({placeholders})',
+                [_MATCH_START, _MATCH_STOP, '…', self.snippet_tokens, match, *article_ids],
+            )
+            return dict(cursor.fetchall())
+
+    def index_article(self, article: Article) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [article.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, content) VALUES (%s, %s, %s)',
+                [article.pk, article.title, article.content],
+            )
+
+    def index_articles(self, articles: Iterable[Article]) -> None:
+        rows = [(article.pk, article.title, article.content) for article in articles]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [row[:1] for row in rows])
+            cursor.executemany(f'INSERT INTO {self.table} (rowid, title, content) VALUES (%s, %s, %s)', rows)
+
+    def remove_article(self, article_id: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [article_id])
+
+    def rebuild(self) -> int:
+        article_table = connection.ops.quote_name(Article._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, content) '
+                f'SELECT id, title, content FROM {article_table}'
+            )
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+        return super().rebuild()
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Search backed by the generated ``search_document`` tsvector column.
+
+    PostgreSQL maintains the column and its GIN index on every write, so
+    the per-article hooks have nothing to do.
+    """
+
+    config = 'english'
+    headline_options = 'StartSel={start}, StopSel={stop}, MaxWords=35, MinWords=15'
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        if not _TOKEN_RE.search(query):
+            return queryset.none()
+        article_table = connection.ops.quote_name(Article._meta.db_table)
+        tsquery = 'websearch_to_tsquery(%s::regconfig, %s)'
+        matches = RawSQL(
+            f'{article_table}.search_document @@ {tsquery}',
+            [self.config, query],
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f'ts_rank_cd({article_table}.search_document, {tsquery})',
+            [self.config, query],
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(search_rank=rank)
+
+    def highlight(self, article_ids: Iterable[int], query: str) -> Dict[int, str]:
+        article_ids = list(article_ids)
+        if not article_ids:
+            return {}
+        article_table = connection.ops.quote_name(Article._meta.db_table)
+        options = self.headline_options.format(start=_MATCH_START, stop=_MATCH_STOP)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT id, ts_headline(%s::regconfig, content, '
+                f'websearch_to_tsquery(%s::regconfig, %s), %s) '
+                f'FROM {article_table} WHERE id = ANY(%s)',
+                [self.config, self.config, query, options, article_ids],
+            )
+            return dict(cursor.fetchall())
+
+    def rebuild(self) -> int:
+        article_table = connection.ops.quote_name(Article._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f'REINDEX TABLE {article_table}')
+        return super().rebuild()
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTS5SearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend() -> BaseSearchBackend:
+    """Return the configured search backend for the default connection"""
+    backend_path: Optional[str] = getattr(settings, 'BLOG_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    return VENDOR_BACKENDS.get(connection.vendor, IContainsSearchBackend)()
+
+
+class FullTextSearchFilter(filters.BaseFilterBackend):
+    """
+    Ranked full-text search on ``?search=``.
+
+    Results are ordered by relevance unless the client passes an explicit
+    ``ordering``, so this filter must run after ``OrderingFilter``.
+    """
+
+    search_param = 'search'
+
+    def get_search_query(self, request: Request) -> str:
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view) -> QuerySet:
+        query = self.get_search_query(request)
+        if not query:
+            return queryset
+        queryset = get_search_backend().search(queryset, query)
+        if queryset.query.is_empty():
+            return queryset
+        ordering_param = getattr(view, 'ordering_param', filters.OrderingFilter.ordering_param)
+        if not request.query_params.get(ordering_param):
+            queryset = queryset.order_by('-search_rank', '-created_at', '-id')
+        return queryset
+
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """HTML-safe snippet: the article text escaped, matches wrapped in ``<mark>``"""
+    if snippet is None:
+        return None
+    return escape(snippet).replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_STOP, HIGHLIGHT_STOP)
+
+
+def attach_snippets(articles: List[Article], query: str) -> None:
+    """Set ``search_snippet`` (safe to insert as HTML) on each article of a result page"""
+    snippets = get_search_backend().highlight([article.pk for article in articles], query)
+    for article in articles:
+        article.search_snippet = render_snippet(snippets.get(article.pk))
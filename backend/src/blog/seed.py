@@ -0,0 +1,247 @@
+"""
+Synthetic blog datasets for benchmarks and local load testing.
+
+``seed_blog`` bulk inserts tags, articles and comments shaped like a real
+blog rather than uniform rows:
+
+- tag use follows a Zipf distribution: the first tags (``python``,
+  ``django``, ...) are on a large share of articles, most tags on a few;
+- comments per article have a long (Pareto) tail: most articles have a
+  handful, a few have hundreds;
+- articles are spread over the last ``days`` days with varying lengths,
+  and comments follow their article.
+
+The same ``seed`` always produces the same rows (dates are relative to
+the time of the run), so results compare between commits. Inserts bypass ``save()`` and signals; the derived
+tables (comment counters, archive, search index, related articles) are
+rebuilt once at the end, and the response cache and tag autocomplete
+are reset.
+"""
+import math
+import random
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from .autocomplete import tag_autocomplete
+from .cache import response_cache
+from .models import Article, Comment, Tag, make_excerpt, rebuild_archive
+from .related import rebuild_related
+from .search import get_search_backend
+
+TOPICS = (
+    'python', 'django', 'javascript', 'react', 'typescript', 'web-development', 'databases', 'postgresql',
+    'performance', 'testing', 'devops', 'docker', 'security', 'api-design', 'css', 'career', 'rust', 'go',
+    'machine-learning', 'data-science', 'linux', 'cloud', 'kubernetes', 'open-source', 'tutorial',
+    'architecture', 'caching', 'sqlite', 'graphql', 'accessibility',
+)
+
+WORDS = (
+    'the', 'a', 'to', 'of', 'and', 'in', 'is', 'for', 'with', 'on', 'that', 'this', 'we', 'you', 'it', 'how',
+    'query', 'index', 'server', 'request', 'response', 'cache', 'model', 'view', 'component', 'state', 'build',
+    'deploy', 'test', 'latency', 'memory', 'thread', 'worker', 'database', 'schema', 'migration', 'release',
+    'feature', 'bug', 'fix', 'design', 'pattern', 'code', 'review', 'team', 'user', 'data', 'function', 'class',
+    'module', 'package', 'library', 'framework', 'browser', 'network', 'storage', 'queue', 'event', 'log',
+    'metric', 'profile', 'benchmark', 'scale', 'simple', 'fast', 'slow', 'better', 'first', 'new', 'old',
+)
+
+AUTHORS = (
+    'Anonymous', 'Thandi', 'Sipho', 'Lerato', 'Alex', 'Sam', 'Jordan', 'Taylor', 'Naledi', 'Kabelo', 'Chris',
+    'Priya', 'Wei', 'Fatima', 'Jonas', 'Maria', 'Tshimbiluni', 'Ayanda', 'Lebo', 'Robin',
+)
+
+
+class SeedResult:
+    """Row counts and timing of one seed run"""
+
+    def __init__(self) -> None:
+        self.tags = 0
+        self.articles = 0
+        self.article_tags = 0
+        self.comments = 0
+        self.seconds: Dict[str, float] = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'tags': self.tags,
+            'articles': self.articles,
+            'article_tags': self.article_tags,
+            'comments': self.comments,
+            'seconds': {step: round(elapsed, 3) for step, elapsed in self.seconds.items()},
+        }
+
+
+def tag_names(count: int) -> List[str]:
+    """``count`` distinct tag names, most popular first"""
+    names = []
+    for index in range(count):
+        round_, topic = divmod(index, len(TOPICS))
+        names.append(TOPICS[topic] if not round_ else f'{TOPICS[topic]}-{round_ + 1}')
+    return names
+
+
+def zipf_weights(count: int, exponent: float) -> List[float]:
+    """Cumulative weights of ranks 1..``count`` under ``1 / rank ** exponent``"""
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def long_tail(rng: random.Random, mean: float, alpha: float = 1.5, cap: int = 1000) -> int:
+    """A Pareto-distributed count with the given mean, capped at ``cap``"""
+    if mean <= 0:
+        return 0
+    # paretovariate(alpha) - 1 has mean 1 / (alpha - 1)
+    return min(cap, int(mean * (alpha - 1) * (rng.paretovariate(alpha) - 1) + 0.5))
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    text = ' '.join(rng.choices(WORDS, k=words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def paragraphs(rng: random.Random, words: int) -> str:
+    """About ``words`` words of text in paragraphs of a few sentences"""
+    out, written = [], 0
+    while written < words:
+        lengths = [rng.randint(6, 18) for _ in range(rng.randint(2, 6))]
+        out.append(' '.join(sentence(rng, length) for length in lengths))
+        written += sum(lengths)
+    return '\n\n'.join(out)
+
+
+@contextmanager
+def explicit_timestamps(*model_classes: Type[models.Model]) -> Iterator[None]:
+    """Let ``bulk_create`` keep the ``created_at``/``updated_at`` values set on instances"""
+    fields = [
+        field for model in model_classes for field in model._meta.concrete_fields
+        if isinstance(field, models.DateTimeField) and (field.auto_now or field.auto_now_add)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def seed_blog(
+    articles: int = 1000,
+    tags: int = 200,
+    comments: float = 5.0,
+    tags_per_article: int = 3,
+    zipf: float = 1.1,
+    published: float = 0.9,
+    approved: float = 0.9,
+    words: int = 300,
+    days: int = 3 * 365,
+    seed: int = 0,
+    batch_size: int = 2000,
+    rebuild: bool = True,
+    progress: Optional[Callable[[str], None]] = None,
+) -> SeedResult:
+    """
+    Insert a synthetic dataset; counts are in addition to existing rows.
+
+    ``comments`` and ``tags_per_article`` are means, ``words`` the median
+    article length. ``rebuild=False`` skips the derived tables, for
+    callers that rebuild them separately.
+    """
+    rng = random.Random(seed)
+    result = SeedResult()
+    now = timezone.now()
+    progress = progress or (lambda message: None)
+
+    def step(name: str, started: float) -> None:
+        result.seconds[name] = time.perf_counter() - started
+        progress(f'{name}: {result.seconds[name]:.1f}s')
+
+    started = time.perf_counter()
+    # Most popular first
+    names = tag_names(tags)
+    existing = set(Tag.objects.values_list('name', flat=True))
+    with explicit_timestamps(Tag, Article, Comment):
+        created = now - timedelta(days=days)
+        Tag.objects.bulk_create(
+            (Tag(name=name, created_at=created, updated_at=created) for name in names if name not in existing),
+            batch_size=batch_size,
+        )
+        by_name = dict(Tag.objects.filter(name__in=names).values_list('name', 'pk'))
+        tag_ids = [by_name[name] for name in names]
+        result.tags = len(tag_ids)
+        cumulative = zipf_weights(len(tag_ids), zipf)
+        step('tags', started)
+
+        started = time.perf_counter()
+        through = Article.tags.through
+        for offset in range(0, articles, batch_size):
+            batch = []
+            for _ in range(min(batch_size, articles - offset)):
+                content = paragraphs(rng, max(20, int(rng.lognormvariate(math.log(words), 0.6))))
+                created_at = now - timedelta(seconds=rng.uniform(0, days * 86400))
+                batch.append(Article(
+                    title=sentence(rng, rng.randint(3, 9))[:-1],
+                    content=content,
+                    excerpt=make_excerpt(content),
+                    is_published=rng.random() < published,
+                    created_at=created_at,
+                    updated_at=created_at + timedelta(seconds=rng.uniform(0, 86400) if rng.random() < 0.2 else 0),
+                ))
+            with transaction.atomic():
+                Article.objects.bulk_create(batch)
+                if not batch[0].pk:
+                    # Backends that cannot return ids from a multi-row INSERT
+                    ids = Article.objects.order_by('-pk').values_list('pk', flat=True)[:len(batch)]
+                    for article, pk in zip(batch, sorted(ids)):
+                        article.pk = pk
+                links = []
+                for article in batch:
+                    count = 1 + min(long_tail(rng, tags_per_article - 1, cap=9), len(tag_ids) - 1) if tag_ids else 0
+                    chosen = {
+                        tag_ids[bisect_left(cumulative, rng.random() * cumulative[-1])] for _ in range(count)
+                    }
+                    links.extend(through(article_id=article.pk, tag_id=tag_id) for tag_id in chosen)
+                through.objects.bulk_create(links, batch_size=batch_size)
+                result.article_tags += len(links)
+
+                rows = []
+                for article in batch:
+                    age = (now - article.created_at).total_seconds()
+                    for _ in range(long_tail(rng, comments)):
+                        # Mostly soon after publication
+                        at = article.created_at + timedelta(seconds=min(age, rng.expovariate(1 / 172800)))
+                        rows.append(Comment(
+                            article_id=article.pk,
+                            content=sentence(rng, rng.randint(4, 40)),
+                            author_name=rng.choice(AUTHORS),
+                            is_approved=rng.random() < approved,
+                            created_at=at,
+                            updated_at=at,
+                        ))
+                Comment.objects.bulk_create(rows, batch_size=batch_size)
+                result.comments += len(rows)
+            result.articles += len(batch)
+            progress(f'{result.articles}/{articles} articles, {result.comments} comments')
+        step('articles and comments', started)
+
+    if rebuild:
+        started = time.perf_counter()
+        Article.objects.recount_comments()
+        rebuild_archive()
+        step('counters and archive', started)
+        started = time.perf_counter()
+        get_search_backend().rebuild()
+        step('search index', started)
+        started = time.perf_counter()
+        rebuild_related()
+        step('related articles', started)
+
+    response_cache.clear()
+    tag_autocomplete.invalidate()
+    return result
@@ -1,9 +1,83 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.urls import reverse
+from django.utils.http import urlencode
 from rest_framework import serializers
-from typing import Dict, Any, List, OrderedDict
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from typing import Dict, Any, Iterable, List, Optional, OrderedDict, Set
+from .autocomplete import tag_autocomplete
+from .cache import TAGS, response_cache
+from .pagination import CommentPagination
 from .models import Article, Tag, Comment
 
 
-class TagSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Lets clients choose top-level fields with ``?fields=a,b`` or ``?omit=a,b``.
+
+    Fields listed in ``Meta.opt_in_fields`` are only returned when named in
+    ``fields``. ``Meta.field_sources`` maps computed fields to the model
+    columns they read, so views can narrow the SQL with ``.only()``.
+    Writes always validate and return the full field set.
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    @staticmethod
+    def _parse(value: Optional[str]) -> Optional[Set[str]]:
+        if value is None:
+            return None
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    @classmethod
+    def get_requested_fields(cls, request: Optional[Request]) -> List[str]:
+        """Top-level field names to render for this request"""
+        declared = list(cls.Meta.fields)
+        opt_in = set(getattr(cls.Meta, 'opt_in_fields', ()))
+        if request is None:
+            return [name for name in declared if name not in opt_in]
+        only = cls._parse(request.query_params.get(cls.fields_query_param))
+        omit = cls._parse(request.query_params.get(cls.omit_query_param)) or set()
+        if only is not None:
+            return [name for name in declared if name in only and name not in omit]
+        return [name for name in declared if name not in opt_in and name not in omit]
+
+    @classmethod
+    def get_model_columns(cls, field_names: Iterable[str]) -> List[str]:
+        """Concrete model columns needed to render ``field_names``"""
+        sources = getattr(cls.Meta, 'field_sources', {})
+        concrete = {
+            field.name for field in cls.Meta.model._meta.concrete_fields
+        }
+        columns = {'id'}
+        for name in field_names:
+            columns.update(sources.get(name, [name] if name in concrete else []))
+        return sorted(columns)
+
+    @classmethod
+    def narrow_queryset(cls, queryset: QuerySet, request: Optional[Request], always: Iterable[str] = ()) -> QuerySet:
+        """Load only the columns the response needs"""
+        columns = cls.get_model_columns(cls.get_requested_fields(request))
+        return queryset.only(*columns, *always)
+
+    def get_fields(self) -> Dict[str, serializers.Field]:
+        fields = super().get_fields()
+        root = self.root
+        is_top_level = self is root or (
+            self.parent is root and isinstance(root, serializers.ListSerializer)
+        )
+        request = self.context.get('request')
+        if not is_top_level or (request is not None and request.method not in SAFE_METHODS):
+            return fields
+        requested = set(self.get_requested_fields(request))
+        return {
+            name: field for name, field in fields.items()
+            if name in requested or field.write_only
+        }
+
+
+class TagSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Tag model"""
     
     class Meta:
@@ -23,7 +97,7 @@ class TagSerializer(serializers.ModelSerializer):
         return value
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Comment model"""
     author_name = serializers.CharField(max_length=100, required=False, default="Anonymous")
     
@@ -64,46 +138,94 @@ class CommentCreateSerializer(serializers.ModelSerializer):
         return value
 
 
-class ArticleListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for article lists"""
+class ArticleListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Lightweight serializer for article lists.
+
+    Returns the stored ``excerpt``; the full ``content`` is opt-in via ``?fields=``.
+    """
     tags = TagSerializer(many=True, read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(source='approved_comments_count', read_only=True)
     is_recent = serializers.ReadOnlyField()
+    # Only present on search results
+    search_rank = serializers.FloatField(read_only=True)
+    search_snippet = serializers.CharField(read_only=True)
     
     class Meta:
         model = Article
         fields = [
-            'id', 'title', 'content', 'tags', 'created_at', 
-            'updated_at', 'is_published', 'comments_count', 'is_recent'
+            'id', 'title', 'excerpt', 'content', 'tags', 'created_at', 
+            'updated_at', 'is_published', 'comments_count', 'is_recent',
+            'search_rank', 'search_snippet'
         ]
+        opt_in_fields = ['content']
+        field_sources = {
+            'is_recent': ['created_at'],
+            'comments_count': ['approved_comments_count'],
+        }
 
-    def get_comments_count(self, obj: Article) -> int:
-        """Get the count of approved comments"""
-        return obj.comments.filter(is_approved=True).count()
 
+class ArticleDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Detailed serializer for individual articles.
+
+    Embeds only the first ``comments_limit`` approved comments; when there
+    are more, ``comments_next`` links to the next page of the comments action.
+    """
+    comments_limit = 10
 
-class ArticleDetailSerializer(serializers.ModelSerializer):
-    """Detailed serializer for individual articles"""
     tags = TagSerializer(many=True, read_only=True)
     comments = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(source='approved_comments_count', read_only=True)
+    comments_next = serializers.SerializerMethodField()
     is_recent = serializers.ReadOnlyField()
     
     class Meta:
         model = Article
         fields = [
-            'id', 'title', 'content', 'tags', 'comments', 
-            'created_at', 'updated_at', 'is_published', 'is_recent'
+            'id', 'title', 'content', 'tags', 'comments', 'comments_count',
+            'comments_next', 'created_at', 'updated_at', 'is_published', 'is_recent'
         ]
+        field_sources = {
+            'is_recent': ['created_at'],
+            'comments_count': ['approved_comments_count'],
+        }
+
+    def _first_comments(self, obj: Article) -> List[Comment]:
+        """Up to ``comments_limit + 1`` approved comments; the extra one signals a next page"""
+        approved_comments = getattr(obj, 'approved_comments', None)
+        if approved_comments is None:
+            approved_comments = obj.approved_comments = list(
+                obj.comments.filter(is_approved=True).order_by('created_at', 'id')[:self.comments_limit + 1]
+            )
+        return approved_comments
 
     def get_comments(self, obj: Article) -> List[Dict[str, Any]]:
-        """Get approved comments for the article"""
-        approved_comments = obj.comments.filter(is_approved=True)
-        return CommentSerializer(approved_comments, many=True).data
+        """Get the first approved comments for the article"""
+        return CommentSerializer(self._first_comments(obj)[:self.comments_limit], many=True).data
+
+    def get_comments_next(self, obj: Article) -> Optional[str]:
+        """Cursor link to the comments after the embedded ones"""
+        comments = self._first_comments(obj)
+        if len(comments) <= self.comments_limit:
+            return None
+        cursor = CommentPagination().encode_cursor(comments[self.comments_limit - 1], reverse=False)
+        url = f"{reverse('article-comments', args=[obj.pk])}?{urlencode({'cursor': cursor})}"
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+class ArticleTagSerializer(TagSerializer):
+    """Tag input nested in an article: names may refer to existing tags"""
+
+    class Meta(TagSerializer.Meta):
+        # Existing names are reused, so the unique check would only add a query per tag
+        extra_kwargs = {'name': {'validators': []}}
 
 
 class ArticleCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating articles"""
-    tags = TagSerializer(many=True, required=False)
+    tags = ArticleTagSerializer(many=True, required=False)
     
     class Meta:
         model = Article
@@ -142,6 +264,7 @@ class ArticleCreateUpdateSerializer(serializers.ModelSerializer):
         
         return value
 
+    @transaction.atomic
     def create(self, validated_data: Dict[str, Any]) -> Article:
         """Create article with tags"""
         tags_data = validated_data.pop('tags', [])
@@ -149,11 +272,12 @@ class ArticleCreateUpdateSerializer(serializers.ModelSerializer):
         # Create the article
         article = Article.objects.create(**validated_data)
         
-        # Process tags
-        self._process_tags(article, tags_data)
+        # A new article has no tags to diff against
+        self._set_tags(article, tags_data, current=set())
         
         return article
 
+    @transaction.atomic
     def update(self, instance: Article, validated_data: Dict[str, Any]) -> Article:
         """Update article with tags"""
         tags_data = validated_data.pop('tags', None)
@@ -165,18 +289,37 @@ class ArticleCreateUpdateSerializer(serializers.ModelSerializer):
         
         # Process tags if provided
         if tags_data is not None:
-            instance.tags.clear()
-            self._process_tags(instance, tags_data)
+            self._set_tags(instance, tags_data)
         
         return instance
 
-    def _process_tags(self, article: Article, tags_data: List[Dict[str, Any]]) -> None:
-        """Process and associate tags with the article"""
-        for tag_data in tags_data:
-            tag_name = tag_data.get('name', '').strip().lower()
-            if tag_name:
-                tag, created = Tag.objects.get_or_create(name=tag_name)
-                article.tags.add(tag)
+    def _set_tags(
+        self,
+        article: Article,
+        tags_data: List[Dict[str, Any]],
+        current: Optional[Set[int]] = None,
+    ) -> None:
+        """
+        Make the article's tags exactly ``tags_data``.
+
+        Tags are resolved by name as a set, and only the through rows that
+        differ from ``current`` (read from the database when not given) are
+        removed or added, so the query count does not grow with the tags.
+        """
+        names = [tag_data['name'] for tag_data in tags_data if tag_data.get('name')]
+        tags, created = Tag.objects.get_or_create_many(names)
+        if created:
+            # bulk_create sends no post_save, so evict tag listings here
+            response_cache.invalidate(TAGS)
+            tag_autocomplete.invalidate()
+
+        wanted = {tag.pk for tag in tags}
+        if current is None:
+            current = set(article.tags.values_list('pk', flat=True))
+        if current - wanted:
+            article.tags.remove(*(current - wanted))
+        if wanted - current:
+            article.tags.add(*(wanted - current))
 
     def to_representation(self, instance: Article) -> Dict[str, Any]:
         """Return detailed representation after create/update"""
@@ -0,0 +1,165 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .autocomplete import tag_autocomplete
+from .cache import ARTICLES, COMMENTS, TAGS, article_ns, response_cache, tag_ns
+from .models import Article, Comment, Tag, approved_comments_changed, article_text_changed
+from .related import related_config, update_related
+from .search import get_search_backend
+from .snapshot import article_paths, schedule, snapshot_enabled, tag_paths
+
+
+@receiver(post_save, sender=Article)
+def index_article(sender, instance: Article, **kwargs) -> None:
+    """Keep the search index in step with saved articles"""
+    get_search_backend().index_article(instance)
+
+
+@receiver(post_delete, sender=Article)
+def unindex_article(sender, instance: Article, **kwargs) -> None:
+    """Remove deleted articles from the search index"""
+    get_search_backend().remove_article(instance.pk)
+
+
+@receiver(article_text_changed)
+def reindex_articles(sender, article_ids, **kwargs) -> None:
+    """Reindex and evict articles whose text changed through QuerySet.update()"""
+    get_search_backend().index_articles(Article.objects.filter(pk__in=article_ids).only('pk', 'title', 'content'))
+    response_cache.invalidate(ARTICLES, *(article_ns(pk) for pk in article_ids))
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article(sender, instance: Article, **kwargs) -> None:
+    """Evict cached responses rendering the article or the article collection"""
+    response_cache.invalidate(ARTICLES, article_ns(instance.pk))
+
+
+@receiver(post_save, sender=Article)
+def rerank_article(sender, instance: Article, **kwargs) -> None:
+    """Only published articles are ranked, so (un)publishing moves the article in and out"""
+    if getattr(instance, '_publication_changed', False) and related_config()['INCREMENTAL']:
+        update_related([instance.pk])
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag(sender, instance: Tag, **kwargs) -> None:
+    """Evict cached responses rendering the tag"""
+    response_cache.invalidate(TAGS, tag_ns(instance.pk))
+
+
+@receiver(post_save, sender=Tag)
+def autocomplete_tag_saved(sender, instance: Tag, **kwargs) -> None:
+    """Index new and renamed tags for autocomplete"""
+    tag_autocomplete.tag_saved(instance)
+
+
+@receiver(post_delete, sender=Tag)
+def autocomplete_tag_deleted(sender, instance: Tag, **kwargs) -> None:
+    """Drop deleted tags from autocomplete"""
+    tag_autocomplete.tag_deleted(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender, instance: Comment, **kwargs) -> None:
+    """Evict only the cached responses rendering the commented article"""
+    response_cache.invalidate(COMMENTS, article_ns(instance.article_id))
+
+
+@receiver(approved_comments_changed)
+def invalidate_comment_counts(sender, article_ids, **kwargs) -> None:
+    """Evict responses rendering counters changed by bulk comment writes"""
+    response_cache.invalidate(COMMENTS, *(article_ns(pk) for pk in article_ids))
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def article_tags_changed(sender, instance, action: str, reverse: bool, pk_set, **kwargs) -> None:
+    """Touch and evict the articles whose tag membership changed"""
+    if action == 'pre_clear' and reverse:
+        # The affected articles are only known before the rows are gone
+        instance._cleared_article_ids = list(instance.articles.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        article_ids = [instance.pk]
+    elif action == 'post_clear':
+        article_ids = getattr(instance, '_cleared_article_ids', [])
+    else:
+        article_ids = list(pk_set or [])
+    touch_tagged_articles(article_ids)
+
+
+@receiver(pre_delete, sender=Tag)
+def tag_deleting(sender, instance: Tag, **kwargs) -> None:
+    """Remember the tag's articles: its memberships cascade without m2m_changed"""
+    instance._deleted_article_ids = list(instance.articles.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def tag_deleted(sender, instance: Tag, **kwargs) -> None:
+    """Touch and evict the articles that lost the tag"""
+    touch_tagged_articles(getattr(instance, '_deleted_article_ids', []))
+
+
+def touch_tagged_articles(article_ids) -> None:
+    """Membership is part of the article, so conditional GET validators must move"""
+    if not article_ids:
+        return
+    Article.objects.filter(pk__in=article_ids).update(updated_at=timezone.now())
+    response_cache.invalidate(ARTICLES, *(article_ns(pk) for pk in article_ids))
+    if related_config()['INCREMENTAL']:
+        update_related(article_ids)
+
+
+@receiver(post_save, sender=Article)
+@receiver(pre_delete, sender=Article)
+def snapshot_article(sender, instance: Article, **kwargs) -> None:
+    """Re-render the snapshots showing the article (before a delete removes its tags)"""
+    if snapshot_enabled():
+        schedule(article_paths([instance.pk]))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def snapshot_comment(sender, instance: Comment, **kwargs) -> None:
+    """Re-render the snapshots showing the commented article"""
+    if snapshot_enabled():
+        schedule(article_paths([instance.article_id]))
+
+
+@receiver(approved_comments_changed)
+def snapshot_comment_counts(sender, article_ids, **kwargs) -> None:
+    """Re-render the snapshots showing counters changed by bulk comment writes"""
+    if snapshot_enabled():
+        schedule(article_paths(article_ids))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def snapshot_tag(sender, instance: Tag, **kwargs) -> None:
+    """Re-render the tag's listings and every article showing it"""
+    if snapshot_enabled():
+        article_ids = instance.articles.values_list('pk', flat=True) if instance.pk else []
+        schedule(article_paths(article_ids) | tag_paths([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def snapshot_article_tags(sender, instance, action: str, reverse: bool, pk_set, **kwargs) -> None:
+    """Re-render the articles and tag listings whose membership changed"""
+    if not snapshot_enabled():
+        return
+    if action == 'pre_clear':
+        members = instance.articles if reverse else instance.tags
+        instance._snapshot_cleared_ids = list(members.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    changed = getattr(instance, '_snapshot_cleared_ids', []) if action == 'post_clear' else list(pk_set or [])
+    if reverse:
+        schedule(article_paths(changed) | tag_paths([instance.pk]))
+    else:
+        schedule(article_paths([instance.pk]) | tag_paths(changed))
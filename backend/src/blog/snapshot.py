@@ -0,0 +1,237 @@
+"""
+Pre-rendered JSON snapshots of the anonymous read endpoints.
+
+Snapshots are the exact bytes the API returns for a query-less GET (plus
+``?page=N`` for paginated lists), written under ``BLOG_SNAPSHOT['ROOT']``
+so nginx can serve them without reaching Django::
+
+    <ROOT>/api/articles/index.json         GET /api/articles/
+    <ROOT>/api/articles/page-2.json        GET /api/articles/?page=2
+    <ROOT>/api/articles/7/index.json       GET /api/articles/7/
+
+Each file also gets ``.gz`` and (with the optional ``brotli`` package)
+``.br`` variants for ``gzip_static`` / ``brotli_static``. Files are written
+to a temporary name in the same directory and moved into place with
+``os.replace``, so readers never see a partial file, and files whose
+bytes did not change are left alone. Paths that stop existing (an
+unpublished article, a page past the end) have their files removed.
+
+``manage.py publish_snapshot`` renders everything. With snapshots
+enabled, model signals schedule the paths a write affects and render them
+once the transaction commits. Writes that bypass signals (``QuerySet.update``
+on articles, raw SQL) need a full publish, as does the passage of time for
+``is_recent``; run the command periodically.
+"""
+import gzip
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from .models import ArchiveMonth, Article, Month, Tag, archive_month
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': False,
+    # Defaults to staticfiles/snapshot, the volume nginx shares in production
+    'ROOT': None,
+    'BASE_URL': 'http://localhost:8000',
+    # Pages of each paginated list to pre-render; later pages go to Django
+    'PAGES': 5,
+    'COMPRESS': True,
+}
+
+ENCODINGS = ('gz', 'br')
+
+
+def snapshot_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_SNAPSHOT', {})}
+
+
+def snapshot_enabled() -> bool:
+    return bool(snapshot_config()['ENABLED'])
+
+
+def listing_paths(months: Iterable[Month], tag_ids: Iterable[int]) -> Set[str]:
+    """The article list, the archive, and the listings of ``months`` and ``tag_ids``"""
+    paths = {reverse('article-list'), reverse('article-archive')}
+    paths.update(reverse('article-archive-month', args=month) for month in months)
+    paths.update(reverse('tag-articles', args=[pk]) for pk in tag_ids)
+    return paths
+
+
+def article_paths(article_ids: Iterable[int]) -> Set[str]:
+    """Every snapshot path that renders one of ``article_ids``"""
+    article_ids = set(article_ids)
+    if not article_ids:
+        return set()
+    months = {
+        archive_month(created_at)
+        for created_at in Article.objects.filter(pk__in=article_ids).values_list('created_at', flat=True)
+    }
+    tag_ids = Tag.objects.filter(articles__in=article_ids).values_list('pk', flat=True).distinct()
+    paths = listing_paths(months, tag_ids)
+    paths.update(reverse('article-detail', args=[pk]) for pk in article_ids)
+    return paths
+
+
+def tag_paths(tag_ids: Iterable[int]) -> Set[str]:
+    """The tag list and the article listings of ``tag_ids``"""
+    return {reverse('tag-list')} | {reverse('tag-articles', args=[pk]) for pk in tag_ids}
+
+
+def all_paths() -> Set[str]:
+    """Every path a full publish renders"""
+    paths = {reverse('article-list'), reverse('article-archive'), reverse('tag-list')}
+    paths.update(
+        reverse('article-detail', args=[pk])
+        for pk in Article.objects.published().values_list('pk', flat=True).iterator(chunk_size=2000)
+    )
+    paths.update(reverse('tag-articles', args=[pk]) for pk in Tag.objects.values_list('pk', flat=True))
+    paths.update(
+        reverse('article-archive-month', args=[year, month])
+        for year, month in ArchiveMonth.objects.filter(count__gt=0).values_list('year', 'month')
+    )
+    return paths
+
+
+class SnapshotWriter:
+    """Renders API paths through their views and writes the results atomically"""
+
+    def __init__(self, root: Optional[Path] = None, base_url: Optional[str] = None) -> None:
+        config = snapshot_config()
+        self.root = Path(root or config['ROOT'] or Path(settings.BASE_DIR) / 'staticfiles' / 'snapshot')
+        self.pages = config['PAGES']
+        self.compress = config['COMPRESS']
+        url = urlsplit(base_url or config['BASE_URL'])
+        self.factory = RequestFactory(HTTP_HOST=url.netloc)
+        self.secure = url.scheme == 'https'
+        self.written = 0
+        self.removed = 0
+
+    def render(self, path: str, page: Optional[int] = None) -> Tuple[Optional[bytes], bool]:
+        """
+        Response body for a GET of ``path`` (None unless it is a 200) and
+        whether a next page follows.
+        """
+        request = self.factory.get(path, {'page': page} if page else {}, secure=self.secure)
+        # Rendering is not a read: keeps it out of the view counts
+        request.blog_snapshot = True
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if response.status_code != 200:
+            return None, False
+        response.render()
+        data = response.data
+        return response.content, isinstance(data, dict) and bool(data.get('next'))
+
+    def file_for(self, path: str, page: Optional[int] = None) -> Path:
+        name = f'page-{page}.json' if page and page > 1 else 'index.json'
+        return self.root / path.strip('/') / name
+
+    def publish(self, path: str) -> None:
+        """Write ``path`` and, if it is paginated, its first ``PAGES`` pages"""
+        body, has_next = self.render(path)
+        self.store(self.file_for(path), body)
+        page = 1
+        while has_next and page < self.pages:
+            page += 1
+            body, has_next = self.render(path, page)
+            self.store(self.file_for(path, page), body)
+        # Pages past the end, or of a path that no longer renders
+        for stale in range(page + 1, self.pages + 1):
+            self.store(self.file_for(path, stale), None)
+
+    def publish_all(self, paths: Iterable[str]) -> None:
+        for path in sorted(paths):
+            self.publish(path)
+
+    def store(self, target: Path, body: Optional[bytes]) -> None:
+        if body is None:
+            for variant in self.variants(target):
+                if variant.exists():
+                    variant.unlink()
+                    self.removed += 1
+            return
+        try:
+            if target.read_bytes() == body:
+                return
+        except FileNotFoundError:
+            pass
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Compressed variants first, so nginx never pairs new ones with a stale plain file for long
+        for suffix, data in self.encode(body):
+            self.replace(target.with_name(f'{target.name}.{suffix}'), data)
+        self.replace(target, body)
+        self.written += 1
+
+    def encode(self, body: bytes) -> Iterator[Tuple[str, bytes]]:
+        if not self.compress:
+            return
+        yield 'gz', gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            yield 'br', brotli.compress(body)
+
+    @staticmethod
+    def variants(target: Path) -> Iterator[Path]:
+        for suffix in ENCODINGS:
+            yield target.with_name(f'{target.name}.{suffix}')
+        yield target
+
+    @staticmethod
+    def replace(target: Path, data: bytes) -> None:
+        """Write ``data`` to ``target`` atomically"""
+        fd, temporary = tempfile.mkstemp(dir=target.parent, prefix=f'.{target.name}.')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(data)
+            # mkstemp creates 0600 files; nginx runs as another user
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, target)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+def publish_snapshot(root: Optional[Path] = None, base_url: Optional[str] = None) -> SnapshotWriter:
+    """Render every snapshot path"""
+    writer = SnapshotWriter(root, base_url)
+    writer.publish_all(all_paths())
+    return writer
+
+
+_pending = threading.local()
+
+
+def schedule(paths: Iterable[str]) -> None:
+    """Re-render ``paths`` once the current transaction commits"""
+    if not snapshot_enabled():
+        return
+    _pending.paths = getattr(_pending, 'paths', set()) | set(paths)
+    # Every write registers a callback; the first one to run publishes them all
+    transaction.on_commit(publish_pending)
+
+
+def publish_pending() -> None:
+    paths, _pending.paths = getattr(_pending, 'paths', set()), set()
+    if not paths:
+        return
+    try:
+        SnapshotWriter().publish_all(paths)
+    except Exception as e:
+        # The write itself has committed; the next publish repairs the files
+        logger.error(f"Error publishing {len(paths)} snapshot paths: {str(e)}")
@@ -0,0 +1,228 @@
+"""
+Delta sync: the articles, tags and comments changed since a client's token.
+
+Each stream (the three models plus ``Tombstone`` rows for deletions) is
+read in ``(updated_at, id)`` order from the position the token recorded,
+at most ``LIMIT`` rows at a time; ``has_more`` asks the client to call
+again with the new token straight away. Rows that stopped being visible
+(unpublished articles, unapproved comments) are reported as deleted, as
+are tombstoned rows. Deleting an article implies its comments, and
+deleting a tag implies its removal from every article.
+
+``updated_at`` is stamped when a row is saved, not when its transaction
+commits, so a slow writer can commit a row older than one a client has
+already seen. Positions therefore never move past ``LAG`` seconds before
+the read, even when a page is cut short by ``LIMIT``: the newest rows are
+sent again on the next call, and clients apply changes as idempotent
+upserts and deletes.
+
+A client that already holds the current rows (from the paginated lists)
+starts with ``since=now``: a token at the lag horizon and no rows.
+
+Tombstones are kept for ``RETENTION_DAYS``; an older token is answered
+with 410 and the client starts over without one. ``compact_tombstones``
+removes expired rows, from ``manage.py compact_tombstones`` and at most
+once per ``COMPACT_INTERVAL`` as deletions are recorded.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import BooleanField, ExpressionWrapper, F, Model, Q, QuerySet, Value
+from django.utils import timezone
+
+from .models import Article, Comment, Tag, Tombstone
+
+DEFAULTS = {
+    'LIMIT': 500,
+    'LAG': 10,
+    'RETENTION_DAYS': 30,
+    'COMPACT_INTERVAL': 3600,
+    'ALIAS': 'default',
+    'KEY_PREFIX': 'blog',
+}
+
+# (timestamp in microseconds, id) of the last row a client has seen
+Position = Tuple[int, int]
+
+STREAMS = ('articles', 'tags', 'comments', 'deleted')
+
+TOKEN_VERSION = 1
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# ``since`` value asking for the current position and nothing before it
+NOW = 'now'
+
+TOMBSTONE_STREAMS = {Tombstone.ARTICLE: 'articles', Tombstone.TAG: 'tags', Tombstone.COMMENT: 'comments'}
+
+
+class InvalidToken(ValueError):
+    """The token is malformed"""
+
+
+class ExpiredToken(ValueError):
+    """The token predates the tombstones still kept"""
+
+
+def sync_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_SYNC', {})}
+
+
+def to_micros(value: datetime) -> int:
+    delta = value - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 10 ** 6 + delta.microseconds
+
+
+def from_micros(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=value)
+
+
+def encode_token(positions: Dict[str, Position]) -> str:
+    payload = json.dumps([TOKEN_VERSION, *(positions[stream] for stream in STREAMS)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_token(token: str) -> Dict[str, Position]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        version, *positions = payload
+        if version != TOKEN_VERSION or len(positions) != len(STREAMS):
+            raise InvalidToken(token)
+        return {stream: (int(micros), int(pk)) for stream, (micros, pk) in zip(STREAMS, positions)}
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidToken(token) from exc
+
+
+def after(position: Position, field: str) -> Q:
+    """Rows strictly after ``position`` in (``field``, id) order"""
+    moment, pk = from_micros(position[0]), position[1]
+    # The redundant lower bound lets the (field, id) index seek instead of scan
+    return Q(**{f'{field}__gte': moment}) & (Q(**{f'{field}__gt': moment}) | Q(pk__gt=pk))
+
+
+class Page:
+    """One stream's rows past a position, and the position to resume from"""
+
+    def __init__(
+        self, queryset: QuerySet, field: str, position: Position, limit: int, safe: int, *columns: Any
+    ) -> None:
+        rows = list(
+            queryset.filter(after(position, field)).order_by(field, 'pk')
+            .values_list('pk', field, *columns)[:limit + 1]
+        )
+        self.rows = rows[:limit]
+        last = (to_micros(self.rows[-1][1]), self.rows[-1][0]) if self.rows else position
+        self.truncated = len(rows) > limit and last[0] <= safe
+        if self.truncated:
+            # The client resumes right after the last row it received
+            self.position = last
+        else:
+            # Everything up to ``safe`` was read, but later rows may yet be
+            # joined by slow commits; the rest of a page that ran past
+            # ``safe`` is sent again from there on the next call
+            self.position = max(position, (safe, 0))
+
+
+def changes_since(token: Optional[str], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Changed and deleted ids per model since ``token`` (everything visible
+    without one) and the token of the next call.
+    """
+    config = sync_config()
+    now = now or timezone.now()
+    limit, safe = config['LIMIT'], to_micros(now - timedelta(seconds=config['LAG']))
+    if token == NOW:
+        empty = {stream: [] for stream in TOMBSTONE_STREAMS.values()}
+        return {
+            'changed': empty,
+            'deleted': dict(empty),
+            'comment_counts': {},
+            'token': encode_token({stream: (safe, 0) for stream in STREAMS}),
+            'has_more': False,
+        }
+    if token:
+        positions = decode_token(token)
+        horizon = to_micros(now - timedelta(days=config['RETENTION_DAYS']))
+        if positions['deleted'][0] < horizon:
+            raise ExpiredToken(token)
+    else:
+        start = (0, 0)
+        # Nothing deleted before the first call concerns the client
+        positions = {'articles': start, 'tags': start, 'comments': start, 'deleted': (safe, 0)}
+
+    # Stream: (rows, whether a row is visible to anonymous readers)
+    sources = {
+        'articles': (Article.objects.all(), F('is_published')),
+        'tags': (Tag.objects.all(), Value(True)),
+        'comments': (Comment.objects.all(), F('is_approved')),
+    }
+    changed: Dict[str, List[int]] = {}
+    deleted: Dict[str, List[int]] = {stream: [] for stream in sources}
+    next_positions: Dict[str, Position] = {}
+    has_more = False
+    for stream, (queryset, visible) in sources.items():
+        queryset = queryset.annotate(visible=ExpressionWrapper(visible, output_field=BooleanField()))
+        if not token:
+            # A first sync has nothing to delete
+            queryset = queryset.filter(visible=True)
+        page = Page(queryset, 'updated_at', positions[stream], limit, safe, 'visible')
+        changed[stream] = [pk for pk, _, shown in page.rows if shown]
+        deleted[stream].extend(pk for pk, _, shown in page.rows if not shown)
+        next_positions[stream] = page.position
+        has_more |= page.truncated
+
+    tombstones = Page(
+        Tombstone.objects.all(), 'deleted_at', positions['deleted'], limit, safe, 'kind', 'object_id', 'article_id'
+    )
+    next_positions['deleted'] = tombstones.position
+    has_more |= tombstones.truncated
+    counted_articles = set(
+        Comment.objects.filter(pk__in=changed['comments'] + deleted['comments'])
+        .order_by().values_list('article_id', flat=True)
+    )
+    for _, _, kind, object_id, article_id in tombstones.rows:
+        deleted[TOMBSTONE_STREAMS[kind]].append(object_id)
+        if article_id is not None:
+            counted_articles.add(article_id)
+
+    return {
+        'changed': changed,
+        'deleted': {stream: sorted(set(ids)) for stream, ids in deleted.items()},
+        # Comment writes change these without touching the article's updated_at
+        'comment_counts': dict(
+            Article.objects.published().filter(pk__in=counted_articles)
+            .order_by().values_list('pk', 'approved_comments_count')
+        ),
+        'token': encode_token(next_positions),
+        'has_more': has_more,
+    }
+
+
+def record_deletions(instances: Iterable[Model]) -> None:
+    """Write tombstones for ``instances`` before they are deleted"""
+    tombstones = []
+    for instance in instances:
+        if isinstance(instance, Article):
+            tombstones.append(Tombstone(kind=Tombstone.ARTICLE, object_id=instance.pk))
+        elif isinstance(instance, Tag):
+            tombstones.append(Tombstone(kind=Tombstone.TAG, object_id=instance.pk))
+        elif isinstance(instance, Comment):
+            tombstones.append(Tombstone(kind=Tombstone.COMMENT, object_id=instance.pk, article_id=instance.article_id))
+    Tombstone.objects.bulk_create(tombstones)
+    config = sync_config()
+    # One compaction per interval across workers
+    if caches[config['ALIAS']].add(f'{config["KEY_PREFIX"]}:sync:compacted', 1, config['COMPACT_INTERVAL']):
+        compact_tombstones()
+
+
+def compact_tombstones(now: Optional[datetime] = None) -> int:
+    """Delete tombstones past the retention period; returns the number removed"""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=sync_config()['RETENTION_DAYS'])
+    removed, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return removed
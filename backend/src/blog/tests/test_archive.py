@@ -0,0 +1,139 @@
+from datetime import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from blog.importer import import_articles
+from blog.models import ArchiveMonth, Article
+
+
+def aware(year: int, month: int, day: int = 15) -> datetime:
+    return timezone.make_aware(datetime(year, month, day, 12))
+
+
+class ArchiveCountTests(TestCase):
+    """``ArchiveMonth`` follows every kind of article write"""
+
+    def setUp(self) -> None:
+        now = timezone.localtime()
+        self.current = (now.year, now.month)
+
+    def counts(self) -> dict:
+        return {(row.year, row.month): row.count for row in ArchiveMonth.objects.filter(count__gt=0)}
+
+    def create(self, **kwargs) -> Article:
+        return Article.objects.create(title='Archived', content='Archived article body.', **kwargs)
+
+    def test_publish_unpublish_and_delete(self) -> None:
+        article = self.create()
+        self.create(is_published=False)
+        self.assertEqual(self.counts(), {self.current: 1})
+
+        article.is_published = False
+        article.save()
+        self.assertEqual(self.counts(), {})
+        article.is_published = True
+        article.save(update_fields=['is_published'])
+        self.assertEqual(self.counts(), {self.current: 1})
+        article.save(update_fields=['title'])
+        self.assertEqual(self.counts(), {self.current: 1})
+
+        article.delete()
+        self.assertEqual(self.counts(), {})
+
+    def test_queryset_writes(self) -> None:
+        first, second = self.create(), self.create()
+        Article.objects.filter(pk=first.pk).update(created_at=aware(2023, 2))
+        self.assertEqual(self.counts(), {self.current: 1, (2023, 2): 1})
+
+        Article.objects.update(is_published=False)
+        self.assertEqual(self.counts(), {})
+        Article.objects.update(is_published=True)
+        Article.objects.filter(pk=second.pk).delete()
+        self.assertEqual(self.counts(), {(2023, 2): 1})
+
+        Article.objects.bulk_create([
+            Article(title='Bulk one', content='Bulk article body.'),
+            Article(title='Bulk two', content='Bulk article body.', is_published=False),
+        ])
+        self.assertEqual(self.counts(), {self.current: 1, (2023, 2): 1})
+
+    def test_import_counts_published_rows(self) -> None:
+        lines = [
+            '{"title": "Imported one", "content": "Imported article body."}',
+            '{"title": "Imported two", "content": "Imported article body.", "is_published": false}',
+        ]
+        import_articles(lines)
+        self.assertEqual(self.counts(), {self.current: 1})
+
+    def test_rebuild_repairs_drift(self) -> None:
+        self.create()
+        ArchiveMonth.objects.update(count=7)
+        ArchiveMonth.objects.create(year=2001, month=1, count=3)
+        out = StringIO()
+        call_command('rebuild_archive', stdout=out)
+        self.assertEqual(self.counts(), {self.current: 1})
+        self.assertIn('1 months', out.getvalue())
+
+    def test_drifted_count_does_not_block_deletes(self) -> None:
+        article = self.create()
+        ArchiveMonth.objects.update(count=0)
+        article.delete()
+        self.assertFalse(Article.objects.exists())
+
+
+class ArchiveEndpointTests(TestCase):
+    """Year/month buckets and the per-month article listing"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        for year, month, title in [(2024, 1, 'January'), (2024, 1, 'Also January'), (2024, 3, 'March'), (2023, 12, 'December')]:
+            article = Article.objects.create(title=title, content='Archived article body.')
+            Article.objects.filter(pk=article.pk).update(created_at=aware(year, month))
+        Article.objects.create(title='Draft', content='Draft article body.', is_published=False)
+
+    def test_buckets(self) -> None:
+        response = self.client.get(reverse('article-archive'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {'year': 2024, 'count': 3, 'months': [{'month': 3, 'count': 1}, {'month': 1, 'count': 2}]},
+            {'year': 2023, 'count': 1, 'months': [{'month': 12, 'count': 1}]},
+        ])
+
+    @override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+    def test_buckets_do_not_aggregate_articles(self) -> None:
+        # validators, buckets: both read the small summary table
+        with self.assertNumQueries(2):
+            self.client.get(reverse('article-archive'))
+
+    def test_buckets_follow_writes(self) -> None:
+        url = reverse('article-archive')
+        self.client.get(url)
+        Article.objects.get(title='December').delete()
+        self.assertNotIn(2023, [bucket['year'] for bucket in self.client.get(url).json()])
+
+    def test_month_listing(self) -> None:
+        response = self.client.get(reverse('article-archive-month', args=['2024', '01']), {'fields': 'title'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual({item['title'] for item in response.data['results']}, {'January', 'Also January'})
+
+        response = self.client.get(reverse('article-archive-month', args=['2023', '12']))
+        self.assertEqual([item['title'] for item in response.data['results']], ['December'])
+        self.assertEqual(self.client.get(reverse('article-archive-month', args=['2022', '5'])).data['count'], 0)
+
+    def test_invalid_month_is_not_found(self) -> None:
+        self.assertEqual(self.client.get(reverse('article-archive-month', args=['2024', '13'])).status_code, 404)
+        self.assertEqual(self.client.get('/api/articles/archive/2024/0/').status_code, 404)
+
+    def test_month_range_uses_created_at_index(self) -> None:
+        start, end = aware(2024, 1, 1), aware(2024, 2, 1)
+        queryset = Article.objects.published().filter(created_at__gte=start, created_at__lt=end)
+        plan = queryset.order_by('-created_at').explain()
+        if connection.vendor == 'sqlite':
+            self.assertIn('blog_article_published_idx', plan)
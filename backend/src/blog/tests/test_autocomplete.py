@@ -0,0 +1,104 @@
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.autocomplete import TagAutocomplete, TagIndex, index_keys, tag_autocomplete
+from blog.importer import import_articles
+from blog.models import Article, Tag
+
+
+class TagIndexTests(TestCase):
+    """Prefix lookups over the sorted word index"""
+
+    def setUp(self) -> None:
+        self.index = TagIndex(
+            [(1, 'python', 5), (2, 'pytest', 9), (3, 'web-development', 2), (4, 'devops', 2), (5, 'rust', 0)],
+            memo_span=2,
+        )
+
+    def test_keys_start_at_each_word(self) -> None:
+        self.assertEqual(index_keys('web-development'), ['web-development', 'development'])
+        self.assertEqual(index_keys('django rest framework'), ['django rest framework', 'rest framework', 'framework'])
+
+    def test_prefix_ranked_by_usage_then_name(self) -> None:
+        self.assertEqual([pk for pk, _, _ in self.index.search('py', 10, 50)], [2, 1])
+        self.assertEqual([pk for pk, _, _ in self.index.search('dev', 10, 50)], [4, 3])
+        self.assertEqual(self.index.search('PYTH', 10, 50), [(1, 'python', 5)])
+        self.assertEqual(self.index.search('go', 10, 50), [])
+        self.assertEqual([pk for pk, _, _ in self.index.search('', 2, 50)], [2, 1])
+
+    def test_rename_and_remove(self) -> None:
+        self.index.search('py', 10, 50)
+        self.index.add(1, 'cpython')
+        self.assertEqual([pk for pk, _, _ in self.index.search('py', 10, 50)], [2])
+        self.assertEqual(self.index.search('cpy', 10, 50), [(1, 'cpython', 5)])
+        self.index.remove(2)
+        self.assertEqual(self.index.search('py', 10, 50), [])
+        self.assertEqual(len(self.index), 4)
+
+
+class TagAutocompleteTests(TestCase):
+    """Lazy loading, signal updates and convergence between workers"""
+
+    def setUp(self) -> None:
+        caches['default'].clear()
+        tag_autocomplete.clear()
+        self.client = APIClient()
+        self.python, self.pytest, self.django = (
+            Tag.objects.create(name=name) for name in ('python', 'pytest', 'django')
+        )
+        for title, tags in [('First', [self.pytest]), ('Second', [self.pytest, self.python])]:
+            Article.objects.create(title=title, content='Tagged article body.').tags.set(tags)
+        Article.objects.create(title='Draft', content='Draft article body.', is_published=False).tags.add(
+            self.python, self.django
+        )
+
+    def names(self, prefix: str, **params) -> list:
+        response = self.client.get(reverse('tag-autocomplete'), {'q': prefix, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['name'] for item in response.json()]
+
+    def test_endpoint_ranks_by_published_usage(self) -> None:
+        response = self.client.get(reverse('tag-autocomplete'), {'q': 'py'})
+        self.assertEqual(response.json(), [
+            {'id': self.pytest.pk, 'name': 'pytest', 'articles_count': 2},
+            {'id': self.python.pk, 'name': 'python', 'articles_count': 1},
+        ])
+        self.assertEqual(self.names('', limit=1), ['pytest'])
+        self.assertEqual(self.client.get(reverse('tag-autocomplete'), {'limit': 'all'}).status_code, 400)
+
+    def test_lookups_after_load_skip_the_database(self) -> None:
+        tag_autocomplete.search('py')
+        with self.assertNumQueries(0):
+            tag_autocomplete.search('dj')
+
+    def test_tag_writes_update_after_commit(self) -> None:
+        self.names('py')
+        with self.captureOnCommitCallbacks(execute=True):
+            tag = Tag.objects.create(name='pyramid')
+        self.assertIn('pyramid', self.names('pyr'))
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.name = 'flask'
+            tag.save()
+        self.assertEqual(self.names('pyr'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.delete()
+        self.assertEqual(self.names('fla'), [])
+
+    def test_other_workers_reload_on_version_change(self) -> None:
+        tag_autocomplete.search('dj')
+        other = TagAutocomplete()
+        self.assertEqual([name for _, name, _ in other.search('dj')], ['django'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name='djangorestframework')
+        # Patched in place here, reloaded there
+        with self.assertNumQueries(0):
+            tag_autocomplete.search('dj')
+        self.assertEqual(len(other.search('dj')), 2)
+
+    def test_bulk_created_tags_invalidate(self) -> None:
+        self.names('go')
+        with self.captureOnCommitCallbacks(execute=True):
+            import_articles(['{"title": "Imported", "content": "Imported article body.", "tags": ["golang"]}'])
+        self.assertEqual(self.names('go'), ['golang'])
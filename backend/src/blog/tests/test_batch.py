@@ -0,0 +1,74 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.cache import response_cache
+from blog.models import Article, Comment, Tag
+from blog.trending import view_counter
+
+
+class BatchTests(TestCase):
+    """Sub-requests run in-process and come back in order"""
+
+    def setUp(self) -> None:
+        response_cache.clear()
+        view_counter.clear()
+        self.client = APIClient()
+        self.tag = Tag.objects.create(name='python')
+        self.article = Article.objects.create(title='Batched', content='Batched article body.')
+        self.article.tags.add(self.tag)
+        Comment.objects.create(article=self.article, author_name='Reader', content='Batched comment.')
+
+    def batch(self, *paths: str, **options) -> list:
+        payload = {'requests': [{'path': path} for path in paths], **options}
+        response = self.client.post(reverse('batch'), payload, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['responses']
+
+    def test_bodies_match_separate_requests(self) -> None:
+        paths = [
+            reverse('article-list'),
+            reverse('tag-list'),
+            reverse('article-comments', args=[self.article.pk]) + '?page_size=5',
+            reverse('article-detail', args=[self.article.pk]),
+        ]
+        responses = self.batch(*paths)
+        self.assertEqual([entry['status'] for entry in responses], [200] * 4)
+        for path, entry in zip(paths, responses):
+            with self.subTest(path=path):
+                self.assertEqual(entry['body'], self.client.get(path).json())
+        self.assertIn('ETag', responses[0]['headers'])
+
+    def test_sub_requests_keep_their_own_status(self) -> None:
+        responses = self.batch(
+            reverse('article-detail', args=[999]), '/api/nowhere/', reverse('batch'),
+            reverse('article-export'),
+        )
+        self.assertEqual([entry['status'] for entry in responses], [404, 404, 400, 400])
+
+    def test_conditional_headers_per_sub_request(self) -> None:
+        url = reverse('article-detail', args=[self.article.pk])
+        etag = self.client.get(url)['ETag']
+        payload = {'requests': [{'path': url, 'headers': {'If-None-Match': etag}}, {'path': url}]}
+        responses = self.client.post(reverse('batch'), payload, format='json').json()['responses']
+        self.assertEqual([entry['status'] for entry in responses], [304, 200])
+        self.assertIsNone(responses[0]['body'])
+
+    def test_consistent_batch_runs_in_one_transaction(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            self.batch(reverse('article-list'), reverse('tag-list'), consistent=True)
+        savepoints = [q['sql'] for q in queries if q['sql'].startswith('SAVEPOINT')]
+        self.assertEqual(len(savepoints), 1)
+
+    @override_settings(BLOG_BATCH={'MAX_REQUESTS': 2})
+    def test_limits_and_validation(self) -> None:
+        url = reverse('batch')
+        too_many = {'requests': [{'path': reverse('tag-list')}] * 3}
+        self.assertEqual(self.client.post(url, too_many, format='json').status_code, 400)
+        self.assertEqual(self.client.post(url, {'requests': []}, format='json').status_code, 400)
+        outside = {'requests': [{'path': '/admin/'}]}
+        self.assertEqual(self.client.post(url, outside, format='json').status_code, 400)
+        write = {'requests': [{'path': reverse('tag-list'), 'method': 'POST'}]}
+        self.assertEqual(self.client.post(url, write, format='json').status_code, 400)
@@ -0,0 +1,208 @@
+import shutil
+import tempfile
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.cache import LRUCache, response_cache
+from blog.models import Article, Comment, Tag
+from blog.trending import view_counter
+
+
+class ResponseCacheTests(TestCase):
+    """Cached read endpoints with namespace-versioned invalidation"""
+
+    def setUp(self) -> None:
+        response_cache.clear()
+        response_cache.stats.reset()
+        # Views buffered by earlier tests must not flush inside a query budget
+        view_counter.clear()
+        self.client = APIClient()
+        self.tag = Tag.objects.create(name='python')
+        self.first = Article.objects.create(title='First article', content='First article body.')
+        self.second = Article.objects.create(title='Second article', content='Second article body.')
+        self.first.tags.add(self.tag)
+
+    def get(self, url: str, params: dict = None):
+        return self.client.get(url, params or {})
+
+    def assertCached(self, url: str, params: dict = None) -> None:
+        with self.assertNumQueries(0):
+            response = self.get(url, params)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def assertNotCached(self, url: str, params: dict = None) -> None:
+        self.assertEqual(self.get(url, params)['X-Cache'], 'MISS')
+
+    def test_second_read_is_served_from_cache(self) -> None:
+        url = reverse('article-list')
+        first = self.get(url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.get(url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(response_cache.stats.snapshot()['hits'], 1)
+
+    def test_keys_vary_by_query_params(self) -> None:
+        url = reverse('article-list')
+        self.get(url, {'page_size': 1})
+        self.assertNotCached(url, {'page_size': 2})
+        self.assertNotCached(url, {'page_size': 1, 'ordering': 'title'})
+        self.assertCached(url, {'page_size': 1})
+
+    def test_comment_only_evicts_its_article(self) -> None:
+        first_url = reverse('article-detail', args=[self.first.pk])
+        second_url = reverse('article-detail', args=[self.second.pk])
+        comments_url = reverse('article-comments', args=[self.first.pk])
+        for url in (first_url, second_url, comments_url):
+            self.get(url)
+
+        Comment.objects.create(article=self.first, content='A brand new comment')
+
+        self.assertCached(second_url)
+        response = self.get(first_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['comments_count'], 1)
+        self.assertEqual(len(self.get(comments_url).data['results']), 1)
+
+    def test_comment_evicts_only_list_pages_containing_its_article(self) -> None:
+        url = reverse('article-list')
+        # Newest first: page 1 holds the second article, page 2 the first
+        self.get(url, {'page_size': 1, 'page': 1})
+        self.get(url, {'page_size': 1, 'page': 2})
+
+        Comment.objects.create(article=self.first, content='A brand new comment')
+
+        self.assertCached(url, {'page_size': 1, 'page': 1})
+        response = self.get(url, {'page_size': 1, 'page': 2})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['comments_count'], 1)
+
+    def test_responses_cached_before_a_write_commits_are_evicted(self) -> None:
+        url = reverse('article-detail', args=[self.first.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.title = 'Renamed first article'
+            self.first.save()
+            # Stored under the tokens the save bumped, while the write is still open
+            self.assertNotCached(url)
+            self.assertCached(url)
+        self.assertNotCached(url)
+
+    def test_comments_off_the_page_evict_the_most_discussed_list(self) -> None:
+        url = reverse('article-list')
+        params = {'ordering': '-approved_comments_count', 'page_size': 1}
+        Comment.objects.create(article=self.first, content='Only comment so far')
+        self.assertEqual([a['id'] for a in self.get(url, params).data['results']], [self.first.pk])
+        self.assertCached(url, params)
+
+        for i in range(2):
+            Comment.objects.create(article=self.second, content=f'Comment number {i}')
+
+        response = self.get(url, params)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([a['id'] for a in response.data['results']], [self.second.pk])
+
+    def test_new_article_evicts_lists(self) -> None:
+        url = reverse('article-list')
+        self.get(url)
+        Article.objects.create(title='Third article', content='Third article body.')
+        response = self.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 3)
+
+    def test_tag_rename_evicts_articles_rendering_it(self) -> None:
+        first_url = reverse('article-detail', args=[self.first.pk])
+        second_url = reverse('article-detail', args=[self.second.pk])
+        self.get(first_url)
+        self.get(second_url)
+
+        self.tag.name = 'python3'
+        self.tag.save()
+
+        self.assertCached(second_url)
+        response = self.get(first_url)
+        self.assertEqual(response.data['tags'][0]['name'], 'python3')
+
+    def test_tag_membership_changes_evict(self) -> None:
+        tag_articles_url = reverse('tag-articles', args=[self.tag.pk])
+        second_url = reverse('article-detail', args=[self.second.pk])
+        self.get(tag_articles_url)
+        self.get(second_url)
+
+        self.tag.articles.add(self.second)
+
+        self.assertEqual(len(self.get(tag_articles_url).data), 2)
+        self.assertEqual(len(self.get(second_url).data['tags']), 1)
+
+    def test_tag_list_is_cached_and_invalidated(self) -> None:
+        url = reverse('tag-list')
+        self.get(url)
+        self.assertCached(url)
+        Tag.objects.create(name='django')
+        self.assertEqual(self.get(url).data['count'], 2)
+
+    def test_errors_are_not_cached(self) -> None:
+        url = reverse('article-detail', args=[999])
+        self.assertEqual(self.get(url).status_code, 404)
+        self.assertEqual(self.get(url).status_code, 404)
+        self.assertEqual(response_cache.stats.snapshot()['stores'], 0)
+        self.assertEqual(response_cache.stats.snapshot()['misses'], 2)
+
+    @override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+    def test_disabled_cache_passes_through(self) -> None:
+        url = reverse('article-list')
+        self.get(url)
+        self.assertNotIn('X-Cache', self.get(url))
+
+
+class FileBasedResponseCacheTests(TestCase):
+    """The cache works unchanged on the file-based backend"""
+
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        settings_override = override_settings(
+            CACHES={
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'files': {
+                    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': self.cache_dir,
+                    'OPTIONS': {'MAX_ENTRIES': 100},
+                },
+            },
+            BLOG_RESPONSE_CACHE={'ALIAS': 'files', 'LOCAL_MAX_ENTRIES': 1},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        response_cache.local.clear()
+        view_counter.clear()
+        self.client = APIClient()
+        self.article = Article.objects.create(title='File cached', content='Stored on disk.')
+
+    def test_hit_and_invalidation(self) -> None:
+        url = reverse('article-detail', args=[self.article.pk])
+        self.client.get(url)
+        response_cache.local.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        Comment.objects.create(article=self.article, content='Invalidate me')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertTrue(caches['files'].get_many([response_cache.version_key(f'article:{self.article.pk}')]))
+
+
+class LRUCacheTests(TestCase):
+    """Per-process LRU tier in front of the Django cache"""
+
+    def test_evicts_least_recently_used(self) -> None:
+        lru = LRUCache(max_entries=2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('a'), 1)
+        self.assertEqual(len(lru), 2)
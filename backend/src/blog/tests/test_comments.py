@@ -0,0 +1,68 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import Article, Comment
+from blog.pagination import CommentPagination
+from blog.serializers import ArticleDetailSerializer
+
+
+# Exercises the database path, so responses must not come from the cache
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class BoundedCommentsTests(TestCase):
+    """Article detail embeds a bounded slice of comments; the rest are paginated"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.article = Article.objects.create(title='Popular article', content='Lots of comments.')
+
+    def add_comments(self, count: int) -> list:
+        comments = Comment.objects.bulk_create(
+            Comment(article=self.article, content=f'Comment number {i}') for i in range(count)
+        )
+        return [comment.pk for comment in comments]
+
+    def test_detail_embeds_first_comments_and_links_the_rest(self) -> None:
+        ids = self.add_comments(25)
+        response = self.client.get(reverse('article-detail', args=[self.article.pk]))
+        limit = ArticleDetailSerializer.comments_limit
+        self.assertEqual([c['id'] for c in response.data['comments']], ids[:limit])
+        self.assertEqual(response.data['comments_count'], 25)
+
+        seen = [c['id'] for c in response.data['comments']]
+        url = response.data['comments_next']
+        while url:
+            page = self.client.get(url)
+            self.assertEqual(page.status_code, 200)
+            seen.extend(c['id'] for c in page.data['results'])
+            url = page.data['next']
+        self.assertEqual(seen, ids)
+
+    def test_no_next_link_when_all_comments_fit(self) -> None:
+        self.add_comments(ArticleDetailSerializer.comments_limit)
+        response = self.client.get(reverse('article-detail', args=[self.article.pk]))
+        self.assertEqual(len(response.data['comments']), ArticleDetailSerializer.comments_limit)
+        self.assertIsNone(response.data['comments_next'])
+
+    def test_comments_action_is_always_paginated_and_capped(self) -> None:
+        self.add_comments(CommentPagination.max_page_size + 5)
+        url = reverse('article-comments', args=[self.article.pk])
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['results']), CommentPagination.page_size)
+
+        response = self.client.get(url, {'page_size': 10_000})
+        self.assertEqual(len(response.data['results']), CommentPagination.max_page_size)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_hidden_comments_are_skipped(self) -> None:
+        self.add_comments(3)
+        Comment.objects.create(article=self.article, content='Hidden comment', is_approved=False)
+        response = self.client.get(reverse('article-comments', args=[self.article.pk]))
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_unknown_or_unpublished_article_is_not_found(self) -> None:
+        self.assertEqual(self.client.get(reverse('article-comments', args=[999])).status_code, 404)
+        self.article.is_published = False
+        self.article.save()
+        url = reverse('article-comments', args=[self.article.pk])
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,138 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.cache import response_cache
+from blog.models import Article, Comment, Tag
+from blog.trending import view_counter
+
+
+# Exercises the database path, so responses must not come from the cache
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class ConditionalGetTests(TestCase):
+    """ETag / Last-Modified validators and 304 responses on read endpoints"""
+
+    def setUp(self) -> None:
+        # Views buffered by earlier tests must not flush inside a query budget
+        view_counter.clear()
+        self.client = APIClient()
+        self.tag = Tag.objects.create(name='python')
+        self.article = Article.objects.create(title='Conditional', content='Validators everywhere.')
+        self.other = Article.objects.create(title='Other', content='Untouched article.')
+        self.article.tags.add(self.tag)
+        Comment.objects.create(article=self.article, content='First comment')
+
+    def assertNotModified(self, url: str, etag: str) -> None:
+        # Only the validator query runs: no page, prefetch or serializer work
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def assertModified(self, url: str, etag: str) -> None:
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_read_endpoints_send_validators(self) -> None:
+        urls = [
+            reverse('article-list'),
+            reverse('article-detail', args=[self.article.pk]),
+            reverse('article-comments', args=[self.article.pk]),
+            reverse('tag-list'),
+            reverse('tag-detail', args=[self.tag.pk]),
+            reverse('tag-articles', args=[self.tag.pk]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('ETag', response)
+                self.assertIn('Last-Modified', response)
+                self.assertIn('must-revalidate', response['Cache-Control'])
+                self.assertNotModified(url, response['ETag'])
+
+    def test_etag_varies_by_query_params(self) -> None:
+        url = reverse('article-list')
+        etag = self.client.get(url, {'page_size': 1})['ETag']
+        self.assertNotEqual(self.client.get(url, {'page_size': 2})['ETag'], etag)
+
+    def test_new_comment_changes_article_validators(self) -> None:
+        detail_url = reverse('article-detail', args=[self.article.pk])
+        other_url = reverse('article-detail', args=[self.other.pk])
+        detail_etag = self.client.get(detail_url)['ETag']
+        other_etag = self.client.get(other_url)['ETag']
+        list_etag = self.client.get(reverse('article-list'))['ETag']
+
+        Comment.objects.create(article=self.article, content='Second comment')
+
+        self.assertModified(detail_url, detail_etag)
+        self.assertModified(reverse('article-list'), list_etag)
+        self.assertNotModified(other_url, other_etag)
+
+    def test_comment_approval_and_deletion_change_validators(self) -> None:
+        url = reverse('article-comments', args=[self.article.pk])
+        hidden = Comment.objects.create(article=self.article, content='Hidden', is_approved=False)
+        etag = self.client.get(url)['ETag']
+        hidden.is_approved = True
+        hidden.save()
+        self.assertModified(url, etag)
+
+        etag = self.client.get(url)['ETag']
+        hidden.delete()
+        self.assertModified(url, etag)
+
+    def test_tag_changes_reach_article_validators(self) -> None:
+        url = reverse('article-detail', args=[self.article.pk])
+        etag = self.client.get(url)['ETag']
+        self.tag.name = 'python3'
+        self.tag.save()
+        self.assertModified(url, etag)
+
+        other_url = reverse('article-detail', args=[self.other.pk])
+        etag = self.client.get(other_url)['ETag']
+        self.tag.articles.add(self.other)
+        self.assertModified(other_url, etag)
+
+    def test_tag_deletion_changes_article_validators(self) -> None:
+        # A newer tag keeps MAX(tag.updated_at) where it was
+        self.article.tags.add(Tag.objects.create(name='django'))
+        urls = [reverse('article-list'), reverse('article-detail', args=[self.article.pk])]
+        etags = [self.client.get(url)['ETag'] for url in urls]
+        self.assertEqual(self.client.delete(reverse('tag-detail', args=[self.tag.pk])).status_code, 204)
+        for url, etag in zip(urls, etags):
+            with self.subTest(url=url):
+                self.assertModified(url, etag)
+        self.assertEqual([tag['name'] for tag in self.client.get(urls[1]).data['tags']], ['django'])
+
+    def test_if_modified_since(self) -> None:
+        url = reverse('tag-list')
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_objects_still_404(self) -> None:
+        for url in (reverse('article-detail', args=[999]), reverse('article-detail', args=['abc'])):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+            self.assertEqual(response.status_code, 404)
+
+    @override_settings(BLOG_CONDITIONAL_GET={'ENABLED': False})
+    def test_disabled_sends_no_validators(self) -> None:
+        response = self.client.get(reverse('article-list'))
+        self.assertNotIn('ETag', response)
+
+
+class CachedConditionalGetTests(TestCase):
+    """Cache hits keep their validators and can answer 304 without queries"""
+
+    def test_cache_hit_answers_304(self) -> None:
+        response_cache.clear()
+        view_counter.clear()
+        client = APIClient()
+        article = Article.objects.create(title='Cached', content='Cached body.')
+        url = reverse('article-detail', args=[article.pk])
+        etag = client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['X-Cache'], 'HIT')
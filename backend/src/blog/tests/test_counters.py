@@ -0,0 +1,114 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import Article, Comment
+
+
+class ApprovedCommentCounterTests(TestCase):
+    """``Article.approved_comments_count`` follows every kind of comment write"""
+
+    def setUp(self) -> None:
+        self.article = Article.objects.create(title='Counted', content='Counted article body.')
+        self.other = Article.objects.create(title='Other', content='Other article body.')
+
+    def assertCounts(self, article: int, other: int) -> None:
+        self.article.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual(
+            (self.article.approved_comments_count, self.other.approved_comments_count),
+            (article, other),
+        )
+
+    def comment(self, article: Article = None, **kwargs) -> Comment:
+        return Comment.objects.create(article=article or self.article, content='A comment', **kwargs)
+
+    def test_create_and_delete(self) -> None:
+        approved = self.comment()
+        hidden = self.comment(is_approved=False)
+        self.assertCounts(1, 0)
+        hidden.delete()
+        self.assertCounts(1, 0)
+        approved.delete()
+        self.assertCounts(0, 0)
+
+    def test_approval_toggles_and_moves(self) -> None:
+        comment = self.comment(is_approved=False)
+        comment.is_approved = True
+        comment.save()
+        self.assertCounts(1, 0)
+        comment.save()
+        self.assertCounts(1, 0)
+
+        comment.article = self.other
+        comment.save()
+        self.assertCounts(0, 1)
+
+        comment.is_approved = False
+        comment.save(update_fields=['is_approved'])
+        self.assertCounts(0, 0)
+
+    def test_bulk_operations(self) -> None:
+        Comment.objects.bulk_create([
+            Comment(article=self.article, content='Bulk one'),
+            Comment(article=self.article, content='Bulk two'),
+            Comment(article=self.other, content='Bulk three'),
+            Comment(article=self.other, content='Bulk hidden', is_approved=False),
+        ])
+        self.assertCounts(2, 1)
+
+        Comment.objects.filter(article=self.other).update(is_approved=True)
+        self.assertCounts(2, 2)
+        Comment.objects.filter(article=self.article).update(is_approved=False)
+        self.assertCounts(0, 2)
+        Comment.objects.filter(article=self.article).update(article=self.other)
+        self.assertCounts(0, 2)
+
+        Comment.objects.filter(article=self.other, content='Bulk three').delete()
+        self.assertCounts(0, 1)
+
+    def test_stale_article_save_keeps_counter(self) -> None:
+        stale = Article.objects.get(pk=self.article.pk)
+        self.comment()
+        stale.title = 'Renamed'
+        stale.save()
+        self.assertCounts(1, 0)
+
+    def test_recount_repairs_drift(self) -> None:
+        self.comment()
+        Article.objects.filter(pk=self.article.pk).update(approved_comments_count=7)
+        out = StringIO()
+        call_command('recount_comments', stdout=out)
+        self.assertIn('on 1 articles', out.getvalue())
+        self.assertCounts(1, 0)
+
+
+# Exercises the database path, so responses must not come from the cache
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class MostDiscussedTests(TestCase):
+    """List endpoints read the stored counter instead of counting comments"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.quiet = Article.objects.create(title='Quiet', content='Nobody comments here.')
+        self.busy = Article.objects.create(title='Busy', content='Everybody comments here.')
+        for _ in range(3):
+            Comment.objects.create(article=self.busy, content='Me too!')
+
+    def test_most_discussed_ordering(self) -> None:
+        response = self.client.get(reverse('article-list'), {'ordering': '-approved_comments_count'})
+        results = response.data['results']
+        self.assertEqual([a['id'] for a in results], [self.busy.id, self.quiet.id])
+        self.assertEqual(results[0]['comments_count'], 3)
+
+    def test_page_query_does_not_touch_comments(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('article-list'), {'fields': 'id,comments_count'})
+        page_sql = queries.captured_queries[-1]['sql']
+        self.assertIn('approved_comments_count', page_sql)
+        self.assertNotIn('blog_comment', page_sql)
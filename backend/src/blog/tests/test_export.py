@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.importer import import_articles
+from blog.models import Article, Comment, Tag
+
+
+class ExportTests(TestCase):
+    """Streaming NDJSON / CSV export of articles and comments"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.python = Tag.objects.create(name='python')
+        self.django = Tag.objects.create(name='django')
+        self.article = Article.objects.create(title='Exported article', content='Exported body text.')
+        self.article.tags.add(self.python, self.django)
+        Article.objects.create(title='Draft article', content='Not published yet.', is_published=False)
+        Comment.objects.create(article=self.article, content='Visible comment', author_name='Ann')
+        Comment.objects.create(article=self.article, content='Hidden comment', is_approved=False)
+
+    def body(self, response) -> str:
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_articles_ndjson(self) -> None:
+        response = self.client.get(reverse('article-export'))
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['title'], 'Exported article')
+        self.assertEqual(rows[0]['tags'], ['django', 'python'])
+        detail = self.client.get(reverse('article-detail', args=[self.article.pk])).data
+        self.assertEqual(rows[0]['created_at'], detail['created_at'])
+
+    def test_articles_csv_round_trips_through_import(self) -> None:
+        response = self.client.get(reverse('article-export'), {'output': 'csv'})
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        body = self.body(response)
+        record = next(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(record['tags'], 'django,python')
+
+        result = import_articles(io.StringIO(body), 'csv')
+        self.assertEqual((result.created, result.errors), (1, []))
+        copy = Article.objects.exclude(pk=self.article.pk).get(title='Exported article')
+        self.assertEqual(sorted(copy.tags.values_list('name', flat=True)), ['django', 'python'])
+
+    @override_settings(BLOG_EXPORT={'CHUNK_SIZE': 5})
+    def test_queries_grow_per_chunk_not_per_article(self) -> None:
+        for i in range(19):
+            Article.objects.create(title=f'Article {i}', content='Body long enough.').tags.add(self.python)
+        response = self.client.get(reverse('article-export'))
+        # 20 published articles in 4 chunks: the articles query plus one tags query per chunk
+        with self.assertNumQueries(5):
+            lines = self.body(response).splitlines()
+        self.assertEqual(len(lines), 20)
+
+    def test_comments_export(self) -> None:
+        url = reverse('article-comments-export', args=[self.article.pk])
+        rows = [json.loads(line) for line in self.body(self.client.get(url)).splitlines()]
+        self.assertEqual([row['content'] for row in rows], ['Visible comment'])
+        self.assertEqual(rows[0]['article'], self.article.pk)
+
+        draft = Article.objects.get(is_published=False)
+        self.assertEqual(self.client.get(reverse('article-comments-export', args=[draft.pk])).status_code, 404)
+
+    def test_unknown_output_is_rejected(self) -> None:
+        response = self.client.get(reverse('article-export'), {'output': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_management_command(self) -> None:
+        fd, path = tempfile.mkstemp(suffix='.ndjson')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        call_command('export_articles', '--all', '--file', path)
+        with open(path) as stream:
+            self.assertEqual(len(stream.readlines()), 2)
+
+        call_command('export_articles', '--comments', '--output', 'csv', '--file', path)
+        with open(path) as stream:
+            self.assertEqual(len(list(csv.DictReader(stream))), 1)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+
+from blog.models import Article, Comment, Tag
+from blog.views import CommentViewSet
+
+
+# Compares rendered bodies, so responses must not come from the cache
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_CONDITIONAL_GET={'ENABLED': False})
+class FastSerializerTests(TestCase):
+    """``values()`` serializers render byte-for-byte what the model serializers do"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        python = Tag.objects.create(name='python')
+        django = Tag.objects.create(name='django')
+        Tag.objects.create(name='unused')
+        old = timezone.now() - timedelta(days=30)
+        for i in range(12):
+            article = Article.objects.create(title=f'Article {i} – ünïcode', content=f'Body of article {i}. ' * 40)
+            if i % 2:
+                article.tags.add(python, django)
+            elif i % 3:
+                article.tags.add(django)
+            if i < 4:
+                Article.objects.filter(pk=article.pk).update(created_at=old + timedelta(hours=i))
+            Comment.objects.create(article=article, content=f'Approved comment {i}', author_name='Reader')
+            Comment.objects.create(article=article, content='Hidden comment', is_approved=False)
+        cls.article = Article.objects.order_by('pk').last()
+        cls.tag = django
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+
+    def assertSameBody(self, url: str, params: dict = None) -> None:
+        with override_settings(BLOG_FAST_SERIALIZERS={'ENABLED': False}):
+            expected = self.client.get(url, params or {})
+        with override_settings(BLOG_FAST_SERIALIZERS={'ENABLED': True}):
+            actual = self.client.get(url, params or {})
+        self.assertEqual(expected.status_code, 200)
+        self.assertEqual(actual.status_code, 200)
+        self.assertEqual(actual.content, expected.content)
+
+    def test_article_list(self) -> None:
+        url = reverse('article-list')
+        self.assertSameBody(url)
+        self.assertSameBody(url, {'page_size': 100, 'ordering': 'title'})
+        self.assertSameBody(url, {'page': 2})
+        self.assertSameBody(url, {'fields': 'id,content,tags,is_recent'})
+        self.assertSameBody(url, {'omit': 'tags,excerpt'})
+
+    def test_article_list_cursor_pages(self) -> None:
+        url = reverse('article-list')
+        params = {'pagination': 'cursor', 'page_size': 5, 'count': 'true'}
+        self.assertSameBody(url, params)
+        next_url = self.client.get(url, params).data['next']
+        self.assertSameBody(next_url)
+
+    def test_tag_list(self) -> None:
+        self.assertSameBody(reverse('tag-list'))
+        self.assertSameBody(reverse('tag-list'), {'ordering': '-created_at', 'fields': 'id,name'})
+
+    def test_tag_articles(self) -> None:
+        url = reverse('tag-articles', args=[self.tag.pk])
+        self.assertSameBody(url)
+        self.assertSameBody(url, {'pagination': 'cursor', 'page_size': 3})
+
+    def test_comments(self) -> None:
+        self.assertSameBody(reverse('article-comments', args=[self.article.pk]))
+        self.assertSameBody(reverse('article-comments', args=[self.article.pk]), {'omit': 'article'})
+
+    def test_comment_viewset(self) -> None:
+        view = CommentViewSet.as_view({'get': 'list'})
+        bodies = []
+        for enabled in (False, True):
+            with override_settings(BLOG_FAST_SERIALIZERS={'ENABLED': enabled}):
+                request = APIRequestFactory().get('/', {'page_size': 3})
+                response = view(request, article_pk=self.article.pk).render()
+            bodies.append(response.content)
+        self.assertEqual(bodies[0], bodies[1])
+
+    def test_search_results_keep_the_model_path(self) -> None:
+        with override_settings(BLOG_FAST_SERIALIZERS={'ENABLED': True}):
+            response = self.client.get(reverse('article-list'), {'search': 'article'})
+        self.assertIn('search_rank', response.data['results'][0])
+
+    @override_settings(BLOG_FAST_SERIALIZERS={'ENABLED': True})
+    def test_list_query_budget(self) -> None:
+        # count, page, tags
+        with self.assertNumQueries(3):
+            self.client.get(reverse('article-list'), {'page_size': 100})
+        # page only when tags are not rendered
+        with self.assertNumQueries(2):
+            self.client.get(reverse('article-list'), {'fields': 'id,title'})
@@ -0,0 +1,102 @@
+import io
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+from uuid import UUID
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from blog import fastjson
+from blog.fastjson import FastJSONParser, FastJSONRenderer
+from blog.models import Article, Tag
+
+
+class FastJSONRendererTests(TestCase):
+    """orjson rendering matches DRF's stdlib renderer byte for byte"""
+
+    payload = ReturnDict({
+        'id': 1,
+        'title': 'Ünïcode – “quotes”   and   separators',
+        'created_at': datetime(2025, 7, 8, 10, 0, 0, 123456, tzinfo=dt_timezone.utc),
+        'updated_at': datetime(2025, 7, 8, 12, 0, tzinfo=dt_timezone(timedelta(hours=2))),
+        'published_on': date(2025, 7, 8),
+        'naive': datetime(2025, 7, 8, 10, 0),
+        'price': Decimal('12.50'),
+        'rank': -1.5,
+        'label': gettext_lazy('Not found.'),
+        'uuid': UUID('12345678-1234-5678-1234-567812345678'),
+        'flags': [True, False, None],
+        'tags': ReturnList([{'id': 2, 'name': 'python'}], serializer=None),
+        1: 'non-string key',
+    }, serializer=None)
+
+    def test_matches_stdlib_renderer(self) -> None:
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_api_response_matches(self) -> None:
+        article = Article.objects.create(title='Rendered', content='Rendered body text.')
+        article.tags.add(Tag.objects.create(name='python'))
+        with override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}):
+            data = APIClient().get(reverse('article-list')).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_and_none_use_the_stdlib_path(self) -> None:
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render(None), b'')
+        media_type = 'application/json; indent=4'
+        self.assertEqual(
+            renderer.render(self.payload, media_type),
+            JSONRenderer().render(self.payload, media_type),
+        )
+
+    def test_unsupported_values_fall_back(self) -> None:
+        big = {'value': 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(big), JSONRenderer().render(big))
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({'value': object()})
+
+    def test_without_orjson(self) -> None:
+        with mock.patch.object(fastjson, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+
+class FastJSONParserTests(TestCase):
+    """orjson parsing returns what DRF's stdlib parser returns"""
+
+    def parse(self, parser, body: bytes, **context):
+        return parser.parse(io.BytesIO(body), 'application/json', context)
+
+    def test_matches_stdlib_parser(self) -> None:
+        body = '{"title": "Ünïcode", "tags": [{"name": "python"}], "n": 1.5, "ok": true, "x": null}'.encode()
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_invalid_json_is_a_parse_error(self) -> None:
+        for body in (b'{"title": ', b'{"n": NaN}'):
+            with self.assertRaises(ParseError):
+                self.parse(FastJSONParser(), body)
+
+    def test_integers_beyond_64_bits_keep_their_value(self) -> None:
+        big = 2 ** 64 + 1
+        body = f'{{"id": {big}, "n": -{big}, "ok": 9223372036854775807}}'.encode()
+        self.assertEqual(self.parse(FastJSONParser(), body), {'id': big, 'n': -big, 'ok': 2 ** 63 - 1})
+
+    def test_other_encodings_use_the_stdlib_path(self) -> None:
+        body = '{"title": "caf\xe9"}'.encode('latin-1')
+        self.assertEqual(self.parse(FastJSONParser(), body, encoding='latin-1'), {'title': 'café'})
+
+    @skipUnless(fastjson.orjson_available(), 'orjson is not installed')
+    def test_api_accepts_json_bodies(self) -> None:
+        response = APIClient().post(
+            reverse('article-list'),
+            {'title': 'Parsed with orjson', 'content': 'Body text long enough.', 'tags': [{'name': 'python'}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.data['tags'][0]['name'], 'python')
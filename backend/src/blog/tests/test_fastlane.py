@@ -0,0 +1,76 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.cache import response_cache
+from blog.models import Article, Tag
+from blog.trending import view_counter
+
+
+class FastLaneTests(TestCase):
+    """/api/ requests skip the session middleware stack; the admin keeps it"""
+
+    def setUp(self) -> None:
+        response_cache.clear()
+        view_counter.clear()
+        self.staff = User.objects.create_user('admin', is_staff=True)
+        self.article = Article.objects.create(title='Fast lane', content='Fast lane article body.')
+        self.article.tags.add(Tag.objects.create(name='django'))
+        # Middleware is loaded per client, so after the settings
+        self.client = APIClient()
+
+    def full_stack_client(self) -> APIClient:
+        override = override_settings(BLOG_API_FAST_LANE={'ENABLED': False})
+        override.enable()
+        self.addCleanup(override.disable)
+        return APIClient()
+
+    def test_api_responses_skip_admin_middleware(self) -> None:
+        response = self.client.get(reverse('tag-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Frame-Options', response)
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+        # Instrumentation, security and common middleware still run
+        self.assertIn('Server-Timing', response)
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+
+        admin = self.client.get('/admin/login/')
+        self.assertEqual(admin.status_code, 200)
+        self.assertEqual(admin['X-Frame-Options'], 'DENY')
+        self.assertIn('csrftoken', admin.cookies)
+
+    def test_public_reads_do_not_load_the_session(self) -> None:
+        self.client.force_login(self.staff)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('tag-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('sessionid', response.cookies)
+        tables = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('django_session', tables)
+        self.assertNotIn('auth_user', tables)
+
+        response_cache.clear()
+        self.assertEqual(self.full_stack_client().get(reverse('tag-list')).json(), response.json())
+
+    def test_staff_endpoints_see_the_session_user(self) -> None:
+        self.assertEqual(self.client.get(reverse('profile-list')).status_code, 403)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(reverse('profile-list')).status_code, 200)
+
+    def test_session_writes_still_need_a_csrf_token(self) -> None:
+        client = APIClient(enforce_csrf_checks=True)
+        client.force_login(self.staff)
+        payload = {'title': 'Cross-site', 'content': 'Posted with a session cookie only.'}
+        response = client.post(reverse('article-list'), payload, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('CSRF', response.json()['detail'])
+        self.assertFalse(Article.objects.filter(title='Cross-site').exists())
+
+    def test_disabled_lane_uses_the_full_stack(self) -> None:
+        response = self.full_stack_client().get(reverse('tag-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertIn('Server-Timing', response)
@@ -0,0 +1,103 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import EXCERPT_LENGTH, Article, Comment, Tag, make_excerpt
+from blog.trending import view_counter
+
+
+class ExcerptTests(TestCase):
+    """Stored excerpt maintained from the article content"""
+
+    def test_short_content_is_kept_whole(self) -> None:
+        article = Article.objects.create(title='Short one', content='  A short\n\nbody   text.  ')
+        self.assertEqual(article.excerpt, 'A short body text.')
+
+    def test_long_content_is_cut_at_a_word_boundary(self) -> None:
+        excerpt = make_excerpt('word ' * 200)
+        self.assertLessEqual(len(excerpt), EXCERPT_LENGTH)
+        self.assertTrue(excerpt.endswith('word…'))
+
+    def test_excerpt_follows_content_updates(self) -> None:
+        article = Article.objects.create(title='Changing', content='Original body text.')
+        article.content = 'Rewritten body text.'
+        article.save(update_fields=['content'])
+        article.refresh_from_db()
+        self.assertEqual(article.excerpt, 'Rewritten body text.')
+
+
+# Exercises the database path, so responses must not come from the cache
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class SparseFieldsetTests(TestCase):
+    """``?fields=`` / ``?omit=`` on blog serializers"""
+
+    def setUp(self) -> None:
+        # Views buffered by earlier tests must not flush inside a query budget
+        view_counter.clear()
+        self.client = APIClient()
+        self.tag = Tag.objects.create(name='python')
+        self.article = Article.objects.create(title='Sparse article', content='Body ' * 200)
+        self.article.tags.add(self.tag)
+        Comment.objects.create(article=self.article, content='First comment')
+
+    def get_with_sql(self, url: str, params: dict):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        return response, [q['sql'] for q in queries.captured_queries]
+
+    def test_list_returns_excerpt_instead_of_content(self) -> None:
+        response, queries = self.get_with_sql(reverse('article-list'), {})
+        result = response.data['results'][0]
+        self.assertNotIn('content', result)
+        self.assertEqual(result['excerpt'], self.article.excerpt)
+        self.assertFalse(any('"content"' in sql for sql in queries))
+
+    def test_content_is_opt_in(self) -> None:
+        response = self.client.get(reverse('article-list'), {'fields': 'id,content'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'content'})
+
+    def test_fields_narrow_the_sql(self) -> None:
+        response, queries = self.get_with_sql(reverse('article-list'), {'fields': 'id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+        # validators, count and page only: no tags prefetch, no comment count subquery
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn('"excerpt"', queries[2])
+        self.assertNotIn('blog_comment', queries[2])
+
+    def test_omit_drops_fields(self) -> None:
+        response = self.client.get(reverse('article-list'), {'omit': 'tags,comments_count'})
+        result = response.data['results'][0]
+        self.assertNotIn('tags', result)
+        self.assertNotIn('comments_count', result)
+        self.assertIn('title', result)
+
+    def test_nested_serializers_are_not_filtered(self) -> None:
+        response = self.client.get(reverse('article-list'), {'fields': 'id,tags'})
+        self.assertEqual(set(response.data['results'][0]['tags'][0]), {'id', 'name', 'created_at'})
+
+    def test_detail_fields(self) -> None:
+        url = reverse('article-detail', args=[self.article.pk])
+        response, queries = self.get_with_sql(url, {'fields': 'id,title,is_recent'})
+        self.assertEqual(set(response.data), {'id', 'title', 'is_recent'})
+        # validators, article
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('"content"', queries[1])
+
+    def test_tag_and_comment_fields(self) -> None:
+        response = self.client.get(reverse('tag-list'), {'fields': 'name'})
+        self.assertEqual(response.data['results'], [{'name': 'python'}])
+
+        url = reverse('article-comments', args=[self.article.pk])
+        response = self.client.get(url, {'omit': 'article,is_approved'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'content', 'author_name', 'created_at'})
+
+    def test_writes_ignore_fields(self) -> None:
+        url = reverse('tag-list') + '?fields=id'
+        response = self.client.post(url, {}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name', response.data)
+        response = self.client.post(url, {'name': 'Django'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['name'], 'django')
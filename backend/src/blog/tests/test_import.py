@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.autocomplete import tag_autocomplete
+from blog.importer import import_articles
+from blog.models import Article, RelatedArticle, Tag, make_excerpt
+
+
+def ndjson(*rows) -> str:
+    return '\n'.join(row if isinstance(row, str) else json.dumps(row) for row in rows) + '\n'
+
+
+class ArticleImportTests(TestCase):
+    """Bulk import from NDJSON / CSV through the importer, API and command"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        Tag.objects.create(name='python')
+
+    def row(self, i: int, *tags: str) -> dict:
+        return {'title': f'Imported {i}', 'content': f'Imported article body {i}.', 'tags': list(tags)}
+
+    def test_rows_are_imported_with_tags_excerpt_and_index(self) -> None:
+        result = import_articles(
+            ndjson(self.row(1, 'python', 'Django'), self.row(2, 'django')).splitlines(),
+            batch_size=1,
+        )
+        self.assertEqual((result.created, result.errors), (2, []))
+
+        article = Article.objects.get(title='Imported 1')
+        self.assertEqual(article.excerpt, make_excerpt(article.content))
+        self.assertEqual(sorted(article.tags.values_list('name', flat=True)), ['django', 'python'])
+        self.assertEqual(Tag.objects.count(), 2)
+        response = self.client.get(reverse('article-list'), {'search': 'imported'})
+        self.assertEqual(response.data['count'], 2)
+
+    def test_import_refreshes_related_articles_and_autocomplete(self) -> None:
+        caches['default'].clear()
+        tag_autocomplete.clear()
+        self.assertEqual(self.client.get(reverse('tag-autocomplete'), {'q': 'py'}).data[0]['articles_count'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            import_articles(ndjson(self.row(1, 'python'), self.row(2, 'python')).splitlines())
+
+        first, second = Article.objects.order_by('pk')
+        related = RelatedArticle.objects.filter(article=first).values_list('related_id', flat=True)
+        self.assertEqual(list(related), [second.pk])
+        self.assertEqual(self.client.get(reverse('tag-autocomplete'), {'q': 'py'}).data[0]['articles_count'], 2)
+
+    def test_invalid_rows_are_reported_and_skipped(self) -> None:
+        lines = ndjson(
+            self.row(1),
+            '{not json',
+            {'title': 'ab', 'content': 'Too short title here.'},
+            self.row(4, 'rust', 'Rust'),
+            '[1, 2]',
+            self.row(6),
+        ).splitlines()
+        result = import_articles(lines)
+        self.assertEqual(result.created, 2)
+        self.assertEqual([error['row'] for error in result.errors], [2, 3, 4, 5])
+        self.assertIn('title', result.errors[1]['errors'])
+        self.assertIn('tags', result.errors[2]['errors'])
+
+    # The related rebuild scales with the whole blog, not with the imported rows
+    @override_settings(BLOG_RELATED={'INCREMENTAL': False})
+    def test_query_count_does_not_grow_with_rows(self) -> None:
+        def queries_for(count: int) -> int:
+            rows = [self.row(i, 'python') for i in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                import_articles(ndjson(*rows).splitlines(), batch_size=1000)
+            return len(queries)
+
+        self.assertEqual(queries_for(5), queries_for(50))
+
+    def test_dry_run_writes_nothing(self) -> None:
+        result = import_articles(ndjson(self.row(1)).splitlines(), dry_run=True)
+        self.assertEqual(result.created, 1)
+        self.assertFalse(Article.objects.exists())
+
+    def test_bulk_endpoint_accepts_ndjson(self) -> None:
+        body = ndjson(self.row(1, 'python'), {'title': 'Bad'})
+        response = self.client.post(
+            reverse('article-bulk'), data=body, content_type='application/x-ndjson'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+
+    def test_bulk_endpoint_accepts_csv_and_json(self) -> None:
+        body = 'title,content,tags,is_published\n"CSV article","Body from a CSV file.","python,csv",false\n'
+        response = self.client.post(reverse('article-bulk'), data=body, content_type='text/csv')
+        self.assertEqual(response.status_code, 201)
+        article = Article.objects.get(title='CSV article')
+        self.assertFalse(article.is_published)
+        self.assertEqual(sorted(article.tags.values_list('name', flat=True)), ['csv', 'python'])
+
+        response = self.client.post(reverse('article-bulk'), [self.row(2)], format='json')
+        self.assertEqual(response.data['created'], 1)
+
+    def test_bulk_endpoint_reports_rows_that_are_not_objects(self) -> None:
+        response = self.client.post(reverse('article-bulk'), [1, self.row(2)], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'], [{'row': 1, 'errors': {'non_field_errors': ['Expected a JSON object.']}}])
+
+    def test_bulk_endpoint_rejects_all_invalid(self) -> None:
+        response = self.client.post(reverse('article-bulk'), [{'title': 'x'}], format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse('article-bulk'), {'title': 'x'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_management_command(self) -> None:
+        fd, path = tempfile.mkstemp(suffix='.ndjson')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w') as stream:
+            stream.write(ndjson(self.row(1, 'python'), self.row(2)))
+        out, err = StringIO(), StringIO()
+        call_command('import_articles', path, '--batch-size', '1', stdout=out, stderr=err)
+        self.assertIn('Imported 2 articles', out.getvalue())
+        self.assertEqual(Article.objects.count(), 2)
@@ -0,0 +1,112 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.cache import response_cache
+from blog.metrics import Registry, collect, merge, registry, render, write_state
+from blog.models import Article, Tag
+from blog.trending import view_counter
+
+
+def sample(text: str, line: str) -> float:
+    """Value of the exposition line starting with ``line``"""
+    for row in text.splitlines():
+        if row.startswith(line + ' '):
+            return float(row.rsplit(' ', 1)[1])
+    raise AssertionError(f'{line} not in metrics')
+
+
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class InstrumentationTests(TestCase):
+    """Per-request phases reach the Server-Timing header and the histograms"""
+
+    def setUp(self) -> None:
+        response_cache.clear()
+        view_counter.clear()
+        registry.clear()
+        self.client = APIClient()
+        self.article = Article.objects.create(title='Timed', content='Timed article body.')
+        self.article.tags.add(Tag.objects.create(name='python'))
+
+    def test_server_timing_header(self) -> None:
+        response = self.client.get(reverse('article-list'))
+        phases = dict(part.split(';', 1)[0:2] for part in response['Server-Timing'].split(', '))
+        self.assertEqual(set(phases), {'db', 'serialize', 'render', 'total'})
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="\d+ queries"')
+
+    @override_settings(BLOG_METRICS={'SERVER_TIMING': False})
+    def test_header_can_be_turned_off(self) -> None:
+        self.assertFalse(self.client.get(reverse('article-list')).has_header('Server-Timing'))
+
+    @override_settings(DEBUG=True)
+    def test_metrics_by_route(self) -> None:
+        self.client.get(reverse('article-list'))
+        self.client.get(reverse('article-list'))
+        self.client.get(reverse('article-detail', args=[999]))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        labels = '{method="GET",route="article-list"'
+        self.assertEqual(sample(text, f'blog_http_requests_total{labels},status="200"}}'), 2)
+        self.assertEqual(sample(text, 'blog_http_requests_total{method="GET",route="article-detail",status="404"}'), 1)
+        self.assertEqual(sample(text, f'blog_http_request_duration_seconds_count{labels}}}'), 2)
+        self.assertEqual(sample(text, f'blog_http_request_duration_seconds_bucket{labels},le="+Inf"}}'), 2)
+        self.assertGreater(sample(text, f'blog_db_queries_sum{labels}}}'), 0)
+        self.assertGreater(sample(text, f'blog_http_response_size_bytes_sum{labels}}}'), 0)
+        self.assertIn('# TYPE blog_render_duration_seconds histogram', text)
+
+    @override_settings(BLOG_METRICS={'TOKEN': 'secret'})
+    def test_token(self) -> None:
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    def test_hidden_without_a_token_outside_debug(self) -> None:
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+    @override_settings(BLOG_METRICS={'ENABLED': False})
+    def test_disabled(self) -> None:
+        response = self.client.get(reverse('article-list'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+        self.assertEqual(registry.state(), [])
+
+
+class MergeTests(TestCase):
+    """Worker totals add up into one exposition"""
+
+    def setUp(self) -> None:
+        registry.clear()
+
+    def tearDown(self) -> None:
+        registry.clear()
+
+    def worker(self, *durations: float) -> Registry:
+        worker = Registry()
+        for duration in durations:
+            timings = {'total': duration, 'db': 0.0, 'serialize': 0.0, 'render': 0.0}
+            worker.record('tag-list', 'GET', 200, timings, 1, 100)
+        return worker
+
+    def test_merging_adds_buckets(self) -> None:
+        text = render(merge([self.worker(0.002, 0.2).state(), self.worker(0.002).state()]))
+        labels = '{method="GET",route="tag-list"'
+        self.assertEqual(sample(text, f'blog_http_request_duration_seconds_bucket{labels},le="0.0025"}}'), 2)
+        self.assertEqual(sample(text, f'blog_http_request_duration_seconds_bucket{labels},le="0.25"}}'), 3)
+        self.assertEqual(sample(text, f'blog_http_request_duration_seconds_count{labels}}}'), 3)
+        self.assertEqual(sample(text, f'blog_http_requests_total{labels},status="200"}}'), 3)
+
+    def test_shared_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as directory, override_settings(BLOG_METRICS={'DIRECTORY': directory}):
+            other = self.worker(0.002, 0.002)
+            # Another process's file
+            write_state(Path(directory) / '1.json', other.state())
+            registry.record('tag-list', 'GET', 200, {'total': 0.1, 'db': 0.0, 'serialize': 0.0, 'render': 0.0}, 1, 10)
+            text = render(collect())
+        self.assertEqual(sample(text, 'blog_http_request_duration_seconds_count{method="GET",route="tag-list"}'), 3)
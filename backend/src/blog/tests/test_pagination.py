@@ -0,0 +1,164 @@
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlsplit
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+
+from blog.models import Article, Comment, Tag
+from blog.views import CommentViewSet
+
+
+class KeysetPaginationTests(TestCase):
+    """Opt-in cursor pagination keyed on (created_at, id)"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.tag = Tag.objects.create(name='python')
+        now = timezone.now()
+        for i in range(25):
+            article = Article.objects.create(title=f'Article {i}', content='Article content here.')
+            article.tags.add(self.tag)
+            # Pairs of articles share a timestamp to exercise the id tie-breaker
+            Article.objects.filter(pk=article.pk).update(created_at=now - timedelta(minutes=i // 2))
+
+    def walk(self, url: str, params: dict) -> list:
+        seen = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen.extend(a['id'] for a in response.data['results'])
+            if not response.data['next']:
+                return seen
+            response = self.client.get(response.data['next'])
+
+    def test_walks_all_articles_in_keyset_order(self) -> None:
+        seen = self.walk(reverse('article-list'), {'pagination': 'cursor', 'page_size': 4})
+        expected = list(
+            Article.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_no_count_unless_requested(self) -> None:
+        url = reverse('article-list')
+        response = self.client.get(url, {'pagination': 'cursor'})
+        self.assertNotIn('count', response.data)
+        self.assertIsNone(response.data['previous'])
+
+        response = self.client.get(url, {'pagination': 'cursor', 'count': 'true'})
+        self.assertEqual(response.data['count'], 25)
+
+    def test_deep_pages_use_constant_queries(self) -> None:
+        url = reverse('article-list')
+        response = self.client.get(url, {'pagination': 'cursor', 'page_size': 2})
+        for _ in range(8):
+            response = self.client.get(response.data['next'])
+        # validators, page, tags prefetch
+        with self.assertNumQueries(3):
+            self.client.get(response.data['next'])
+
+    def test_inserts_do_not_shift_later_pages(self) -> None:
+        url = reverse('article-list')
+        first = self.client.get(url, {'pagination': 'cursor', 'page_size': 5})
+        Article.objects.create(title='Fresh article', content='Published after page one.')
+        second = self.client.get(first.data['next'])
+
+        first_ids = [a['id'] for a in first.data['results']]
+        second_ids = [a['id'] for a in second.data['results']]
+        self.assertFalse(set(first_ids) & set(second_ids))
+        expected = list(
+            Article.objects.exclude(title='Fresh article')
+            .order_by('-created_at', '-id').values_list('id', flat=True)[5:10]
+        )
+        self.assertEqual(second_ids, expected)
+
+    def test_previous_link_returns_to_prior_page(self) -> None:
+        url = reverse('article-list')
+        first = self.client.get(url, {'pagination': 'cursor', 'page_size': 3})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [a['id'] for a in back.data['results']],
+            [a['id'] for a in first.data['results']],
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_invalid_cursor_is_not_found(self) -> None:
+        response = self.client.get(reverse('article-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('tag-articles', args=[self.tag.pk]), {'cursor': 'bad'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_reversed_ordering_pages_ascending(self) -> None:
+        seen = self.walk(reverse('article-list'), {'pagination': 'cursor', 'ordering': 'created_at', 'page_size': 4})
+        self.assertEqual(seen, list(Article.objects.order_by('created_at', 'id').values_list('id', flat=True)))
+
+    def test_orderings_off_the_key_are_rejected(self) -> None:
+        url = reverse('article-list')
+        for params in ({'ordering': 'title'}, {'ordering': '-created_at,title'}, {'search': 'article'}):
+            with self.subTest(params):
+                response = self.client.get(url, {'pagination': 'cursor', **params})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('-created_at,-id', response.json()['detail'])
+        # Page numbers still honor them
+        self.assertEqual(self.client.get(url, {'ordering': 'title'}).status_code, 200)
+        response = self.client.get(url, {'pagination': 'cursor', 'search': 'article', 'ordering': '-created_at'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_tag_articles_cursor_mode(self) -> None:
+        url = reverse('tag-articles', args=[self.tag.pk])
+        self.assertIsInstance(self.client.get(url).data, list)
+        seen = self.walk(url, {'pagination': 'cursor', 'page_size': 10})
+        self.assertEqual(len(seen), 25)
+
+    def test_comments_cursor_mode_is_ascending(self) -> None:
+        article = Article.objects.first()
+        for i in range(7):
+            Comment.objects.create(article=article, content=f'Comment number {i}')
+        url = reverse('article-comments', args=[article.pk])
+        seen = []
+        response = self.client.get(url, {'pagination': 'cursor', 'page_size': 3})
+        while True:
+            seen.extend(c['id'] for c in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(len(seen), 7)
+
+    def test_comment_viewset_cursor_mode(self) -> None:
+        article = Article.objects.first()
+        for i in range(4):
+            Comment.objects.create(article=article, content=f'Comment number {i}')
+        view = CommentViewSet.as_view({'get': 'list'})
+        request = APIRequestFactory().get('/', {'pagination': 'cursor', 'page_size': 3})
+        response = view(request, article_pk=article.pk)
+        ids = [c['id'] for c in response.data['results']]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(ids), 3)
+        self.assertIn('cursor=', response.data['next'])
+
+    def test_comment_viewset_ordering(self) -> None:
+        article = Article.objects.first()
+        for i in range(5):
+            Comment.objects.create(article=article, content=f'Comment number {i}')
+        view = CommentViewSet.as_view({'get': 'list'})
+        seen, params = [], {'ordering': '-created_at', 'page_size': 2}
+        while True:
+            response = view(APIRequestFactory().get('/', params), article_pk=article.pk)
+            seen.extend(c['id'] for c in response.data['results'])
+            if not response.data['next']:
+                break
+            params = dict(parse_qsl(urlsplit(response.data['next']).query))
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(seen), 5)
+        # Fields outside the keyset are not orderable
+        response = view(APIRequestFactory().get('/', {'ordering': 'content'}), article_pk=article.pk)
+        ids = [c['id'] for c in response.data['results']]
+        self.assertEqual(ids, sorted(ids))
+
+    def test_page_number_mode_is_unchanged(self) -> None:
+        response = self.client.get(reverse('article-list'), {'page': 2})
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 10)
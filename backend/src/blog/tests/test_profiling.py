@@ -0,0 +1,99 @@
+import pstats
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.cache import response_cache
+from blog.models import Article
+from blog.profiling import list_profiles, profiles_directory
+from blog.trending import view_counter
+
+
+class ProfilingTests(TestCase):
+    """Profiles are captured on request, kept in a ring buffer and served to staff"""
+
+    def setUp(self) -> None:
+        response_cache.clear()
+        view_counter.clear()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.configure()
+        self.staff = User.objects.create_user('admin', is_staff=True)
+        self.reader = User.objects.create_user('reader')
+        self.article = Article.objects.create(title='Profiled', content='Profiled article body.')
+        # Middleware is loaded per client, so after the settings
+        self.client = APIClient()
+
+    def configure(self, **config) -> None:
+        override = override_settings(BLOG_PROFILING={
+            'ENABLED': True, 'DIRECTORY': self.directory, 'PROFILER': 'cprofile', **config,
+        })
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_staff_query_flag(self) -> None:
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('article-list'), {'profile': '1'})
+        self.assertEqual(response.status_code, 200)
+        capture_id = response['X-Blog-Profile-Id']
+
+        [listed] = self.client.get(reverse('profile-list')).json()
+        self.assertEqual(listed['id'], capture_id)
+        self.assertEqual((listed['path'], listed['status'], listed['reason']), ('/api/articles/?profile=1', 200, 'staff'))
+        self.assertNotIn('queries', listed)
+
+        record = self.client.get(reverse('profile-detail', args=[capture_id])).json()
+        self.assertEqual(record['query_count'], len(record['queries']))
+        self.assertTrue(any('blog_article' in query['sql'] for query in record['queries']))
+        self.assertIn('cumulative', record['summary'])
+
+        download = self.client.get(reverse('profile-download', args=[capture_id]))
+        self.assertEqual(download.status_code, 200)
+        path = profiles_directory() / f'{capture_id}.prof'
+        self.assertGreater(pstats.Stats(str(path)).total_calls, 0)
+        self.assertEqual(b''.join(download.streaming_content), path.read_bytes())
+
+    def test_not_profiled_without_permission(self) -> None:
+        self.assertFalse(self.client.get(reverse('article-list'), {'profile': '1'}).has_header('X-Blog-Profile-Id'))
+        self.client.force_login(self.reader)
+        self.assertFalse(
+            self.client.get(reverse('article-list'), HTTP_X_BLOG_PROFILE='1').has_header('X-Blog-Profile-Id')
+        )
+        self.assertEqual(self.client.get(reverse('profile-list')).status_code, 403)
+        self.assertEqual(list_profiles(), [])
+
+    def test_token_header(self) -> None:
+        self.configure(TOKEN='let-me-profile')
+        client = APIClient()
+        self.assertFalse(client.get(reverse('tag-list'), HTTP_X_BLOG_PROFILE='wrong').has_header('X-Blog-Profile-Id'))
+        response = client.get(reverse('tag-list'), HTTP_X_BLOG_PROFILE='let-me-profile')
+        self.assertIn('X-Blog-Profile-Id', response)
+
+    def test_sampling_and_ring_buffer(self) -> None:
+        self.configure(SAMPLE_RATE=0.5, MAX_PROFILES=3)
+        client = APIClient()
+        with mock.patch('blog.profiling.random.random', return_value=0.9):
+            self.assertFalse(client.get(reverse('tag-list')).has_header('X-Blog-Profile-Id'))
+        with mock.patch('blog.profiling.random.random', return_value=0.1):
+            ids = [client.get(reverse('tag-list'))['X-Blog-Profile-Id'] for _ in range(5)]
+        self.assertEqual([record['id'] for record in list_profiles()], ids[:-4:-1])
+        self.assertEqual(len(list(profiles_directory().iterdir())), 6)
+
+    def test_unknown_and_malformed_ids(self) -> None:
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(reverse('profile-detail', args=['0' * 19 + '-abcdef'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('profile-download', args=['..'])).status_code, 404)
+
+    def test_disabled_middleware_is_left_out(self) -> None:
+        self.configure(ENABLED=False)
+        client = APIClient()
+        client.force_login(self.staff)
+        with mock.patch('blog.middleware.wants_profile') as wants_profile:
+            response = client.get(reverse('article-list'), {'profile': '1'})
+        wants_profile.assert_not_called()
+        self.assertFalse(response.has_header('X-Blog-Profile-Id'))
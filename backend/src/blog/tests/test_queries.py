@@ -0,0 +1,77 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import Article, Comment, Tag
+from blog.trending import view_counter
+
+
+# Exercises the database path, so responses must not come from the cache
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class QueryBudgetTests(TestCase):
+    """
+    Read endpoints must run a fixed number of queries regardless of page size
+    """
+
+    def setUp(self) -> None:
+        # Views buffered by earlier tests must not flush inside a query budget
+        view_counter.clear()
+        self.client = APIClient()
+        self.tag = Tag.objects.create(name='python')
+        self.other_tag = Tag.objects.create(name='django')
+
+    def _create_articles(self, count: int) -> None:
+        for i in range(count):
+            article = Article.objects.create(
+                title=f'Article {i}',
+                content='Some article content long enough.',
+            )
+            article.tags.add(self.tag, self.other_tag)
+            Comment.objects.create(article=article, content='Approved comment')
+            Comment.objects.create(article=article, content='Hidden comment', is_approved=False)
+
+    def test_article_list_query_count_is_constant(self) -> None:
+        self._create_articles(3)
+        # validators, count, page, tags prefetch
+        with self.assertNumQueries(4):
+            self.client.get(reverse('article-list'), {'page_size': 100})
+
+        self._create_articles(30)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('article-list'), {'page_size': 100})
+
+        self.assertEqual(len(response.data['results']), 33)
+        self.assertTrue(all(a['comments_count'] == 1 for a in response.data['results']))
+
+    def test_article_detail_query_count_is_constant(self) -> None:
+        self._create_articles(1)
+        article = Article.objects.get()
+        for _ in range(20):
+            Comment.objects.create(article=article, content='Another approved comment')
+
+        # validators, article, tags prefetch, first page of approved comments
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('article-detail', args=[article.pk]))
+
+        self.assertEqual(response.data['comments_count'], 21)
+        self.assertEqual(len(response.data['comments']), 10)
+        self.assertIsNotNone(response.data['comments_next'])
+
+    def test_tag_articles_query_count_is_constant(self) -> None:
+        self._create_articles(3)
+        # validators, tag, articles, tags prefetch
+        with self.assertNumQueries(4):
+            self.client.get(reverse('tag-articles', args=[self.tag.pk]))
+
+        self._create_articles(30)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('tag-articles', args=[self.tag.pk]))
+
+        self.assertEqual(len(response.data), 33)
+        self.assertTrue(all(a['comments_count'] == 1 for a in response.data))
+
+    def test_tag_articles_counts_are_not_inflated_by_other_tags(self) -> None:
+        self._create_articles(1)
+        response = self.client.get(reverse('tag-articles', args=[self.tag.pk]))
+        self.assertEqual(response.data[0]['comments_count'], 1)
+        self.assertEqual(len(response.data[0]['tags']), 2)
@@ -0,0 +1,197 @@
+import re
+import time
+from typing import Dict, List, Tuple
+from unittest import skipUnless
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import Article, ArticleViewCount, Comment, Tag, archive_month
+from blog.related import rebuild_related
+from blog.search import get_search_backend
+from blog.trending import view_counter
+
+# Query shapes whose sort no index can remove. Each matches the whole
+# statement and is bounded by the rows one response renders.
+IDS = r'\([\d, ]+\)'
+# The tags of the articles on one page, by name
+PAGE_TAGS = (
+    r'SELECT "blog_article_tags"\."article_id", .* FROM "blog_article_tags" INNER JOIN "blog_tag" '
+    rf'ON \("blog_article_tags"\."tag_id" = "blog_tag"\."id"\) WHERE "blog_article_tags"\."article_id" IN {IDS} '
+    r'ORDER BY "blog_tag"\."name" ASC'
+)
+# The same, prefetched for a search page or an article
+PREFETCHED_TAGS = (
+    r'SELECT \("blog_article_tags"\."article_id"\) AS "_prefetch_related_val_article_id", .* '
+    r'FROM "blog_tag" INNER JOIN "blog_article_tags" ON \("blog_tag"\."id" = "blog_article_tags"\."tag_id"\) '
+    rf'WHERE "blog_article_tags"\."article_id" IN {IDS} ORDER BY "blog_tag"\."name" ASC'
+)
+# One page of full-text matches by relevance
+SEARCH_PAGE = r'SELECT .* FROM "blog_article" INNER JOIN "blog_article_fts" .* MATCH .* ORDER BY 8 DESC, .* LIMIT \d+'
+# One article's stored related ranking (at most BLOG_RELATED['LIMIT'] rows) and its articles
+RELATED_IDS = (
+    r'SELECT "blog_relatedarticle"\."related_id", "blog_relatedarticle"\."score" FROM "blog_relatedarticle" .* '
+    r'WHERE "blog_relatedarticle"\."article_id" = \d+ ORDER BY .*'
+)
+RELATED_ARTICLES = (
+    r'SELECT .* FROM "blog_article" INNER JOIN "blog_relatedarticle" .* '
+    r'WHERE \("blog_article"\."is_published" AND "blog_relatedarticle"\."article_id" = \d+\) ORDER BY .*'
+)
+# Trending scores over the window, top LIMIT only, and the ranked articles in ranking order
+TRENDING_SCORES = r'SELECT "blog_articleviewcount"\."article_id", SUM\(.* GROUP BY .* ORDER BY 2 DESC, .* LIMIT \d+'
+RANKED_ARTICLES = rf'SELECT .* FROM "blog_article" WHERE \("blog_article"\."is_published" AND "blog_article"\."id" IN {IDS}\) ORDER BY CASE WHEN .*'
+# One page of changed rows, fetched by id and put back in (updated_at, id) order
+SYNC_ROWS = rf'SELECT .* FROM "blog_(article|tag|comment)" WHERE .*"id" IN {IDS}\)? ORDER BY "blog_\w+"\."updated_at" ASC, "blog_\w+"\."id" ASC'
+# Every published article of one tag, by date: the whole list is the response
+TAG_POSTINGS = (
+    r'SELECT .* FROM "blog_article" INNER JOIN "blog_article_tags" .* '
+    r'WHERE \("blog_article"\."is_published" AND "blog_article_tags"\."tag_id" = \d+\) ORDER BY "blog_article"\."created_at" DESC'
+)
+
+# Endpoint name (see QueryPlanTests.endpoints) -> the sorted shapes it may run
+ACCEPTED_SORTS: Dict[str, List[str]] = {
+    'article list': [PAGE_TAGS],
+    'article list page 2': [PAGE_TAGS],
+    'article list cursor': [PAGE_TAGS],
+    'article list by comments': [PAGE_TAGS],
+    'article list by title': [PAGE_TAGS],
+    'article search': [SEARCH_PAGE, PREFETCHED_TAGS],
+    'article detail': [PREFETCHED_TAGS],
+    'article related': [RELATED_IDS, RELATED_ARTICLES, PAGE_TAGS],
+    'article archive month': [PAGE_TAGS],
+    'article trending': [TRENDING_SCORES, RANKED_ARTICLES, PAGE_TAGS],
+    'tag articles': [TAG_POSTINGS, PAGE_TAGS],
+    'tag articles cursor': [PAGE_TAGS],
+    'sync': [SYNC_ROWS, PAGE_TAGS],
+    'sync delta': [SYNC_ROWS, PAGE_TAGS],
+}
+
+
+def explain(sql: str) -> List[str]:
+    """The plan of a captured query (parameters already inlined), one line per step"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[3] for row in cursor.fetchall()]
+        # Costed out rather than off: a plan still has them when no index applies
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('SET LOCAL enable_sort = off')
+        try:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+            [[[root]]] = cursor.fetchall()
+        finally:
+            cursor.execute('RESET enable_seqscan')
+            cursor.execute('RESET enable_sort')
+        lines, nodes = [], [root['Plan']]
+        while nodes:
+            node = nodes.pop()
+            lines.append(f"{node['Node Type']} {node.get('Relation Name', '')} {node.get('Index Name', '')}".strip())
+            nodes.extend(node.get('Plans', []))
+        return lines
+
+
+def problems(plan: List[str]) -> List[Tuple[str, str]]:
+    """(kind, step) for each full table scan or sort in ``plan``"""
+    found = []
+    for step in plan:
+        if connection.vendor == 'sqlite':
+            # "SCAN t USING [COVERING] INDEX i" walks an index; full-text matches scan a virtual table
+            if re.match(r'SCAN \S+$', step):
+                found.append(('scan', step))
+            elif 'TEMP B-TREE' in step:
+                found.append(('sort', step))
+        elif step.startswith('Seq Scan'):
+            found.append(('scan', step))
+        elif step.split()[0] in ('Sort', 'Incremental'):
+            found.append(('sort', step))
+    return found
+
+
+@skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'reads SQLite and PostgreSQL plans')
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class QueryPlanTests(TestCase):
+    """
+    Every query a read endpoint runs must be answered from an index: no
+    full table scan and no sort other than the endpoint's bounded shapes in
+    ACCEPTED_SORTS
+    """
+
+    def setUp(self) -> None:
+        caches['default'].clear()
+        view_counter.clear()
+        self.client = APIClient()
+        python, django = Tag.objects.create(name='python'), Tag.objects.create(name='django')
+        hour = int(time.time() // 3600)
+        for i in range(12):
+            article = Article.objects.create(
+                title=f'Indexed article {i}', content='Query plans and database indexes.', is_published=i % 4 != 3
+            )
+            article.tags.add(python, *([django] if i % 2 else []))
+            for j in range(3):
+                Comment.objects.create(article=article, content=f'Comment {j} on it.', is_approved=j != 2)
+            ArticleViewCount.objects.create(article=article, hour=hour, views=i + 1)
+        get_search_backend().rebuild()
+        rebuild_related()
+        self.article = Article.objects.published().first()
+        self.comment = self.article.comments.filter(is_approved=True).first()
+        self.tag = python
+
+    def endpoints(self) -> Dict[str, str]:
+        article, tag = self.article.pk, self.tag.pk
+        year, month = archive_month(self.article.created_at)
+        sync = self.client.get(reverse('sync')).json()['token']
+        cursor = self.client.get(reverse('article-list'), {'pagination': 'cursor', 'page_size': 5}).json()['next']
+        comments = self.client.get(reverse('article-comments', args=[article]), {'page_size': 1}).json()['next']
+        return {
+            'article list': reverse('article-list'),
+            'article list page 2': reverse('article-list') + '?page=2&page_size=5',
+            'article list cursor': cursor,
+            'article list by comments': reverse('article-list') + '?ordering=-approved_comments_count',
+            'article list by title': reverse('article-list') + '?ordering=title',
+            'article search': reverse('article-list') + '?search=database+indexes',
+            'article detail': reverse('article-detail', args=[article]),
+            'article comments': reverse('article-comments', args=[article]),
+            'article comments cursor': comments,
+            'article comment detail': reverse('article-comment-detail', args=[article, self.comment.pk]),
+            'article related': reverse('article-related', args=[article]),
+            'article archive': reverse('article-archive'),
+            'article archive month': reverse('article-archive-month', args=[year, month]),
+            'article trending': reverse('article-trending'),
+            'tag list': reverse('tag-list'),
+            'tag detail': reverse('tag-detail', args=[tag]),
+            'tag articles': reverse('tag-articles', args=[tag]),
+            'tag articles cursor': reverse('tag-articles', args=[tag]) + '?pagination=cursor&page_size=5',
+            'tag autocomplete': reverse('tag-autocomplete') + '?q=py',
+            'sync': reverse('sync'),
+            'sync delta': reverse('sync') + f'?since={sync}',
+        }
+
+    def test_endpoint_queries_use_indexes(self) -> None:
+        for name, path in self.endpoints().items():
+            with self.subTest(name):
+                # Trending ranks are cached between refreshes
+                caches['default'].clear()
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(path)
+                self.assertEqual(response.status_code, 200, path)
+                selects = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+                failures = []
+                for sql in selects:
+                    plan = explain(sql)
+                    for kind, step in problems(plan):
+                        if kind == 'sort' and any(re.fullmatch(shape, sql) for shape in ACCEPTED_SORTS.get(name, [])):
+                            continue
+                        failures.append(f'{kind}: {step}\n  {sql}\n  ' + '\n  '.join(plan))
+                self.assertFalse(failures, f'{path}\n' + '\n'.join(failures))
+
+    def test_feed_reads_published_rows_from_the_partial_index(self) -> None:
+        plan = Article.objects.published().order_by('-created_at', '-id')[:10].explain()
+        self.assertIn('blog_article_published_idx', plan)
+
+    def test_detail_comments_read_the_approved_index(self) -> None:
+        plan = self.article.comments.filter(is_approved=True).order_by('created_at', 'id')[:10].explain()
+        self.assertIn('blog_comment_approved_idx', plan)
@@ -0,0 +1,129 @@
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import Article, RelatedArticle, Tag
+from blog.related import RelatedIndex, rebuild_related, update_related
+
+
+class RelatedIndexTests(TestCase):
+    """IDF-weighted Jaccard scoring over the tag incidence"""
+
+    def test_weighted_jaccard(self) -> None:
+        # tag 1 is on every article, tag 2 on two of them, tag 3 on one
+        pairs = [(1, 1), (1, 2), (2, 1), (2, 2), (2, 3), (3, 1), (4, 1)]
+        index = RelatedIndex(pairs)
+        w = index.weights
+        self.assertGreater(w[3], w[2])
+        self.assertGreater(w[2], w[1])
+        scores = index.scores(1)
+        self.assertAlmostEqual(scores[2], (w[1] + w[2]) / (w[1] + w[2] + w[3]))
+        self.assertAlmostEqual(scores[3], w[1] / (w[1] + w[2]))
+        self.assertEqual([other for other, _ in index.top(1)], [2, 4, 3])
+
+    def test_common_tags_only_contribute_nearby_candidates(self) -> None:
+        pairs = [(pk, 1) for pk in range(1, 201)]
+        index = RelatedIndex(pairs, limit=5, max_postings=50)
+        candidates = index.candidates(100)
+        self.assertLessEqual(len(candidates), 2 * 5 + 2)
+        self.assertTrue(all(abs(pk - 100) <= 6 for pk in candidates))
+
+    def test_articles_without_tags_have_no_ranking(self) -> None:
+        self.assertEqual(RelatedIndex([(1, 1), (2, 1)]).top(3), [])
+
+
+class RelatedArticlesTests(TestCase):
+    """Stored rankings, their incremental upkeep and the related endpoint"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.python, self.django, self.rare = (
+            Tag.objects.create(name=name) for name in ('python', 'django', 'rare')
+        )
+        self.filler = [Article.objects.create(title=f'Filler {i}', content='Filler body.') for i in range(4)]
+        for article in self.filler:
+            article.tags.add(self.python)
+        self.article = Article.objects.create(title='Django tips', content='Django body text.')
+        self.article.tags.add(self.python, self.django, self.rare)
+        self.close = Article.objects.create(title='More Django', content='Django body text.')
+        self.close.tags.add(self.python, self.django, self.rare)
+
+    def related_ids(self, article: Article) -> list:
+        return list(
+            RelatedArticle.objects.filter(article=article).order_by('-score').values_list('related_id', flat=True)
+        )
+
+    def test_tag_changes_update_rankings_incrementally(self) -> None:
+        self.assertEqual(self.related_ids(self.article)[0], self.close.pk)
+        self.assertIn(self.article.pk, self.related_ids(self.close))
+
+        self.close.tags.clear()
+        self.assertNotIn(self.close.pk, self.related_ids(self.article))
+        self.assertEqual(self.related_ids(self.close), [])
+
+    def test_rebuild_matches_incremental_updates(self) -> None:
+        incremental = set(RelatedArticle.objects.values_list('article_id', 'related_id'))
+        rebuild_related()
+        self.assertEqual(set(RelatedArticle.objects.values_list('article_id', 'related_id')), incremental)
+
+    def test_unpublished_articles_are_left_out(self) -> None:
+        draft = Article.objects.create(title='Draft', content='Draft body.', is_published=False)
+        draft.tags.add(self.python, self.django, self.rare)
+        self.assertFalse(RelatedArticle.objects.filter(related=draft).exists())
+        self.assertFalse(RelatedArticle.objects.filter(article=draft).exists())
+
+    def test_publication_changes_update_rankings(self) -> None:
+        self.close.is_published = False
+        self.close.save()
+        self.assertNotIn(self.close.pk, self.related_ids(self.article))
+        self.assertEqual(self.related_ids(self.close), [])
+
+        self.close.is_published = True
+        self.close.save()
+        self.assertEqual(self.related_ids(self.article)[0], self.close.pk)
+        self.assertIn(self.article.pk, self.related_ids(self.close))
+
+    def test_update_keeps_rankings_bounded(self) -> None:
+        with override_settings(BLOG_RELATED={'LIMIT': 2}):
+            rebuild_related()
+            newcomer = Article.objects.create(title='Newcomer', content='Newcomer body.')
+            newcomer.tags.add(self.python, self.django, self.rare)
+        for article in Article.objects.all():
+            self.assertLessEqual(len(self.related_ids(article)), 2)
+        self.assertIn(newcomer.pk, self.related_ids(self.article))
+
+    def test_related_endpoint(self) -> None:
+        url = reverse('article-related', args=[self.article.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['id'], self.close.pk)
+        self.assertEqual(len(response.data), len(self.related_ids(self.article)))
+        self.assertIn('tags', response.data[0])
+
+    @override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False}, BLOG_CONDITIONAL_GET={'ENABLED': False})
+    def test_related_endpoint_queries(self) -> None:
+        # article exists, ranked articles, their tags
+        with self.assertNumQueries(3):
+            self.client.get(reverse('article-related', args=[self.article.pk]))
+
+    def test_cached_related_list_follows_ranking_changes(self) -> None:
+        url = reverse('article-related', args=[self.article.pk])
+        self.client.get(url)
+        newcomer = Article.objects.create(title='Newcomer', content='Newcomer body.')
+        newcomer.tags.add(self.python, self.django, self.rare)
+        ids = [item['id'] for item in self.client.get(url).data]
+        self.assertIn(newcomer.pk, ids)
+
+    def test_unknown_article_is_not_found(self) -> None:
+        self.assertEqual(self.client.get(reverse('article-related', args=[999])).status_code, 404)
+
+    def test_management_command(self) -> None:
+        RelatedArticle.objects.all().delete()
+        call_command('rebuild_related_articles', stdout=open('/dev/null', 'w'))
+        self.assertEqual(self.related_ids(self.article)[0], self.close.pk)
+
+    def test_update_related_reports_changed_rankings(self) -> None:
+        changed = update_related([self.close.pk])
+        self.assertIn(self.close.pk, changed)
+        self.assertIn(self.article.pk, changed)
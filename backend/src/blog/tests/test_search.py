@@ -0,0 +1,99 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import Article, make_excerpt
+from blog.search import SQLiteFTS5SearchBackend, get_search_backend
+
+
+# Exercises the database path, so responses must not come from the cache
+@override_settings(BLOG_RESPONSE_CACHE={'ENABLED': False})
+class FullTextSearchTests(TestCase):
+    """Ranked full-text search over article titles and content"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.django = Article.objects.create(
+            title='Django performance tips',
+            content='Profiling querysets and caching responses.',
+        )
+        self.python = Article.objects.create(
+            title='Python packaging',
+            content='Notes on wheels, with a short aside about Django.',
+        )
+        self.rust = Article.objects.create(
+            title='Rust ownership',
+            content='Borrowing rules explained with examples.',
+        )
+
+    def search(self, query: str, **params):
+        return self.client.get(reverse('article-list'), {'search': query, **params})
+
+    def test_results_are_ranked_with_title_matches_first(self) -> None:
+        response = self.search('django')
+        ids = [a['id'] for a in response.data['results']]
+        self.assertEqual(ids, [self.django.id, self.python.id])
+
+    def test_results_include_highlighted_snippets(self) -> None:
+        response = self.search('borrowing')
+        result = response.data['results'][0]
+        self.assertIn('<mark>Borrowing</mark>', result['search_snippet'])
+        self.assertIn('search_rank', result)
+
+    def test_snippets_escape_article_text(self) -> None:
+        Article.objects.create(title='Markup', content='Escaping <script>alert(1)</script> & borrowing markup.')
+        snippets = [result['search_snippet'] for result in self.search('escaping').data['results']]
+        self.assertEqual(len(snippets), 1)
+        self.assertNotIn('<script>', snippets[0])
+        self.assertIn('&lt;script&gt;', snippets[0])
+        self.assertIn('<mark>Escaping</mark>', snippets[0])
+
+    def test_last_term_matches_as_prefix(self) -> None:
+        response = self.search('own')
+        self.assertEqual([a['id'] for a in response.data['results']], [self.rust.id])
+
+    def test_explicit_ordering_overrides_relevance(self) -> None:
+        response = self.search('django', ordering='title')
+        ids = [a['id'] for a in response.data['results']]
+        self.assertEqual(ids, [self.django.id, self.python.id])
+        response = self.search('django', ordering='-title')
+        ids = [a['id'] for a in response.data['results']]
+        self.assertEqual(ids, [self.python.id, self.django.id])
+
+    def test_punctuation_only_query_matches_nothing(self) -> None:
+        response = self.search('"*(')
+        self.assertEqual(response.data['results'], [])
+
+    def test_plain_list_has_no_search_fields(self) -> None:
+        response = self.client.get(reverse('article-list'))
+        self.assertNotIn('search_snippet', response.data['results'][0])
+
+    def test_index_follows_updates_and_deletes(self) -> None:
+        self.rust.title = 'Rust lifetimes'
+        self.rust.save()
+        self.assertEqual(self.search('ownership').data['results'], [])
+        self.assertEqual(len(self.search('lifetimes').data['results']), 1)
+
+        self.rust.delete()
+        self.assertEqual(self.search('lifetimes').data['results'], [])
+
+    def test_index_follows_bulk_text_updates(self) -> None:
+        Article.objects.filter(pk=self.rust.pk).update(content='Lifetimes and the borrow checker.')
+        self.assertEqual(self.search('examples').data['results'], [])
+        self.assertEqual(len(self.search('checker').data['results']), 1)
+        self.rust.refresh_from_db()
+        self.assertEqual(self.rust.excerpt, make_excerpt('Lifetimes and the borrow checker.'))
+
+    def test_rebuild_command_restores_index(self) -> None:
+        if not isinstance(get_search_backend(), SQLiteFTS5SearchBackend):
+            self.skipTest('FTS5 index is only used on SQLite')
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM blog_article_fts')
+        self.assertEqual(self.search('django').data['results'], [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(self.search('django').data['results']), 2)
@@ -0,0 +1,64 @@
+import random
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F, Q
+from django.test import TestCase
+
+from blog.models import ArchiveMonth, Article, Comment, RelatedArticle, Tag
+from blog.seed import long_tail, seed_blog, tag_names
+
+
+class SeedTests(TestCase):
+    """Synthetic datasets are skewed like real ones and reproducible"""
+
+    def test_counts_and_derived_tables(self) -> None:
+        result = seed_blog(articles=300, tags=40, comments=4, seed=1, batch_size=120)
+        self.assertEqual(Article.objects.count(), 300)
+        self.assertEqual(Tag.objects.count(), 40)
+        self.assertEqual(Comment.objects.count(), result.comments)
+        self.assertEqual(Article.tags.through.objects.count(), result.article_tags)
+        # Counters and archive match the inserted rows
+        drift = Article.objects.annotate(
+            approved=Count('comments', filter=Q(comments__is_approved=True))
+        ).exclude(approved_comments_count=F('approved'))
+        self.assertFalse(drift.exists())
+        archived = sum(ArchiveMonth.objects.values_list('count', flat=True))
+        self.assertEqual(archived, Article.objects.published().count())
+        self.assertTrue(RelatedArticle.objects.exists())
+
+    def test_distributions(self) -> None:
+        seed_blog(articles=500, tags=60, comments=5, seed=2, rebuild=False)
+        uses = list(Tag.objects.annotate(uses=Count('articles')).order_by('-uses').values_list('name', 'uses'))
+        self.assertEqual(uses[0][0], 'python')
+        # Zipf: the top tag is on far more articles than the median tag
+        self.assertGreater(uses[0][1], 10 * uses[len(uses) // 2][1])
+        per_article = sorted(Article.objects.annotate(n=Count('comments')).values_list('n', flat=True))
+        self.assertGreater(per_article[-1], 5 * per_article[len(per_article) // 2])
+        dates = Article.objects.values_list('created_at', flat=True)
+        self.assertGreater((max(dates) - min(dates)).days, 365)
+
+    def test_same_seed_same_rows(self) -> None:
+        seed_blog(articles=50, tags=10, seed=3, rebuild=False)
+        first = list(Article.objects.order_by('pk').values_list('title', 'is_published'))
+        Article.objects.all().delete()
+        seed_blog(articles=50, tags=10, seed=3, rebuild=False)
+        self.assertEqual(list(Article.objects.order_by('pk').values_list('title', 'is_published')), first)
+
+    def test_helpers(self) -> None:
+        names = tag_names(65)
+        self.assertEqual(len(set(names)), 65)
+        self.assertEqual(names[:2], ['python', 'django'])
+        rng = random.Random(0)
+        samples = [long_tail(rng, 5) for _ in range(20000)]
+        self.assertAlmostEqual(sum(samples) / len(samples), 5, delta=1)
+        self.assertEqual(long_tail(rng, 0), 0)
+
+    def test_command(self) -> None:
+        out = StringIO()
+        call_command('seed_blog', articles=20, tags=5, stdout=out)
+        self.assertIn('Seeded 20 articles', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('seed_blog', articles=20, stdout=StringIO())
+        call_command('seed_blog', articles=20, tags=5, append=True, seed=9, stdout=StringIO())
+        self.assertEqual(Article.objects.count(), 40)
@@ -0,0 +1,126 @@
+import gzip
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.cache import response_cache
+from blog.importer import import_articles
+from blog.models import Article, Comment, Tag
+from blog.snapshot import SnapshotWriter, publish_pending, publish_snapshot
+from blog.trending import view_counter
+
+
+class SnapshotTests(TestCase):
+    """Pre-rendered files match the API and follow writes"""
+
+    def setUp(self) -> None:
+        response_cache.clear()
+        view_counter.clear()
+        self.client = APIClient()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        settings = override_settings(BLOG_SNAPSHOT={'ENABLED': True, 'ROOT': self.root, 'PAGES': 3})
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.python = Tag.objects.create(name='python')
+        self.article = Article.objects.create(title='Snapshotted', content='Snapshotted article body.')
+        self.article.tags.add(self.python)
+
+    def file(self, path: str, name: str = 'index.json') -> Path:
+        return self.root / path.strip('/') / name
+
+    def test_full_publish_matches_api(self) -> None:
+        writer = publish_snapshot()
+        self.assertGreater(writer.written, 0)
+        for path in (
+            reverse('article-list'),
+            reverse('article-detail', args=[self.article.pk]),
+            reverse('article-archive'),
+            reverse('tag-list'),
+            reverse('tag-articles', args=[self.python.pk]),
+        ):
+            with self.subTest(path=path):
+                body = self.file(path).read_bytes()
+                self.assertEqual(body, self.client.get(path).content)
+                self.assertEqual(gzip.decompress(self.file(path, 'index.json.gz').read_bytes()), body)
+
+    def test_pages_follow_the_list(self) -> None:
+        Article.objects.bulk_create(
+            Article(title=f'Article {i}', content='Paginated article body.') for i in range(15)
+        )
+        publish_snapshot()
+        url = reverse('article-list')
+        self.assertEqual(self.file(url, 'page-2.json').read_bytes(), self.client.get(url, {'page': 2}).content)
+        self.assertFalse(self.file(url, 'page-3.json').exists())
+
+        Article.objects.filter(title__startswith='Article').delete()
+        publish_snapshot()
+        self.assertFalse(self.file(url, 'page-2.json').exists())
+        self.assertFalse(self.file(url, 'page-2.json.gz').exists())
+
+    def test_unchanged_files_are_not_rewritten(self) -> None:
+        publish_snapshot()
+        writer = publish_snapshot()
+        self.assertEqual((writer.written, writer.removed), (0, 0))
+
+    def test_writes_rerender_on_commit(self) -> None:
+        publish_snapshot()
+        detail = self.file(reverse('article-detail', args=[self.article.pk]))
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(article=self.article, author_name='Reader', content='Fresh comment text.')
+        self.assertIn(b'Fresh comment text.', detail.read_bytes())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.is_published = False
+            self.article.save()
+        self.assertFalse(detail.exists())
+        self.assertNotIn(b'Snapshotted', self.file(reverse('article-list')).read_bytes())
+        self.assertNotIn(b'Snapshotted', self.file(reverse('tag-articles', args=[self.python.pk])).read_bytes())
+
+    def test_tag_changes_rerender_listings(self) -> None:
+        publish_snapshot()
+        django = Tag.objects.create(name='django')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.tags.set([django])
+        self.assertIn(b'django', self.file(reverse('article-detail', args=[self.article.pk])).read_bytes())
+        self.assertNotIn(b'Snapshotted', self.file(reverse('tag-articles', args=[self.python.pk])).read_bytes())
+        self.assertIn(b'Snapshotted', self.file(reverse('tag-articles', args=[django.pk])).read_bytes())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.tags.clear()
+        self.assertNotIn(b'Snapshotted', self.file(reverse('tag-articles', args=[django.pk])).read_bytes())
+
+    def test_import_rerenders_listings(self) -> None:
+        publish_snapshot()
+        with self.captureOnCommitCallbacks(execute=True):
+            import_articles(['{"title": "Imported", "content": "Imported article body.", "tags": ["python"]}'])
+        self.assertIn(b'Imported', self.file(reverse('article-list')).read_bytes())
+        self.assertIn(b'Imported', self.file(reverse('tag-articles', args=[self.python.pk])).read_bytes())
+
+    @override_settings(BLOG_SNAPSHOT={'ENABLED': False})
+    def test_disabled_does_not_render_on_write(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Comment.objects.create(article=self.article, author_name='Reader', content='Unpublished comment.')
+        self.assertNotIn(publish_pending, callbacks)
+
+    def test_rendering_does_not_count_views(self) -> None:
+        SnapshotWriter(self.root).publish(reverse('article-detail', args=[self.article.pk]))
+        self.assertEqual(view_counter.pending(), 0)
+
+    @override_settings(ALLOWED_HOSTS=['blog.example.com'])
+    def test_command(self) -> None:
+        Article.objects.bulk_create(
+            Article(title=f'Article {i}', content='Paginated article body.') for i in range(15)
+        )
+        out = StringIO()
+        call_command('publish_snapshot', root=str(self.root), base_url='https://blog.example.com', stdout=out)
+        self.assertIn('files written', out.getvalue())
+        # Pagination links point at the public origin
+        self.assertIn(b'"next":"https://blog.example.com/api/', self.file(reverse('article-list')).read_bytes())
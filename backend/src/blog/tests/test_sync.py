@@ -0,0 +1,144 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from blog.models import Article, Comment, Tag, Tombstone
+from blog.sync import ExpiredToken, changes_since, compact_tombstones
+
+
+@override_settings(BLOG_SYNC={'LAG': 0, 'LIMIT': 500})
+class SyncTests(TestCase):
+    """Changes, deletions and paging of the delta sync endpoint"""
+
+    def setUp(self) -> None:
+        caches['default'].clear()
+        self.client = APIClient()
+        self.tag = Tag.objects.create(name='python')
+        self.article = Article.objects.create(title='Synced', content='Synced article body.')
+        self.article.tags.add(self.tag)
+        self.comment = Comment.objects.create(article=self.article, author_name='Reader', content='First comment.')
+        self.draft = Article.objects.create(title='Draft', content='Draft article body.', is_published=False)
+
+    def sync(self, token: str = None, **extra) -> dict:
+        response = self.client.get(reverse('sync'), {'since': token} if token else {}, **extra)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def ids(self, data: dict, stream: str) -> list:
+        return [item['id'] for item in data[stream]]
+
+    def test_first_sync_returns_everything_visible(self) -> None:
+        data = self.sync()
+        self.assertEqual(self.ids(data, 'articles'), [self.article.pk])
+        self.assertEqual(self.ids(data, 'tags'), [self.tag.pk])
+        self.assertEqual(self.ids(data, 'comments'), [self.comment.pk])
+        self.assertEqual(data['deleted'], {'articles': [], 'tags': [], 'comments': []})
+        self.assertFalse(data['has_more'])
+
+        # Nothing changed since
+        again = self.sync(data['token'])
+        self.assertEqual((again['articles'], again['tags'], again['comments']), ([], [], []))
+
+    def test_updates_and_visibility_changes(self) -> None:
+        token = self.sync()['token']
+        self.draft.is_published = True
+        self.draft.save()
+        self.article.is_published = False
+        self.article.save()
+        Comment.objects.create(article=self.draft, author_name='Reader', content='Pending comment.', is_approved=False)
+
+        data = self.sync(token)
+        self.assertEqual(self.ids(data, 'articles'), [self.draft.pk])
+        self.assertEqual(data['deleted']['articles'], [self.article.pk])
+        self.assertEqual(len(data['deleted']['comments']), 1)
+        self.assertEqual(data['comment_counts'], {str(self.draft.pk): 0})
+
+    def test_bulk_visibility_updates_reach_sync(self) -> None:
+        token = self.sync()['token']
+        Article.objects.filter(pk=self.article.pk).update(is_published=False)
+        Comment.objects.filter(pk=self.comment.pk).update(is_approved=False)
+        data = self.sync(token)
+        self.assertEqual(data['deleted']['articles'], [self.article.pk])
+        self.assertEqual(data['deleted']['comments'], [self.comment.pk])
+
+    def test_api_deletes_leave_tombstones(self) -> None:
+        token = self.sync()['token']
+        url = reverse('article-comment-detail', args=[self.article.pk, self.comment.pk])
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.delete(reverse('tag-detail', args=[self.tag.pk])).status_code, 204)
+
+        data = self.sync(token)
+        self.assertEqual(data['deleted']['comments'], [self.comment.pk])
+        self.assertEqual(data['deleted']['tags'], [self.tag.pk])
+        # The deleted comment changed its article's count
+        self.assertEqual(data['comment_counts'], {str(self.article.pk): 0})
+
+        self.assertEqual(self.client.delete(reverse('article-detail', args=[self.article.pk])).status_code, 204)
+        data = self.sync(data['token'])
+        self.assertEqual(data['deleted']['articles'], [self.article.pk])
+
+    def test_paging_resumes_after_the_last_row(self) -> None:
+        Tag.objects.bulk_create(Tag(name=f'tag-{i:02d}') for i in range(7))
+        seen = []
+        token, calls = None, 0
+        with override_settings(BLOG_SYNC={'LAG': 0, 'LIMIT': 3}):
+            while True:
+                data = self.sync(token)
+                seen.extend(self.ids(data, 'tags'))
+                token, calls = data['token'], calls + 1
+                if not data['has_more']:
+                    break
+        # bulk_create stamps every row with the same updated_at; ids break the tie
+        self.assertEqual(sorted(seen), sorted(Tag.objects.values_list('pk', flat=True)))
+        self.assertEqual(calls, 3)
+
+    def test_recent_rows_are_sent_again_within_the_lag(self) -> None:
+        with override_settings(BLOG_SYNC={'LAG': 3600}):
+            token = self.sync()['token']
+            self.assertEqual(self.ids(self.sync(token), 'articles'), [self.article.pk])
+
+    def test_truncated_page_does_not_skip_late_commits(self) -> None:
+        Tag.objects.bulk_create(Tag(name=f'tag-{i:02d}') for i in range(4))
+        with override_settings(BLOG_SYNC={'LAG': 3600, 'LIMIT': 3}):
+            data = self.sync()
+            self.assertEqual(len(data['tags']), 3)
+            # Stamped before the rows just sent, committed after them
+            late = Tag.objects.create(name='late')
+            Tag.objects.filter(pk=late.pk).update(updated_at=timezone.now() - timedelta(minutes=30))
+            self.assertIn(late.pk, self.ids(self.sync(data['token']), 'tags'))
+
+    def test_since_now_starts_from_the_current_position(self) -> None:
+        data = self.sync('now')
+        self.assertEqual((data['articles'], data['tags'], data['comments']), ([], [], []))
+        self.assertFalse(data['has_more'])
+        self.comment.content = 'Edited comment.'
+        self.comment.save()
+        data = self.sync(data['token'])
+        self.assertEqual(self.ids(data, 'comments'), [self.comment.pk])
+        self.assertEqual(data['articles'], [])
+
+    def test_invalid_and_expired_tokens(self) -> None:
+        self.assertEqual(self.client.get(reverse('sync'), {'since': 'not-a-token'}).status_code, 400)
+        token = self.sync()['token']
+        later = timezone.now() + timedelta(days=31)
+        with self.assertRaises(ExpiredToken):
+            changes_since(token, now=later)
+        with mock.patch('blog.sync.timezone.now', return_value=later):
+            self.assertEqual(self.client.get(reverse('sync'), {'since': token}).status_code, 410)
+
+    def test_compaction(self) -> None:
+        old = Tombstone.objects.create(kind=Tombstone.TAG, object_id=99)
+        Tombstone.objects.filter(pk=old.pk).update(deleted_at=timezone.now() - timedelta(days=40))
+        Tombstone.objects.create(kind=Tombstone.TAG, object_id=100)
+        self.assertEqual(compact_tombstones(), 1)
+        out = StringIO()
+        call_command('compact_tombstones', stdout=out)
+        self.assertIn('Removed 0 tombstones', out.getvalue())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [100])
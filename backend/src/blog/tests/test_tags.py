@@ -0,0 +1,78 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.models import Article, Tag
+
+
+class ArticleTagWriteTests(TestCase):
+    """Set-based tag resolution and diffing on article create/update"""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        Tag.objects.create(name='python')
+
+    def payload(self, *names: str) -> dict:
+        return {
+            'title': 'Tagged article',
+            'content': 'Article content long enough.',
+            'tags': [{'name': name} for name in names],
+        }
+
+    def create(self, *names: str):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('article-list'), self.payload(*names), format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response, len(queries)
+
+    def update(self, article: Article, *names: str):
+        url = reverse('article-detail', args=[article.pk])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(url, self.payload(*names), format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response, [q['sql'] for q in queries.captured_queries]
+
+    def test_existing_and_new_tags_are_resolved(self) -> None:
+        response, _ = self.create('Python', 'django')
+        self.assertEqual({t['name'] for t in response.data['tags']}, {'python', 'django'})
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_create_query_count_does_not_grow_with_tags(self) -> None:
+        _, few = self.create('aa', 'bb')
+        _, many = self.create(*(f'tag{i}' for i in range(30)))
+        self.assertEqual(few, many)
+
+    def test_unchanged_tags_write_no_through_rows(self) -> None:
+        response, _ = self.create('python', 'django')
+        article = Article.objects.get(pk=response.data['id'])
+        _, queries = self.update(article, 'django', 'python')
+        writes = [sql for sql in queries if 'blog_article_tags' in sql and not sql.startswith('SELECT')]
+        self.assertEqual(writes, [])
+
+    def test_update_only_touches_changed_rows(self) -> None:
+        response, _ = self.create('python', 'django')
+        article = Article.objects.get(pk=response.data['id'])
+        python_row = Article.tags.through.objects.get(article=article, tag__name='python')
+
+        response, _ = self.update(article, 'python', 'rust')
+        self.assertEqual({t['name'] for t in response.data['tags']}, {'python', 'rust'})
+        # The kept membership is the same row, not a re-insert
+        self.assertTrue(Article.tags.through.objects.filter(pk=python_row.pk).exists())
+
+    def test_update_query_count_does_not_grow_with_tags(self) -> None:
+        response, _ = self.create('aa', 'bb')
+        article = Article.objects.get(pk=response.data['id'])
+        _, few = self.update(article, 'cc', 'dd')
+        _, many = self.update(article, *(f'tag{i}' for i in range(30)))
+        self.assertEqual(len(few), len(many))
+
+    def test_get_or_create_many_keeps_order_and_tolerates_existing(self) -> None:
+        tags, created = Tag.objects.get_or_create_many(['rust', 'python', 'rust'])
+        self.assertTrue(created)
+        self.assertEqual([t.name for t in tags], ['rust', 'python'])
+        self.assertTrue(all(t.pk for t in tags))
+
+        tags, created = Tag.objects.get_or_create_many(['python'])
+        self.assertFalse(created)
@@ -0,0 +1,162 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.cache import response_cache
+from blog.models import Article, ArticleViewCount
+from blog.trending import (
+    ViewCounter,
+    compute_trending,
+    current_hour,
+    trending_ranking,
+    view_counter,
+    write_views,
+)
+
+
+def views_of(article: Article) -> int:
+    return sum(ArticleViewCount.objects.filter(article=article).values_list('views', flat=True))
+
+
+class ViewCounterTests(TestCase):
+    """Views are buffered in memory and written in batched upserts"""
+
+    def setUp(self) -> None:
+        self.counter = ViewCounter()
+        self.first = Article.objects.create(title='First', content='First article body.')
+        self.second = Article.objects.create(title='Second', content='Second article body.')
+
+    def test_record_buffers_without_queries(self) -> None:
+        with self.assertNumQueries(0):
+            for _ in range(5):
+                self.counter.record(self.first.pk)
+        self.assertEqual(self.counter.pending(), 5)
+        self.assertEqual(views_of(self.first), 0)
+
+    def test_flush_is_one_transaction_and_accumulates(self) -> None:
+        for article in (self.first, self.first, self.second):
+            self.counter.record(article.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.counter.flush(), 3)
+        writes = [q['sql'] for q in queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(self.counter.pending(), 0)
+
+        self.counter.record(self.first.pk)
+        self.counter.flush()
+        self.assertEqual((views_of(self.first), views_of(self.second)), (3, 1))
+        self.assertEqual(ArticleViewCount.objects.filter(article=self.first).count(), 1)
+
+    @override_settings(BLOG_TRENDING={'FLUSH_THRESHOLD': 3, 'FLUSH_INTERVAL': 3600})
+    def test_threshold_triggers_flush(self) -> None:
+        self.counter.record(self.first.pk)
+        self.counter.record(self.first.pk)
+        self.assertEqual(views_of(self.first), 0)
+        self.counter.record(self.second.pk)
+        self.assertEqual((views_of(self.first), views_of(self.second)), (2, 1))
+
+    @override_settings(BLOG_TRENDING={'FLUSH_THRESHOLD': 1000, 'FLUSH_INTERVAL': 0})
+    def test_interval_triggers_flush(self) -> None:
+        self.counter.record(self.first.pk)
+        self.assertEqual(views_of(self.first), 1)
+
+    @override_settings(BLOG_TRENDING={'COUNT_VIEWS': False})
+    def test_counting_can_be_disabled(self) -> None:
+        self.counter.record(self.first.pk)
+        self.assertEqual(self.counter.pending(), 0)
+
+    def test_views_of_deleted_articles_are_dropped(self) -> None:
+        self.counter.record(self.first.pk)
+        self.counter.record(self.second.pk)
+        self.second.delete()
+        self.assertEqual(self.counter.flush(), 1)
+
+    def test_failed_flush_keeps_views(self) -> None:
+        self.counter.record(self.first.pk)
+        with mock.patch('blog.trending.write_views', side_effect=OperationalError('database is locked')):
+            self.assertEqual(self.counter.flush(), 0)
+        self.assertEqual(self.counter.pending(), 1)
+        self.assertEqual(self.counter.flush(), 1)
+
+
+@override_settings(BLOG_TRENDING={'HALF_LIFE_HOURS': 24, 'LIMIT': 3})
+class TrendingTests(TestCase):
+    """Time-decayed ranking, its refresh cadence and the trending endpoint"""
+
+    def setUp(self) -> None:
+        caches['default'].clear()
+        response_cache.clear()
+        view_counter.clear()
+        self.client = APIClient()
+        self.hour = current_hour()
+        self.fresh = Article.objects.create(title='Fresh', content='Fresh article body.')
+        self.old = Article.objects.create(title='Old news', content='Old article body.')
+        self.draft = Article.objects.create(title='Draft', content='Draft article body.', is_published=False)
+
+    def views(self, article: Article, views: int, hours_ago: int = 0) -> None:
+        write_views({(article.pk, self.hour - hours_ago): views})
+
+    def test_old_views_decay(self) -> None:
+        self.views(self.old, 10, hours_ago=48)
+        self.views(self.fresh, 4)
+        ranking = compute_trending()
+        self.assertEqual([pk for pk, _ in ranking], [self.fresh.pk, self.old.pk])
+        # Two half-lives: ten views two days ago weigh about as much as 2.5 now
+        self.assertAlmostEqual(ranking[1][1] / ranking[0][1], 2.5 / 4, delta=0.05)
+
+    def test_views_outside_the_window_and_drafts_are_ignored(self) -> None:
+        self.views(self.old, 1000, hours_ago=8 * 24)
+        self.views(self.draft, 1000)
+        self.views(self.fresh, 1)
+        self.assertEqual([pk for pk, _ in compute_trending()], [self.fresh.pk])
+
+    def test_ranking_is_cached_until_refresh(self) -> None:
+        self.views(self.old, 5)
+        self.assertEqual([pk for pk, _ in trending_ranking()], [self.old.pk])
+        self.views(self.fresh, 50)
+        with self.assertNumQueries(0):
+            self.assertEqual([pk for pk, _ in trending_ranking()], [self.old.pk])
+        self.assertEqual([pk for pk, _ in trending_ranking(refresh=True)], [self.fresh.pk, self.old.pk])
+
+    def test_stale_ranking_is_recomputed(self) -> None:
+        trending_ranking()
+        self.views(self.fresh, 1)
+        with override_settings(BLOG_TRENDING={'REFRESH_INTERVAL': 0}):
+            self.assertEqual([pk for pk, _ in trending_ranking()], [self.fresh.pk])
+
+    def test_detail_reads_feed_the_endpoint(self) -> None:
+        url = reverse('article-trending')
+        self.assertEqual(self.client.get(url).json(), [])
+
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse('article-detail', args=[self.fresh.pk])).status_code, 200)
+        self.client.get(reverse('article-detail', args=[self.old.pk]))
+        self.client.get(reverse('article-detail', args=[self.draft.pk]))
+        self.assertEqual(view_counter.pending(), 4)
+
+        trending_ranking(refresh=True)
+        response = self.client.get(url, {'fields': 'id,title'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {'id': self.fresh.pk, 'title': 'Fresh'},
+            {'id': self.old.pk, 'title': 'Old news'},
+        ])
+        self.assertEqual(self.client.get(url, {'fields': 'id,title'})['X-Cache'], 'HIT')
+
+    def test_endpoint_follows_refreshed_order(self) -> None:
+        url = reverse('article-trending')
+        self.views(self.old, 2)
+        trending_ranking(refresh=True)
+        first = self.client.get(url)
+        self.assertEqual([item['id'] for item in first.json()], [self.old.pk])
+
+        self.views(self.fresh, 20)
+        trending_ranking(refresh=True)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.json()], [self.fresh.pk, self.old.pk])
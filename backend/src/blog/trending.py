@@ -0,0 +1,209 @@
+"""
+Buffered article view counts and the "trending" ranking built from them.
+
+Counting a view with ``UPDATE ... SET views = views + 1`` per detail read
+would make every reader take SQLite's single write lock. Instead each
+process adds views to an in-memory ``ViewCounter`` keyed by article and
+clock hour, and flushes the buffer as one batched upsert into
+``ArticleViewCount`` once ``FLUSH_THRESHOLD`` views are pending or
+``FLUSH_INTERVAL`` seconds have passed, whichever comes first. A flush is
+a single write transaction however many views it carries. Flushes run on
+the request that makes them due; views still buffered when a process
+exits are lost, which bounds the loss to one interval per worker.
+
+The trending score of an article sums its hourly views over the last
+``WINDOW_HOURS``, each hour weighted by ``0.5 ** (age / HALF_LIFE_HOURS)``.
+The ranking is computed in one aggregate query and kept in the Django
+cache; it is recomputed at most every ``REFRESH_INTERVAL`` seconds, by
+one worker at a time while the others keep serving the previous ranking.
+The ranking and its refresh lock are only shared when that cache is
+(``DJANGO_CACHE_DIR``); with local memory each worker refreshes its own.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F, FloatField, Sum, Value
+from django.db.models.functions import Power
+
+from .cache import TRENDING, response_cache
+from .models import Article, ArticleViewCount
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'COUNT_VIEWS': True,
+    'FLUSH_INTERVAL': 10,
+    'FLUSH_THRESHOLD': 500,
+    'HALF_LIFE_HOURS': 24,
+    'WINDOW_HOURS': 7 * 24,
+    'LIMIT': 20,
+    'REFRESH_INTERVAL': 60,
+    'ALIAS': 'default',
+    'KEY_PREFIX': 'blog',
+}
+
+# (article id, trending score) best first
+Ranking = List[Tuple[int, float]]
+
+
+def trending_config() -> Dict[str, Any]:
+    return {**DEFAULTS, **getattr(settings, 'BLOG_TRENDING', {})}
+
+
+def current_hour(timestamp: Optional[float] = None) -> int:
+    """Hours since the Unix epoch, the bucket views are counted in"""
+    return int((time.time() if timestamp is None else timestamp) // 3600)
+
+
+def write_views(counts: Dict[Tuple[int, int], int]) -> int:
+    """
+    Add ``{(article id, hour): views}`` to ``ArticleViewCount`` in one transaction.
+
+    Views of articles deleted since they were read are dropped. Returns the
+    number of views written.
+    """
+    with transaction.atomic():
+        existing = set(
+            Article.objects.filter(pk__in={article_id for article_id, _ in counts}).values_list('pk', flat=True)
+        )
+        rows = [(article_id, hour, views) for (article_id, hour), views in counts.items() if article_id in existing]
+        if not rows:
+            return 0
+        if connection.features.supports_update_conflicts_with_target:
+            _upsert(rows)
+        else:
+            for article_id, hour, views in rows:
+                updated = ArticleViewCount.objects.filter(article_id=article_id, hour=hour).update(
+                    views=F('views') + views
+                )
+                if not updated:
+                    ArticleViewCount.objects.create(article_id=article_id, hour=hour, views=views)
+    return sum(views for _, _, views in rows)
+
+
+def _upsert(rows: List[Tuple[int, int, int]]) -> None:
+    """Multi-row ``INSERT ... ON CONFLICT DO UPDATE`` adding to existing counts"""
+    max_params = connection.features.max_query_params or 3 * len(rows)
+    per_statement = max(1, max_params // 3)
+    table = connection.ops.quote_name(ArticleViewCount._meta.db_table)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), per_statement):
+            chunk = rows[start:start + per_statement]
+            cursor.execute(
+                f'INSERT INTO {table} (article_id, hour, views) VALUES '
+                f'{", ".join(["(%s, %s, %s)"] * len(chunk))} '
+                f'ON CONFLICT (article_id, hour) DO UPDATE SET views = {table}.views + excluded.views',
+                [value for row in chunk for value in row],
+            )
+
+
+class ViewCounter:
+    """Per-process buffer of article views, flushed in batches"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def record(self, article_id: int) -> None:
+        """Count one view, flushing the buffer when it is due"""
+        config = trending_config()
+        if not config['COUNT_VIEWS']:
+            return
+        with self._lock:
+            self._counts[article_id, current_hour()] += 1
+            self._pending += 1
+            due = (
+                self._pending >= config['FLUSH_THRESHOLD']
+                or time.monotonic() - self._last_flush >= config['FLUSH_INTERVAL']
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered views; returns how many were written"""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+        if not counts:
+            return 0
+        try:
+            return write_views(counts)
+        except DatabaseError as exc:
+            # Keep the views for the next flush rather than losing them
+            logger.warning(f"Flushing {sum(counts.values())} article views failed: {exc}")
+            with self._lock:
+                self._counts.update(counts)
+                self._pending += sum(counts.values())
+            return 0
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def clear(self) -> None:
+        """Drop buffered views and restart the flush interval"""
+        with self._lock:
+            self._counts.clear()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+
+
+view_counter = ViewCounter()
+
+
+def compute_trending(limit: Optional[int] = None, now: Optional[float] = None) -> Ranking:
+    """Rank published articles by time-decayed views in one aggregate query"""
+    config = trending_config()
+    now_hours = (time.time() if now is None else now) / 3600
+    half_life = float(config['HALF_LIFE_HOURS'])
+    # Weight each hour by its midpoint's age
+    age = Value(now_hours - 0.5) - F('hour')
+    weight = Power(Value(0.5), age / Value(half_life), output_field=FloatField())
+    rows = (
+        ArticleViewCount.objects
+        .filter(hour__gte=int(now_hours) - config['WINDOW_HOURS'], article__is_published=True)
+        .values('article_id')
+        .annotate(score=Sum(F('views') * weight, output_field=FloatField()))
+        .order_by('-score', '-article_id')
+        .values_list('article_id', 'score')
+    )
+    return list(rows[:limit or config['LIMIT']])
+
+
+def _key(config: Dict[str, Any], name: str) -> str:
+    return f'{config["KEY_PREFIX"]}:trending:{name}'
+
+
+def trending_ranking(refresh: bool = False) -> Ranking:
+    """
+    The cached ranking, recomputed once it is ``REFRESH_INTERVAL`` old.
+
+    A worker that finds the ranking stale takes a short lock and refreshes
+    it; the others keep serving the stale ranking meanwhile. Cached
+    trending responses are only invalidated when the order changes.
+    """
+    config = trending_config()
+    cache = caches[config['ALIAS']]
+    entry = cache.get(_key(config, 'ranking'))
+    if entry is not None and not refresh:
+        fresh = time.time() - entry['computed_at'] < config['REFRESH_INTERVAL']
+        if fresh or not cache.add(_key(config, 'lock'), True, config['REFRESH_INTERVAL']):
+            return entry['ranking']
+
+    # This process's own buffered views should count too
+    view_counter.flush()
+    ranking = compute_trending()
+    cache.set(_key(config, 'ranking'), {'computed_at': time.time(), 'ranking': ranking}, timeout=None)
+    cache.delete(_key(config, 'lock'))
+    if entry is None or [pk for pk, _ in entry['ranking']] != [pk for pk, _ in ranking]:
+        response_cache.invalidate(TRENDING)
+    return ranking
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ArticleViewSet, TagViewSet, CommentViewSet, api_root
+from .views import ArticleViewSet, TagViewSet, CommentViewSet, api_root, batch, metrics, profile_detail, profile_download, profiles, sync
 
 # Create router and register viewsets
 router = DefaultRouter()
@@ -11,6 +11,12 @@ router.register(r'tags', TagViewSet, basename='tag')
 urlpatterns = [
     path('', api_root, name='api-root'),
     path('', include(router.urls)),
+    path('sync/', sync, name='sync'),
+    path('batch/', batch, name='batch'),
+    path('metrics/', metrics, name='metrics'),
+    path('profiles/', profiles, name='profile-list'),
+    path('profiles/<str:capture_id>/', profile_detail, name='profile-detail'),
+    path('profiles/<str:capture_id>/download/', profile_download, name='profile-download'),
     
     # Nested comment URLs for articles
     path('articles/<int:article_pk>/comments/', 
@@ -1,14 +1,60 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404
-from django.http import JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.db.models import Case, Exists, IntegerField, OuterRef, QuerySet, Value, When
+from django.db import transaction
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from rest_framework import viewsets, status, filters
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.request import Request
-from rest_framework.pagination import PageNumberPagination
-from typing import Any, Dict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
 
-from .models import Article, Comment, Tag
+from .autocomplete import tag_autocomplete
+from .batch import BatchSerializer, execute_batch
+from .conditional import (
+    ConditionalGetMixin,
+    archive_state,
+    article_set_state,
+    article_state,
+    collection_state,
+    ranked_state,
+    related_state,
+)
+from .cache import (
+    ARTICLES,
+    COMMENTS,
+    RELATED,
+    TAGS,
+    TRENDING,
+    CachedReadMixin,
+    article_namespaces,
+    article_ns,
+    related_ns,
+    response_items,
+    tag_ns,
+)
+from .exporter import FORMATS as EXPORT_FORMATS, export_articles, export_comments, streaming_response
+from .fast_serializers import (
+    FastArticleListSerializer,
+    FastCommentSerializer,
+    FastListMixin,
+    FastTagSerializer,
+    fast_serializers_enabled,
+)
+from .fastjson import FastJSONParser
+from .fastlane import LazyAuthenticationMixin
+from .importer import ArticleImporter
+from .metrics import collect as collect_metrics, metrics_config, render as render_metrics
+from .models import ArchiveMonth, Article, Comment, Tag, month_bounds
+from .pagination import CommentPagination, KeysetPagination, StandardResultsSetPagination
+from .parsers import CSVParser, NDJSONParser
+from .profiling import list_profiles, load_profile, profile_file
+from .search import FullTextSearchFilter, attach_snippets
 from .serializers import (
     ArticleListSerializer, 
     ArticleDetailSerializer, 
@@ -17,16 +63,32 @@ from .serializers import (
     CommentCreateSerializer,
     TagSerializer
 )
+from .sync import ExpiredToken, InvalidToken, changes_since, record_deletions
+from .trending import Ranking, trending_ranking, view_counter
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
-class StandardResultsSetPagination(PageNumberPagination):
-    """Standard pagination configuration"""
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+def _int_kwarg(view, name: str) -> Optional[int]:
+    """URL kwarg as an int, or None when it cannot name a row"""
+    try:
+        return int(view.kwargs[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def article_list_source(queryset: QuerySet, request: Request) -> Tuple[type, QuerySet]:
+    """List serializer class and matching queryset for rendering ``queryset`` as list items"""
+    if fast_serializers_enabled():
+        return FastArticleListSerializer, FastArticleListSerializer.values_queryset(
+            queryset, request, always=['created_at']
+        )
+    requested = ArticleListSerializer.get_requested_fields(request)
+    queryset = ArticleListSerializer.narrow_queryset(queryset, request, always=['created_at'])
+    if 'tags' in requested:
+        queryset = queryset.prefetch_related('tags')
+    return ArticleListSerializer, queryset
 
 
 def api_root(request: Request) -> JsonResponse:
@@ -37,25 +99,114 @@ def api_root(request: Request) -> JsonResponse:
         "endpoints": {
             "articles": "/api/articles/",
             "tags": "/api/tags/",
-            "comments": "/api/articles/{article_id}/comments/"
+            "comments": "/api/articles/{article_id}/comments/",
+            "sync": "/api/sync/?since={token}",
+            "batch": "/api/batch/",
+            "metrics": "/api/metrics/"
         }
     })
 
 
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(LazyAuthenticationMixin, CachedReadMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing articles with full CRUD operations
     """
-    queryset = Article.objects.filter(is_published=True).prefetch_related('tags', 'comments')
+    queryset = Article.objects.published().prefetch_related('tags')
     pagination_class = StandardResultsSetPagination
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'content']
-    ordering_fields = ['created_at', 'updated_at', 'title']
+    fast_serializer_class = FastArticleListSerializer
+    fast_values_always = ('created_at',)
+    # Full-text search runs last so it can replace the default ordering with relevance
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
+    # -approved_comments_count lists the most discussed articles first
+    ordering_fields = ['created_at', 'updated_at', 'title', 'approved_comments_count']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        """Shape the query around the fields the response will render"""
+        queryset = super().get_queryset()
+        if self.action == 'archive_month':
+            # A created_at range, so the month is read off the published created_at index
+            start, end = self._archive_bounds()
+            queryset = queryset.filter(created_at__gte=start, created_at__lt=end)
+        if self.action not in ['list', 'retrieve', 'archive_month']:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        requested = serializer_class.get_requested_fields(self.request)
+        # created_at is the ordering and cursor key, so it is always loaded
+        queryset = serializer_class.narrow_queryset(queryset, self.request, always=['created_at'])
+        if 'tags' not in requested:
+            queryset = queryset.prefetch_related(None)
+        # Detail comments are not prefetched: a per-article window function
+        # ranks every comment, while the serializer's own LIMIT query walks
+        # the approved-comments index and stops after one page
+        return queryset
+
+    def get_conditional_state(self):
+        """Aggregate validators for the rows each read action renders"""
+        if self.action in ['list', 'archive_month']:
+            return article_set_state(self.filter_queryset(self.get_queryset()))
+        if self.action == 'archive':
+            return archive_state()
+        if self.action == 'trending':
+            ids = [pk for pk, _ in trending_ranking()]
+            return ranked_state(Article.objects.published().filter(pk__in=ids), ids)
+        pk = _int_kwarg(self, 'pk')
+        if pk is None:
+            return None
+        if self.action == 'retrieve':
+            return article_state(Article.objects.published(), pk)
+        if self.action == 'comments':
+            return collection_state(Comment.objects.filter(article_id=pk, is_approved=True))
+        if self.action == 'related':
+            return related_state(Article.objects.published().filter(related_from__article_id=pk), pk)
+        return None
+
+    def get_cache_namespaces(self, data: Any) -> set:
+        """Cached reads depend on the articles and tags they render"""
+        if self.action == 'archive':
+            # Month counts only change with article writes
+            return {ARTICLES}
+        namespaces = article_namespaces(data)
+        if self.action in ['list', 'archive_month']:
+            namespaces.add(ARTICLES)
+            if self._orders_by_comment_count():
+                # Any comment write can move articles into or out of the page
+                namespaces.add(COMMENTS)
+        elif self.action == 'comments':
+            namespaces = {article_ns(self.kwargs['pk'])}
+        elif self.action == 'related':
+            namespaces |= {RELATED, related_ns(self.kwargs['pk'])}
+        elif self.action == 'trending':
+            namespaces.add(TRENDING)
+        return namespaces
+
+    def _orders_by_comment_count(self) -> bool:
+        ordering = self.request.query_params.get(filters.OrderingFilter.ordering_param, '')
+        return any(field.strip().lstrip('-') == 'approved_comments_count' for field in ordering.split(','))
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """Count the view in the buffered counters, cache hits and 304s included"""
+        response = super().retrieve(request, *args, **kwargs)
+        counted = request.method == 'GET' and not getattr(request, 'blog_snapshot', False)
+        if counted and response.status_code in (200, 304):
+            view_counter.record(_int_kwarg(self, 'pk'))
+        return response
+
+    def use_fast_serializer(self) -> bool:
+        """Search results carry rank and snippet attributes, so they take the model path"""
+        return super().use_fast_serializer() and not FullTextSearchFilter().get_search_query(self.request)
+
+    def paginate_queryset(self, queryset):
+        """Attach highlighted snippets to the current page of search results"""
+        page = super().paginate_queryset(queryset)
+        query = FullTextSearchFilter().get_search_query(self.request)
+        if query and page is not None:
+            attach_snippets(page, query)
+        return page
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
-        if self.action == 'list':
+        if self.action in ['list', 'archive_month']:
             return ArticleListSerializer
         elif self.action in ['create', 'update', 'partial_update']:
             return ArticleCreateUpdateSerializer
@@ -85,20 +236,87 @@ class ArticleViewSet(viewsets.ModelViewSet):
         try:
             article_id = instance.id
             article_title = instance.title
-            instance.delete()
+            with transaction.atomic():
+                record_deletions([instance])
+                instance.delete()
             logger.info(f"Article deleted: {article_id} - {article_title}")
         except Exception as e:
             logger.error(f"Error deleting article {instance.id}: {str(e)}")
             raise
 
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='bulk',
+        parser_classes=[FastJSONParser, NDJSONParser, CSVParser],
+    )
+    def bulk(self, request: Request) -> Response:
+        """Import many articles from a JSON array, NDJSON or CSV body"""
+        rows = request.data
+        if isinstance(rows, list):
+            rows = enumerate(rows, start=1)
+        elif not isinstance(rows, Iterator):
+            return Response(
+                {'error': 'Expected a JSON array, NDJSON or CSV body.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        result = ArticleImporter().run(rows)
+        logger.info(f"Bulk import: {result.created} articles created, {len(result.errors)} rows failed")
+        if result.errors and not result.created:
+            return Response(result.as_dict(), status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """Stream every published article as NDJSON or CSV (``?output=csv``)"""
+        fmt = self._export_format(request)
+        lines = export_articles(Article.objects.published(), fmt)
+        return streaming_response(lines, fmt, 'articles')
+
+    @action(detail=True, methods=['get'], url_path='comments/export')
+    def comments_export(self, request: Request, pk: str = None) -> StreamingHttpResponse:
+        """Stream an article's approved comments as NDJSON or CSV"""
+        fmt = self._export_format(request)
+        article_id = _int_kwarg(self, 'pk')
+        if article_id is None or not Article.objects.published().filter(pk=article_id).exists():
+            raise NotFound()
+        comments = Comment.objects.filter(article_id=article_id, is_approved=True)
+        return streaming_response(export_comments(comments, fmt), fmt, f'article-{article_id}-comments')
+
+    @staticmethod
+    def _export_format(request: Request) -> str:
+        # ``format`` is taken by DRF's renderer negotiation
+        fmt = request.query_params.get('output', 'ndjson')
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({'output': f'Expected one of {", ".join(EXPORT_FORMATS)}.'})
+        return fmt
+
     @action(detail=True, methods=['get'])
     def comments(self, request: Request, pk: str = None) -> Response:
         """Get comments for a specific article"""
+        return self.cached_response(
+            request, lambda: self.conditional_response(request, lambda: self._comments(request, pk))
+        )
+
+    def _comments(self, request: Request, pk: str = None) -> Response:
         try:
-            article = self.get_object()
-            comments = article.comments.filter(is_approved=True).order_by('created_at')
-            serializer = CommentSerializer(comments, many=True)
-            return Response(serializer.data)
+            article_id = _int_kwarg(self, 'pk')
+            if article_id is None or not Article.objects.published().filter(pk=article_id).exists():
+                raise NotFound()
+            comments = Comment.objects.filter(article_id=article_id, is_approved=True)
+            if fast_serializers_enabled():
+                serializer_class = FastCommentSerializer
+                comments = serializer_class.values_queryset(comments, request, always=['created_at'])
+            else:
+                serializer_class = CommentSerializer
+                comments = serializer_class.narrow_queryset(comments, request, always=['created_at'])
+            paginator = CommentPagination()
+            page = paginator.paginate_queryset(comments, request)
+            serializer = serializer_class(page, many=True, context=self.get_serializer_context())
+            return paginator.get_paginated_response(serializer.data)
+        except NotFound:
+            raise
         except Exception as e:
             logger.error(f"Error fetching comments for article {pk}: {str(e)}")
             return Response(
@@ -106,6 +324,91 @@ class ArticleViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=['get'])
+    def related(self, request: Request, pk: str = None) -> Response:
+        """Published articles sharing the most (and rarest) tags, best first"""
+        return self.cached_response(
+            request, lambda: self.conditional_response(request, lambda: self._related(request, pk))
+        )
+
+    def _related(self, request: Request, pk: str = None) -> Response:
+        try:
+            article_id = _int_kwarg(self, 'pk')
+            if article_id is None or not Article.objects.published().filter(pk=article_id).exists():
+                raise NotFound()
+            articles = (
+                Article.objects.published()
+                .filter(related_from__article_id=article_id)
+                .order_by('-related_from__score', '-pk')
+            )
+            serializer_class, articles = article_list_source(articles, request)
+            serializer = serializer_class(articles, many=True, context=self.get_serializer_context())
+            return Response(serializer.data)
+        except NotFound:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching related articles for article {pk}: {str(e)}")
+            return Response(
+                {'error': 'Failed to fetch related articles'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=['get'])
+    def archive(self, request: Request) -> Response:
+        """Years and months that have published articles, newest first, with counts"""
+        return self.cached_response(
+            request, lambda: self.conditional_response(request, lambda: self._archive(request))
+        )
+
+    def _archive(self, request: Request) -> Response:
+        years: Dict[int, Dict[str, Any]] = {}
+        for year, month, count in ArchiveMonth.objects.filter(count__gt=0).values_list('year', 'month', 'count'):
+            bucket = years.setdefault(year, {'year': year, 'count': 0, 'months': []})
+            bucket['count'] += count
+            bucket['months'].append({'month': month, 'count': count})
+        return Response(list(years.values()))
+
+    @action(detail=False, methods=['get'], url_path=r'archive/(?P<year>[0-9]{4})/(?P<month>[0-9]{1,2})')
+    def archive_month(self, request: Request, year: str = None, month: str = None) -> Response:
+        """Published articles created in one month, paginated like the article list"""
+        self._archive_bounds()
+        return self.list(request)
+
+    def _archive_bounds(self) -> Tuple[datetime, datetime]:
+        try:
+            return month_bounds(int(self.kwargs['year']), int(self.kwargs['month']))
+        except ValueError:
+            raise NotFound()
+
+    @action(detail=False, methods=['get'])
+    def trending(self, request: Request) -> Response:
+        """Published articles with the most recent views, from the periodically refreshed ranking"""
+        # Refreshing a stale ranking bumps TRENDING, so do it before the cache lookup
+        ranking = trending_ranking()
+        return self.cached_response(
+            request, lambda: self.conditional_response(request, lambda: self._trending(request, ranking))
+        )
+
+    def _trending(self, request: Request, ranking: Ranking) -> Response:
+        try:
+            ids = [pk for pk, _ in ranking]
+            if not ids:
+                return Response([])
+            position = Case(
+                *(When(pk=pk, then=Value(index)) for index, pk in enumerate(ids)),
+                output_field=IntegerField(),
+            )
+            articles = Article.objects.published().filter(pk__in=ids).order_by(position)
+            serializer_class, articles = article_list_source(articles, request)
+            serializer = serializer_class(articles, many=True, context=self.get_serializer_context())
+            return Response(serializer.data)
+        except Exception as e:
+            logger.error(f"Error fetching trending articles: {str(e)}")
+            return Response(
+                {'error': 'Failed to fetch trending articles'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     @action(detail=True, methods=['post'])
     def add_comment(self, request: Request, pk: str = None) -> Response:
         """Add a comment to an article"""
@@ -128,17 +431,47 @@ class ArticleViewSet(viewsets.ModelViewSet):
             )
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(LazyAuthenticationMixin, CachedReadMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing tags
     """
     queryset = Tag.objects.all().order_by('name')
     serializer_class = TagSerializer
+    fast_serializer_class = FastTagSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name']
     ordering_fields = ['name', 'created_at']
     ordering = ['name']
 
+    def get_queryset(self):
+        """Load only the columns the response will render"""
+        queryset = super().get_queryset()
+        if self.action in ['list', 'retrieve']:
+            queryset = TagSerializer.narrow_queryset(queryset, self.request)
+        return queryset
+
+    def get_conditional_state(self):
+        """Aggregate validators for the rows each read action renders"""
+        if self.action == 'list':
+            return collection_state(self.filter_queryset(self.get_queryset()))
+        pk = _int_kwarg(self, 'pk')
+        if pk is None:
+            return None
+        if self.action == 'retrieve':
+            return collection_state(Tag.objects.filter(pk=pk))
+        if self.action == 'articles':
+            return article_set_state(Article.objects.published().filter(tags=pk))
+        return None
+
+    def get_cache_namespaces(self, data: Any) -> set:
+        """Cached reads depend on the tags (and tagged articles) they render"""
+        if self.action == 'articles':
+            return {ARTICLES, tag_ns(self.kwargs['pk'])} | article_namespaces(data)
+        namespaces = {tag_ns(item['id']) for item in response_items(data) if 'id' in item}
+        if self.action == 'list':
+            namespaces.add(TAGS)
+        return namespaces
+
     def perform_create(self, serializer: TagSerializer) -> None:
         """Create tag with logging"""
         try:
@@ -148,14 +481,55 @@ class TagViewSet(viewsets.ModelViewSet):
             logger.error(f"Error creating tag: {str(e)}")
             raise
 
+    @transaction.atomic
+    def perform_destroy(self, instance: Tag) -> None:
+        """Delete tag, leaving a tombstone for sync clients"""
+        tag_id = instance.pk
+        record_deletions([instance])
+        instance.delete()
+        logger.info(f"Tag deleted: {tag_id} - {instance.name}")
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request: Request) -> Response:
+        """Most used tags with a word starting with ``q``, from the in-memory prefix index"""
+        limit = request.query_params.get('limit')
+        if limit is not None and not limit.isdigit():
+            raise ValidationError({'limit': 'Expected a positive integer.'})
+        suggestions = tag_autocomplete.search(request.query_params.get('q', ''), int(limit) if limit else None)
+        return Response([
+            {'id': pk, 'name': name, 'articles_count': count} for pk, name, count in suggestions
+        ])
+
     @action(detail=True, methods=['get'])
     def articles(self, request: Request, pk: str = None) -> Response:
         """Get articles for a specific tag"""
+        return self.cached_response(
+            request, lambda: self.conditional_response(request, lambda: self._articles(request, pk))
+        )
+
+    def _articles(self, request: Request, pk: str = None) -> Response:
         try:
             tag = self.get_object()
-            articles = tag.articles.filter(is_published=True).order_by('-created_at')
-            serializer = ArticleListSerializer(articles, many=True)
+            paginator = KeysetPagination()
+            articles = Article.objects.published()
+            if paginator.is_requested(request):
+                # A page walks the published date index and probes each article's
+                # tags, instead of sorting the tag's whole posting list for it
+                members = Article.tags.through.objects.filter(article_id=OuterRef('pk'), tag_id=tag.pk)
+                articles = articles.filter(Exists(members))
+            else:
+                # The whole posting list is returned, so sorting it is bounded by the response
+                articles = articles.filter(tags=tag)
+            serializer_class, articles = article_list_source(articles.order_by('-created_at'), request)
+            context = self.get_serializer_context()
+            if paginator.is_requested(request):
+                page = paginator.paginate_queryset(articles, request, view=self)
+                serializer = serializer_class(page, many=True, context=context)
+                return paginator.get_paginated_response(serializer.data)
+            serializer = serializer_class(articles, many=True, context=context)
             return Response(serializer.data)
+        except NotFound:
+            raise
         except Exception as e:
             logger.error(f"Error fetching articles for tag {pk}: {str(e)}")
             return Response(
@@ -164,24 +538,49 @@ class TagViewSet(viewsets.ModelViewSet):
             )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(LazyAuthenticationMixin, CachedReadMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing comments
     """
     serializer_class = CommentSerializer
+    fast_serializer_class = FastCommentSerializer
+    fast_values_always = ('created_at',)
+    pagination_class = CommentPagination
+    # Only the keyset column: ?ordering=-created_at pages newest first
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['created_at']
     ordering = ['created_at']
+    cursor_ordering = CommentPagination.ordering
 
     def get_queryset(self):
         """Filter comments by article"""
         article_pk = self.kwargs.get('article_pk')
+        queryset = Comment.objects.filter(is_approved=True)
+        if article_pk:
+            queryset = queryset.filter(article_id=article_pk)
+        if self.action in ['list', 'retrieve']:
+            queryset = CommentSerializer.narrow_queryset(
+                queryset, self.request, always=['created_at']
+            )
+        return queryset
+
+    def get_conditional_state(self):
+        """Aggregate validators for the comments each read action renders"""
+        if self.action == 'list':
+            return collection_state(self.filter_queryset(self.get_queryset()))
+        pk = _int_kwarg(self, 'pk')
+        if pk is None:
+            return None
+        return collection_state(self.get_queryset().filter(pk=pk))
+
+    def get_cache_namespaces(self, data: Any) -> set:
+        """Cached reads depend on the articles whose comments they render"""
+        article_pk = self.kwargs.get('article_pk')
         if article_pk:
-            return Comment.objects.filter(
-                article_id=article_pk, 
-                is_approved=True
-            ).select_related('article')
-        return Comment.objects.filter(is_approved=True).select_related('article')
+            return {article_ns(article_pk)}
+        namespaces = {article_ns(item['article']) for item in response_items(data) if 'article' in item}
+        namespaces.add(COMMENTS)
+        return namespaces
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -202,3 +601,111 @@ class CommentViewSet(viewsets.ModelViewSet):
         except Exception as e:
             logger.error(f"Error creating comment: {str(e)}")
             raise
+
+    @transaction.atomic
+    def perform_destroy(self, instance: Comment) -> None:
+        """Delete comment, leaving a tombstone for sync clients"""
+        record_deletions([instance])
+        instance.delete()
+
+
+def _sync_items(stream: str, ids: List[int]) -> List[Dict[str, Any]]:
+    """List representations of the changed rows of one sync stream, oldest change first"""
+    if not ids:
+        return []
+    if stream == 'articles':
+        serializer_class, rows = article_list_source(Article.objects.published().filter(pk__in=ids), None)
+    else:
+        model, fast, serializer_class = {
+            'tags': (Tag, FastTagSerializer, TagSerializer),
+            'comments': (Comment, FastCommentSerializer, CommentSerializer),
+        }[stream]
+        rows = model.objects.filter(pk__in=ids)
+        if fast_serializers_enabled():
+            serializer_class, rows = fast, fast.values_queryset(rows, None)
+    return serializer_class(rows.order_by('updated_at', 'pk'), many=True).data
+
+
+@api_view(['GET'])
+def sync(request: Request) -> Response:
+    """
+    Articles, tags and approved comments changed since ``?since=<token>``
+
+    Without a token, returns everything visible; ``?since=now`` returns
+    nothing but a token to sync from. Call again with the returned token,
+    immediately while ``has_more`` is true.
+    """
+    try:
+        changes = changes_since(request.query_params.get('since'))
+    except InvalidToken:
+        raise ValidationError({'since': 'Invalid sync token.'})
+    except ExpiredToken:
+        return Response(
+            {'error': 'Sync token expired; sync again without one.'},
+            status=status.HTTP_410_GONE,
+        )
+    return Response({
+        'token': changes['token'],
+        'has_more': changes['has_more'],
+        **{stream: _sync_items(stream, ids) for stream, ids in changes['changed'].items()},
+        'deleted': changes['deleted'],
+        'comment_counts': changes['comment_counts'],
+    })
+
+
+@api_view(['POST'])
+def batch(request: Request) -> Response:
+    """
+    Run several API GETs in one round-trip
+
+    Body: ``{"requests": [{"path": "/api/tags/"}, ...], "consistent": false}``.
+    Responses come back in request order, each with its own status.
+    """
+    serializer = BatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    return Response({'responses': execute_batch(request._request, data['requests'], data['consistent'])})
+
+
+def metrics(request: Request) -> HttpResponse:
+    """
+    Request timings of every worker in the Prometheus text format
+
+    Outside DEBUG the endpoint only exists once a bearer token is configured.
+    """
+    config = metrics_config()
+    if not config['ENABLED'] or not (config['TOKEN'] or settings.DEBUG):
+        return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+    if config['TOKEN'] and not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {config["TOKEN"]}'
+    ):
+        return HttpResponse(status=status.HTTP_403_FORBIDDEN)
+    return HttpResponse(render_metrics(collect_metrics()), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profiles(request: Request) -> Response:
+    """Kept request profiles, newest first"""
+    return Response(list_profiles())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_detail(request: Request, capture_id: str) -> Response:
+    """One profile's request, SQL log and hottest functions"""
+    record = load_profile(capture_id)
+    if record is None:
+        raise NotFound('Profile not found.')
+    return Response(record)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def profile_download(request: Request, capture_id: str) -> FileResponse:
+    """The profile itself: pstats data (cProfile) or an HTML report (pyinstrument)"""
+    found = profile_file(capture_id)
+    if found is None:
+        raise NotFound('Profile not found.')
+    path, content_type = found
+    return FileResponse(path.open('rb'), as_attachment=True, filename=path.name, content_type=content_type)
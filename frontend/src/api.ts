@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Article, Tag, CreateArticleRequest, UpdateArticleRequest, PaginatedResponse } from './types/api';
+import { Article, Tag, TagSuggestion, CreateArticleRequest, UpdateArticleRequest, PaginatedResponse, SyncResponse } from './types/api';
 import { API_CONFIG } from './config/constants';
 
 const api = axios.create({
@@ -63,6 +63,12 @@ export const fetchTags = async (): Promise<Tag[]> => {
   }
 };
 
+// Most used tags with a word starting with the query, for the tag picker
+export const fetchTagSuggestions = async (query: string, limit = 10): Promise<TagSuggestion[]> => {
+  const response = await api.get<TagSuggestion[]>('/tags/autocomplete/', { params: { q: query, limit } });
+  return response.data;
+};
+
 // Fetch all articles
 export const fetchArticles = async (): Promise<Article[]> => {
   try {
@@ -79,6 +85,12 @@ export const fetchArticles = async (): Promise<Article[]> => {
   }
 };
 
+// Changes since a sync token (everything visible without one); call again while has_more
+export const syncChanges = async (since: string | null): Promise<SyncResponse> => {
+  const response = await api.get<SyncResponse>('/sync/', { params: since ? { since } : {} });
+  return response.data;
+};
+
 // Create a new article
 export const createArticle = async (articleData: CreateArticleRequest): Promise<Article> => {
   try {
@@ -22,12 +22,19 @@ interface Article {
   tags: Tag[];
 }
 
+interface RelatedArticle {
+  id: number;
+  title: string;
+  excerpt?: string;
+}
+
 const ArticleDetail: React.FC = () => {
   const { id } = useParams<{ id: string }>();
   const [article, setArticle] = useState<Article | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [newComment, setNewComment] = useState('');
+  const [related, setRelated] = useState<RelatedArticle[]>([]);
 
   useEffect(() => {
     setLoading(true);  
@@ -44,6 +51,12 @@ const ArticleDetail: React.FC = () => {
       });
   }, [id]);
 
+  useEffect(() => {
+    api.get<RelatedArticle[]>(`/articles/${id}/related/`, { params: { fields: 'id,title,excerpt' } })
+      .then((response) => setRelated(response.data))
+      .catch(() => setRelated([]));
+  }, [id]);
+
   const handleCommentSubmit = async (event: React.FormEvent<HTMLFormElement>) => {
     event.preventDefault();
     
@@ -90,6 +103,19 @@ const ArticleDetail: React.FC = () => {
           ))}
         </div>
         <Link to="/blog" className="bg-primary text-white py-2 px-4 rounded">Back to Articles</Link>
+        {related.length > 0 && (
+          <div className="related mt-8">
+            <h2 className="text-2xl mb-4">Related Articles</h2>
+            <ul className="space-y-2">
+              {related.map(item => (
+                <li key={item.id}>
+                  <Link to={`/articles/${item.id}`} className="text-blue-600 hover:underline">{item.title}</Link>
+                  {item.excerpt && <p className="text-gray-500 text-sm">{item.excerpt}</p>}
+                </li>
+              ))}
+            </ul>
+          </div>
+        )}
         <div className="comments mt-8">
           <h2 className="text-2xl mb-4">Comments</h2>
           {article.comments && article.comments.length > 0 ? (
@@ -1,8 +1,9 @@
-import React, { useState, useCallback, memo } from 'react';
+import React, { useState, useCallback, useEffect, memo } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useTags } from '../hooks/useTags';
 import { useArticles } from '../hooks/useArticles';
-import { Tag, CreateArticleRequest } from '../types/api';
+import { fetchTagSuggestions } from '../api';
+import { Tag, TagSuggestion, CreateArticleRequest } from '../types/api';
 
 interface FormErrors {
   title?: string;
@@ -18,12 +19,32 @@ const ArticleForm: React.FC = memo(() => {
   const [content, setContent] = useState<string>('');
   const [selectedTags, setSelectedTags] = useState<Tag[]>([]);
   const [newTag, setNewTag] = useState<string>('');
+  const [suggestions, setSuggestions] = useState<TagSuggestion[]>([]);
   const [errors, setErrors] = useState<FormErrors>({});
   const [isSubmitting, setIsSubmitting] = useState<boolean>(false);
   
   const navigate = useNavigate();
   const { tags: allTags, loading: tagsLoading } = useTags();
-  const { createArticle } = useArticles();
+  const { createArticle } = useArticles({ load: false });
+
+  // Suggest existing tags as the user types; stale responses are ignored
+  useEffect(() => {
+    const query = newTag.trim();
+    if (!query) {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      fetchTagSuggestions(query)
+        .then((data) => { if (!cancelled) setSuggestions(data); })
+        .catch(() => { if (!cancelled) setSuggestions([]); });
+    }, 100);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [newTag]);
 
   const handleTagAdd = useCallback(() => {
     const trimmedTag = newTag.trim();
@@ -166,7 +187,15 @@ const ArticleForm: React.FC = memo(() => {
               placeholder="Add a new tag"
               className="p-2 border border-gray-300 rounded flex-1"
               disabled={isSubmitting}
+              list="tag-suggestions"
             />
+            <datalist id="tag-suggestions">
+              {suggestions.map((tag) => (
+                <option key={tag.id} value={tag.name}>
+                  {tag.articles_count} articles
+                </option>
+              ))}
+            </datalist>
             <button 
               type="button" 
               onClick={handleTagAdd} 
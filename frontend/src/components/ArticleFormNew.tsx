@@ -23,7 +23,7 @@ const ArticleForm: React.FC = memo(() => {
   
   const navigate = useNavigate();
   const { tags: allTags, loading: tagsLoading } = useTags();
-  const { createArticle } = useArticles();
+  const { createArticle } = useArticles({ load: false });
 
   const handleTagAdd = useCallback(() => {
     const trimmedTag = newTag.trim();
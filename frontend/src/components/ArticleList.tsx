@@ -20,7 +20,7 @@ const ArticleList: React.FC<ArticleListProps> = memo(({ searchTerm = '' }) => {
       // Search term filter
       const matchesSearch = searchTerm === '' || 
         article.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        article.content.toLowerCase().includes(searchTerm.toLowerCase());
+        (article.excerpt ?? article.content ?? '').toLowerCase().includes(searchTerm.toLowerCase());
       
       // Tag filter
       const matchesTag = !tagFilter || 
@@ -106,7 +106,7 @@ const ArticleList: React.FC<ArticleListProps> = memo(({ searchTerm = '' }) => {
           {filteredArticles.map((article) => (
             <li key={article.id} className="bg-white shadow p-4 rounded">
               <h2 className="text-2xl font-bold">{article.title}</h2>
-              <p className="text-gray-600 mt-2 line-clamp-3">{article.content}</p>
+              <p className="text-gray-600 mt-2 line-clamp-3">{article.excerpt ?? article.content}</p>
               <div className="mt-3 flex flex-wrap gap-2">
                 {article.tags.map((tag) => (
                   <Link
@@ -1,21 +1,80 @@
 import { useState, useEffect, useCallback } from 'react';
-import { Article, CreateArticleRequest, UpdateArticleRequest, UseArticlesReturn } from '../types/api';
-import { fetchArticles as apiFetchArticles, createArticle as apiCreateArticle, updateArticle as apiUpdateArticle, deleteArticle as apiDeleteArticle } from '../api';
+import axios from 'axios';
+import { Article, CreateArticleRequest, SyncResponse, UpdateArticleRequest, UseArticlesReturn } from '../types/api';
+import { syncChanges, fetchArticles as apiFetchArticles, createArticle as apiCreateArticle, updateArticle as apiUpdateArticle, deleteArticle as apiDeleteArticle } from '../api';
+
+/**
+ * Apply one sync response to a list the client already holds, newest article first.
+ * Changed articles older than the oldest one held are outside the list and skipped.
+ */
+const applyChanges = (articles: Article[], changes: SyncResponse): Article[] => {
+  const deletedArticles = new Set(changes.deleted.articles);
+  const deletedTags = new Set(changes.deleted.tags);
+  const oldest = articles.length ? articles[articles.length - 1].created_at : '';
+  const byId = new Map(articles.map(article => [article.id, article]));
+  changes.articles.forEach(article => {
+    if (byId.has(article.id) || article.created_at >= oldest) byId.set(article.id, article);
+  });
+  deletedArticles.forEach(id => byId.delete(id));
+  return Array.from(byId.values())
+    .map(article => {
+      const count = changes.comment_counts[String(article.id)];
+      const tags = deletedTags.size ? article.tags.filter(tag => !deletedTags.has(tag.id)) : article.tags;
+      if (count === undefined && tags === article.tags) return article;
+      return { ...article, tags, comments_count: count ?? article.comments_count };
+    })
+    .sort((a, b) => b.created_at.localeCompare(a.created_at));
+};
+
+// Shared by every component using the hook: the list loaded from /articles/
+// and the sync token that refreshes it with only what changed since
+const store: { articles: Article[] | null; token: string | null } = { articles: null, token: null };
+
+interface UseArticlesOptions {
+  // Load (or refresh) the list on mount; forms that only write pass false
+  load?: boolean;
+}
 
 /**
  * Custom hook for managing articles data and operations
  */
-export const useArticles = (): UseArticlesReturn => {
-  const [articles, setArticles] = useState<Article[]>([]);
+export const useArticles = ({ load = true }: UseArticlesOptions = {}): UseArticlesReturn => {
+  const [articles, setArticles] = useState<Article[]>(store.articles ?? []);
   const [loading, setLoading] = useState<boolean>(false);
   const [error, setError] = useState<string | null>(null);
 
+  const commit = useCallback((next: Article[]): void => {
+    store.articles = next;
+    setArticles(next);
+  }, []);
+
+  const loadFirstPage = useCallback(async (): Promise<void> => {
+    // Token first, so changes made while the page loads are synced afterwards
+    store.token = (await syncChanges('now')).token;
+    commit(await apiFetchArticles());
+  }, [commit]);
+
   const fetchArticles = useCallback(async (): Promise<void> => {
     setLoading(true);
     setError(null);
     try {
-      const data = await apiFetchArticles();
-      setArticles(data);
+      if (store.articles === null || store.token === null) {
+        await loadFirstPage();
+        return;
+      }
+      let changes: SyncResponse;
+      do {
+        try {
+          changes = await syncChanges(store.token);
+        } catch (err) {
+          // 410: the token outlived the server's deletion records, so load the list again
+          if (!(axios.isAxiosError(err) && err.response?.status === 410)) throw err;
+          await loadFirstPage();
+          return;
+        }
+        commit(applyChanges(store.articles ?? [], changes));
+        store.token = changes.token;
+      } while (changes.has_more);
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to fetch articles';
       setError(errorMessage);
@@ -23,13 +82,13 @@ export const useArticles = (): UseArticlesReturn => {
     } finally {
       setLoading(false);
     }
-  }, []);
+  }, [commit, loadFirstPage]);
 
   const createArticle = useCallback(async (data: CreateArticleRequest): Promise<Article> => {
     setError(null);
     try {
       const newArticle = await apiCreateArticle(data);
-      setArticles(prev => [newArticle, ...prev]);
+      if (store.articles !== null) commit([newArticle, ...store.articles]);
       return newArticle;
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to create article';
@@ -37,15 +96,17 @@ export const useArticles = (): UseArticlesReturn => {
       console.error('Error creating article:', err);
       throw err;
     }
-  }, []);
+  }, [commit]);
 
   const updateArticle = useCallback(async (id: number, data: UpdateArticleRequest): Promise<Article> => {
     setError(null);
     try {
       const updatedArticle = await apiUpdateArticle(id, data);
-      setArticles(prev => prev.map(article => 
-        article.id === id ? updatedArticle : article
-      ));
+      if (store.articles !== null) {
+        commit(store.articles.map(article =>
+          article.id === id ? updatedArticle : article
+        ));
+      }
       return updatedArticle;
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to update article';
@@ -53,24 +114,24 @@ export const useArticles = (): UseArticlesReturn => {
       console.error('Error updating article:', err);
       throw err;
     }
-  }, []);
+  }, [commit]);
 
   const deleteArticle = useCallback(async (id: number): Promise<void> => {
     setError(null);
     try {
       await apiDeleteArticle(id);
-      setArticles(prev => prev.filter(article => article.id !== id));
+      if (store.articles !== null) commit(store.articles.filter(article => article.id !== id));
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to delete article';
       setError(errorMessage);
       console.error('Error deleting article:', err);
       throw err;
     }
-  }, []);
+  }, [commit]);
 
   useEffect(() => {
-    fetchArticles();
-  }, [fetchArticles]);
+    if (load) fetchArticles();
+  }, [load, fetchArticles]);
 
   return {
     articles,
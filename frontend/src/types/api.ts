@@ -5,6 +5,12 @@ export interface Tag {
   created_at: string;
 }
 
+export interface TagSuggestion {
+  id: number;
+  name: string;
+  articles_count: number;
+}
+
 export interface Comment {
   id: number;
   article: number;
@@ -18,6 +24,7 @@ export interface Article {
   id: number;
   title: string;
   content: string;
+  excerpt?: string;
   tags: Tag[];
   comments: Comment[];
   created_at: string;
@@ -25,6 +32,7 @@ export interface Article {
   is_published: boolean;
   is_recent: boolean;
   comments_count?: number;
+  comments_next?: string | null;
 }
 
 // Pagination Response Types
@@ -35,6 +43,17 @@ export interface PaginatedResponse<T> {
   results: T[];
 }
 
+// Delta sync: rows changed or deleted since the token (GET /api/sync/)
+export interface SyncResponse {
+  token: string;
+  has_more: boolean;
+  articles: Article[];
+  tags: Tag[];
+  comments: Comment[];
+  deleted: { articles: number[]; tags: number[]; comments: number[] };
+  comment_counts: Record<string, number>;
+}
+
 // API Request Types
 export interface CreateArticleRequest {
   title: string;